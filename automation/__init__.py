@@ -90,7 +90,7 @@ def controller(product_list=''):
         pscad.quit()
     """
 
-    from mhrc.automation.controller import Controller
+    from .controller import Controller
 
     return Controller(product_list)
 
@@ -100,10 +100,12 @@ def controller(product_list=''):
 # ==============================================================================
 
 def launch_pscad(pscad_version=None, fortran_version=None, matlab_version=None,
-                 silence=True, minimize=False, certificate=True):
+                 silence=True, minimize=False, certificate=True,
+                 rxtx_logger=None, launcher=None):
 
     """launch_pscad([pscad_version=] [, fortran_version=] [, matlab_version=]\
-        [, silence=] [, minimize=] [, certificate=])
+        [, silence=] [, minimize=] [, certificate=] [, rxtx_logger=]\
+        [, launcher=])
     Launch PSCAD and return a controller proxy.
 
     All parameters are optional.
@@ -115,6 +117,11 @@ def launch_pscad(pscad_version=None, fortran_version=None, matlab_version=None,
         silence (bool)      : Supress pop-up dialogs, which block automation.
         minimize (bool)     : Minimize the application window when launched.
         certificate (bool)  : Select between legacy and certificate licensing.
+        rxtx_logger         : Logger of the traffic with PSCAD, such as an
+                              :class:`.RxTxRecorder`.
+        launcher            : The :class:`.Launcher` which starts (or
+                              attaches to) PSCAD.  Defaults to launching
+                              the installed application on Windows.
 
     Returns:
         The PSCAD controller proxy.
@@ -128,7 +135,7 @@ def launch_pscad(pscad_version=None, fortran_version=None, matlab_version=None,
         pscad.quit()
     """
 
-    from mhrc.automation.controller import Controller
+    from .controller import Controller
 
     ctrl = Controller()
 
@@ -141,7 +148,9 @@ def launch_pscad(pscad_version=None, fortran_version=None, matlab_version=None,
             if vers:
                 versions = vers
 
-        pscad_version = sorted(versions)[-1]
+        # A launcher other than the default may not need an installed version
+        if versions:
+            pscad_version = sorted(versions)[-1]
 
     opts = { 'silence': silence, 'launch-minimized': minimize }
 
@@ -153,7 +162,8 @@ def launch_pscad(pscad_version=None, fortran_version=None, matlab_version=None,
         matlab_version = ctrl.get_param('matlab', matlab_version)
         settings['matlab_version'] = matlab_version
     
-    pscad = ctrl.launch(pscad_version, options=opts, settings=settings)
+    pscad = ctrl.launch(pscad_version, rxtx_logger, options=opts,
+                        settings=settings, launcher=launcher)
 
     return pscad
 
@@ -0,0 +1,226 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Command Batching
+#===============================================================================
+
+"""
+*****************
+Command Batching
+*****************
+
+Within a batch, commands which only change something in PSCAD are queued
+instead of being sent one at a time::
+
+    with pscad.batch():
+        for name, value in settings.items():
+            resistor.set_parameters(**{name: value})
+        resistor.location = (18, 36)
+
+Parameter writes to the same component (or project, or other scope) are
+merged into a single `set-parameters` command, and a later `set-location`
+or `set-vertices` of a component replaces a queued one.  The queue is sent
+as a pipelined burst when the batch ends, or before any other command is
+sent, so that a read always sees the writes queued before it.
+
+A queued command is answered at once with a placeholder reply, whose
+`batched` attribute is `"true"`.  Commands which fail are reported when the
+queue is sent, and kept in :attr:`Batch.failed`.
+
+.. autoclass:: Batch
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging
+
+# ATS imports
+from .xml_sock import XmlMessage
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Batched commands
+#===============================================================================
+
+# Commands which may be queued: their replies carry nothing but success
+BATCHED = frozenset(('set-parameters', 'set-value', 'set-location',
+                     'set-vertices', 'set-layer', 'add-to-layer',
+                     'remove-from-layer'))
+
+# Commands which entirely replace the effect of an earlier one to the same
+# component
+REPLACING = frozenset(('set-location', 'set-vertices'))
+
+
+class _ParameterWrite:
+
+    """Parameter values to be written to one scope"""
+
+    __slots__ = ('scope', 'name', 'shadow_key', 'values')
+
+    def __init__(self, scope, name, shadow_key, values):
+        self.scope = scope
+        self.name = name
+        self.shadow_key = shadow_key
+        self.values = dict(values)
+
+    def command(self):
+        return self.scope._parameters_command(self.name, self.values) # pylint: disable=protected-access
+
+
+#===============================================================================
+# Batch
+#===============================================================================
+
+class Batch:
+
+    """
+    A queue of state-changing commands, sent together.
+
+    Created by :meth:`PSCAD.batch() <.CmdProcessor.batch>`; batches may be
+    nested, in which case the queue is sent when the outermost batch ends.
+    The queue is also sent if the batch ends with an exception, since the
+    commands would have been sent by then without the batch.
+
+    Parameters:
+        pscad: The command processor.
+        window (int): Number of commands in flight at once, when sending.
+    """
+
+    def __init__(self, pscad, window=64):
+        self._pscad = pscad
+        self._window = window
+        self._depth = 0
+        self._queue = []
+        self._open = {}             # Queue index of mergeable entries
+        self._pending = {}          # Queued parameter values, by shadow key
+
+        self.requested = 0          #: Number of writes made in the batch
+        self.sent = 0               #: Number of commands actually sent
+        self.failed = []            #: (command, reply) of failed commands
+
+    def __len__(self):
+        return len(self._queue)
+
+
+    #===========================================================================
+    # Context manager
+    #===========================================================================
+
+    def __enter__(self):
+        self._depth += 1
+        self._pscad._batch = self                   # pylint: disable=protected-access
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                self.flush()
+            finally:
+                self._pscad._batch = None           # pylint: disable=protected-access
+
+
+    #===========================================================================
+    # Queue
+    #===========================================================================
+
+    def set_parameters(self, scope, name, shadow_key, values):
+        """Queue a parameter write, merging it with a queued write to the
+        same scope"""
+
+        self.requested += 1
+        self._pending.setdefault(shadow_key, {}).update(values)
+        index = self._open.get(shadow_key)
+        if index is not None:
+            self._queue[index].values.update(values)
+        else:
+            self._open[shadow_key] = len(self._queue)
+            self._queue.append(_ParameterWrite(scope, name, shadow_key,
+                                               values))
+
+    def pending(self, shadow_key):
+        """The parameter values queued for a scope, or `None`"""
+
+        return self._pending.get(shadow_key)
+
+    def accepts(self, cmd):
+        """Can the command be queued?"""
+
+        return getattr(cmd, 'name', None) in BATCHED
+
+    def queue(self, cmd):
+        """
+        Queue a command.
+
+        Returns:
+            XmlMessage: A placeholder reply.
+        """
+
+        self.requested += 1
+        if cmd.name in REPLACING:
+            key = cmd.target()
+            index = self._open.get(key)
+            if index is not None:
+                self._queue[index] = cmd
+            else:
+                self._open[key] = len(self._queue)
+                self._queue.append(cmd)
+        else:
+            # Nothing may be merged across another kind of command
+            self._open = {}
+            self._queue.append(cmd)
+
+        return XmlMessage('<commandresponse sequence-id="{}" success="true" '
+                          'batched="true" />'.format(cmd.get_id()))
+
+
+    #===========================================================================
+    # Flush
+    #===========================================================================
+
+    def flush(self):
+        """
+        Send all queued commands now, without waiting for each reply.
+
+        Returns:
+            list: The replies, in the order the commands were sent.
+        """
+
+        queue, self._queue = self._queue, []
+        self._open = {}
+        self._pending = {}
+        if not queue:
+            return []
+
+        pscad = self._pscad
+        cmds = [item.command() if isinstance(item, _ParameterWrite) else item
+                for item in queue]
+        LOG.debug("Batch: sending %d commands", len(cmds))
+        replies = pscad.execute_many(cmds, self._window)
+        self.sent += len(cmds)
+
+        for item, cmd, resp in zip(queue, cmds, replies):
+            success = resp is not None  and  resp.get('success') == 'true'
+            if isinstance(item, _ParameterWrite):
+                if success:
+                    pscad._shadow_update(item.shadow_key, item.values) # pylint: disable=protected-access
+                else:
+                    pscad._shadow_forget(item.shadow_key) # pylint: disable=protected-access
+            if not success:
+                LOG.error("Batched command failed: %s", cmd)
+                LOG.error("  resp %s", resp)
+                self.failed.append((cmd, resp))
+
+        return replies
@@ -0,0 +1,266 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Build Cache
+#===============================================================================
+
+"""
+***********
+Build Cache
+***********
+
+A build cache avoids rebuilding a case whose inputs have not changed since
+its last successful build.
+
+The inputs of a build are summarised by a key: a hash of the saved project
+file, the library files it references, and the project parameters.  After
+a successful build, the key is written into the build directory, and a copy
+of the build directory is kept in the cache under that key.
+
+When asked to build a case, the cache then either
+
+* does nothing, if the build directory already holds the build for the
+  current key,
+* restores the build directory from the cache, if a build for the current
+  key was kept, or
+* builds the case, and keeps the result.
+
+::
+
+    cache = BuildCache(r'C:\\Work\\build-cache')
+    outcome = cache.build(pscad.project('vdiv'),
+                          r'C:\\Work\\vdiv.pscx', r'C:\\Work\\vdiv.gf46')
+
+Note:
+    The cache can only see what is on disk.  A project with unsaved changes
+    is always built, and never kept.
+
+.. autoclass:: BuildCache
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import hashlib, json, logging, os, shutil, threading, time
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Build Cache
+#===============================================================================
+
+class BuildCache:
+
+    """
+    A cache of build directories, keyed by a hash of the build's inputs.
+
+    Parameters:
+        directory (str): Where the kept builds are stored.
+        extra (str): Anything else which should invalidate all kept builds
+            when changed, such as the PSCAD or compiler version. (optional)
+    """
+
+    KEY_FILE = '.build-key'
+    META_FILE = 'build.json'
+
+    # Outcomes of build()
+    CURRENT = 'current'
+    RESTORED = 'restored'
+    BUILT = 'built'
+    FAILED = 'failed'
+
+    def __init__(self, directory, extra=None):
+        self.directory = directory
+        self.extra = extra
+        self._digests = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+
+    #===========================================================================
+    # Keys
+    #===========================================================================
+
+    def _file_digest(self, path):
+
+        # Files are only re-read when their size or timestamp changes
+        stat = os.stat(path)
+        sig = (path, stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(sig)
+        if digest is None:
+            hasher = hashlib.sha256()
+            with open(path, 'rb') as file:
+                for block in iter(lambda: file.read(1 << 20), b''):
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+            with self._lock:
+                self._digests[sig] = digest
+        return digest
+
+    def key(self, project_file, libraries=(), parameters=None):
+        """
+        Compute the key of a build.
+
+        Parameters:
+            project_file (str): Path to the saved case.
+            libraries (list): Paths to the library files the case uses.
+            parameters (dict): Project (or other) parameters which affect
+                the build.
+
+        Returns:
+            str: A hexadecimal digest.
+        """
+
+        hasher = hashlib.sha256()
+        hasher.update(self._file_digest(project_file).encode())
+        for library in sorted(libraries):
+            hasher.update(os.path.basename(library).encode())
+            hasher.update(self._file_digest(library).encode())
+        if parameters:
+            hasher.update(json.dumps(parameters, sort_keys=True,
+                                     default=str).encode())
+        if self.extra is not None:
+            hasher.update(str(self.extra).encode())
+        return hasher.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+
+    #===========================================================================
+    # Lookup / Store / Restore
+    #===========================================================================
+
+    def is_current(self, build_dir, key):
+        """Does the build directory already hold the build for this key?"""
+
+        try:
+            with open(os.path.join(build_dir, self.KEY_FILE)) as file:
+                return file.read().strip() == key
+        except OSError:
+            return False
+
+    def has(self, key):
+        """Is a build kept for this key?"""
+
+        return os.path.exists(os.path.join(self._entry(key), self.META_FILE))
+
+    def store(self, key, build_dir, project=None):
+        """Keep a copy of a successful build under the given key"""
+
+        with open(os.path.join(build_dir, self.KEY_FILE), 'w') as file:
+            file.write(key)
+
+        entry = self._entry(key)
+        tmp = entry + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.copytree(build_dir, os.path.join(tmp, 'build'))
+
+        meta = {'project': project, 'key': key, 'time': time.time(),
+                'files': sorted(os.listdir(build_dir))}
+        with open(os.path.join(tmp, self.META_FILE), 'w') as file:
+            json.dump(meta, file, indent=2)
+
+        # Replace any previous entry with the complete new one
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+
+    def restore(self, key, build_dir):
+        """Replace the contents of the build directory with a kept build"""
+
+        source = os.path.join(self._entry(key), 'build')
+        os.makedirs(build_dir, exist_ok=True)
+
+        # Files of the previous build must not survive alongside the kept one
+        for name in os.listdir(build_dir):
+            path = os.path.join(build_dir, name)
+            if os.path.isdir(path)  and  not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+        for name in os.listdir(source):
+            path = os.path.join(source, name)
+            if os.path.isdir(path):
+                shutil.copytree(path, os.path.join(build_dir, name))
+            else:
+                shutil.copy2(path, build_dir)
+
+    def _invalidate(self, build_dir):
+        # The build directory no longer matches any key once building starts
+        try:
+            os.remove(os.path.join(build_dir, self.KEY_FILE))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Discard all kept builds"""
+
+        for name in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, name),
+                          ignore_errors=True)
+        self._digests.clear()
+
+
+    #===========================================================================
+    # Build
+    #===========================================================================
+
+    def build(self, project, project_file, build_dir, libraries=(),
+              parameters=None):
+        """
+        Build a case, unless an identical build is current or kept.
+
+        Parameters:
+            project (ProjectCommands): The case.
+            project_file (str): Path to the saved case.
+            build_dir (str): The case's build (output) directory.
+            libraries (list): Paths to the library files the case uses.
+            parameters (dict): Parameters which affect the build.  Defaults
+                to the project parameters.
+
+        Returns:
+            str: One of `'current'`, `'restored'`, `'built'` or `'failed'`.
+        """
+
+        if project.is_dirty():
+            LOG.warning("%s has unsaved changes; not using build cache",
+                        project.name)
+            self._invalidate(build_dir)
+            project.build()
+            return self.BUILT
+
+        if parameters is None:
+            parameters = project.parameters()
+
+        key = self.key(project_file, libraries, parameters)
+
+        if self.is_current(build_dir, key):
+            LOG.info("%s: build is current", project.name)
+            return self.CURRENT
+
+        if self.has(key):
+            LOG.info("%s: restoring build %s", project.name, key[:12])
+            self.restore(key, build_dir)
+            return self.RESTORED
+
+        self._invalidate(build_dir)
+        LOG.info("%s: building", project.name)
+        project.build()
+
+        errors = [msg for msg in project.messages() if msg.status == 'error']
+        if errors:
+            LOG.warning("%s: build failed; not kept", project.name)
+            return self.FAILED
+
+        self.store(key, build_dir, project.name)
+        return self.BUILT
@@ -51,6 +51,8 @@ class BusComponent(Wire):
     To construct a new wire, use `UserCanvas.add_bus()`.
     """
 
+    __slots__ = ()
+
     def __init__(self, canvas, iid):
 
         """Construct a command component for a Bus, identified by an id"""
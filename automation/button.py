@@ -46,6 +46,8 @@ class ButtonCommands(ComponentCommand):
 
     """Button Command Object"""
 
+    __slots__ = ()
+
     def __init__(self, canvas, *iid):
 
         super().__init__(canvas, "Button", *iid)
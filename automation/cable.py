@@ -47,6 +47,8 @@ class CableComponent(ComponentCommand):
 
     """Cable Component Command Object"""
 
+    __slots__ = ('_defn',)
+
     def __init__(self, canvas, iid, defn=None):
 
         """Construct a command component for a Cable, identified by an id"""
@@ -33,6 +33,8 @@ class CanvasComponent(ComponentCommand):
 
     """Canvas Component Command Object"""
 
+    __slots__ = ()
+
     def __init__(self, project, scope_name, *iid):
 
         """Construct a command component for a Canvas/Frame"""
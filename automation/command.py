@@ -12,8 +12,14 @@ a socket to a PSCAD process."""
 #===============================================================================
 
 # Standard Python imports
-import logging, time
+import logging, time, weakref
 import xml.etree.ElementTree as ET
+from types import MappingProxyType
+from xml.sax.saxutils import escape
+
+# ATS imports
+from .batch import Batch
+from .metrics import CommandMetrics
 
 
 #===============================================================================
@@ -36,6 +42,10 @@ PARAM_VALUE = "value"
 # <scope> ... </scope>
 SCOPE_TAG = "scope"
 
+# Most commands awaiting a reply whose send time is remembered for metrics.
+# Commands PSCAD never replies to are forgotten, oldest first, beyond this.
+IN_FLIGHT_LIMIT = 1024
+
 
 #===============================================================================
 # Logging
@@ -57,7 +67,14 @@ class CmdProcessor:
         super().__init__()
         self._sock = None
         self._cmd_seq = 0
-        self._handlers = []
+        self._handlers = []         # Fallback: handlers shown every message
+        self._event_handlers = {}   # Handlers indexed by event type
+        self._replies = {}          # post_command callbacks, by sequence-id
+        self._shadow = None         # Last known parameters, by scope
+        self._metrics = CommandMetrics()
+        self._in_flight = {}        # (name, size, send time), by sequence-id
+        self._batch = None          # Queue of commands to be sent together
+        self._watchers = weakref.WeakSet()  # Canvas indexes to keep current
 
 
     #===========================================================================
@@ -65,9 +82,12 @@ class CmdProcessor:
     #===========================================================================
 
     def close_and_cleanup(self):
-        for handler in self._handlers:
+        for handler in self._all_handlers():
             handler.close()
         self._handlers = None
+        self._event_handlers = None
+        self._replies = None
+        self._in_flight = {}
         self._sock.close()
 
 
@@ -77,34 +97,84 @@ class CmdProcessor:
 
     #---------------------------------------------------------------------------
     # Add / Remove Handlers
+    #
+    # Handlers which declare the `event_types` they are interested in are
+    # indexed by event type, and are only shown messages carrying one of
+    # those events.  All other handlers are shown every message.
     #---------------------------------------------------------------------------
 
     def add_handler(self, handler):
-        if handler not in self._handlers:
+        event_types = getattr(handler, 'event_types', None)
+        if event_types:
+            for event_type in event_types:
+                handlers = self._event_handlers.get(event_type, [])
+                if handler not in handlers:
+                    handlers = handlers[:]      # Copy on write
+                    handlers.insert(0, handler)
+                    self._event_handlers[event_type] = handlers
+
+        elif handler not in self._handlers:
             handlers = self._handlers[:]    # Copy on write
             handlers.insert(0, handler)
             self._handlers = handlers
 
     def remove_handler(self, handler):
-        if handler in self._handlers:
+        event_types = getattr(handler, 'event_types', None)
+        if event_types:
+            for event_type in event_types:
+                handlers = self._event_handlers.get(event_type, [])
+                if handler in handlers:
+                    handlers = handlers[:]      # Copy on write
+                    handlers.remove(handler)
+                    if handlers:
+                        self._event_handlers[event_type] = handlers
+                    else:
+                        del self._event_handlers[event_type]
+
+        elif handler in self._handlers:
             handlers = self._handlers[:]    # Copy on write
             handlers.remove(handler)
             self._handlers = handlers
 
+    def _all_handlers(self):
+        handlers = list(self._handlers)
+        for indexed in self._event_handlers.values():
+            handlers.extend(h for h in indexed if h not in handlers)
+        return handlers
+
 
     #---------------------------------------------------------------------------
     # Dispatcher
     #---------------------------------------------------------------------------
 
     def _dispatch(self, msg):
-        for handler in self._handlers:
+
+        if msg is not None:
+            # A reply to a posted command goes to that command's callback
+            if self._replies:
+                reply = self._replies.pop(msg.get(COMMAND_SEQ_ID), None)
+                if reply is not None:
+                    func, args, kwargs = reply
+                    func(msg, *args, **kwargs)
+                    return
+
+            # Events go to the handlers registered for that type of event
+            if self._event_handlers:
+                handlers = self._event_handlers.get(msg.event_type())
+                if handlers and self._offer(handlers, msg):
+                    return
+
+        self._offer(self._handlers, msg)
+
+    def _offer(self, handlers, msg):
+        for handler in handlers:
             remove = False
             try:
                 handled = handler.send(msg)
                 if handled is StopIteration:
                     remove = True
                 elif handled:
-                    break
+                    return True
             except StopIteration:
                 remove = True
 
@@ -112,6 +182,8 @@ class CmdProcessor:
                 LOG.info("Handler: StopIteration: Removing handler")
                 self.remove_handler(handler)
 
+        return False
+
 
     #===========================================================================
     # Response Waiters
@@ -122,7 +194,43 @@ class CmdProcessor:
     #---------------------------------------------------------------------------
 
     def _recv(self):
-        return self._sock.recv()
+        msg = self._sock.recv()
+
+        # The first message carrying a command's sequence-id is its reply
+        if msg is not None  and  self._in_flight:
+            sent = self._in_flight.pop(msg.get(COMMAND_SEQ_ID), None)
+            if sent is not None:
+                name, size, start = sent
+                self._metrics.record(name, size, len(str(msg)),
+                                     time.perf_counter() - start,
+                                     msg.get('success') != 'false')
+        return msg
+
+
+    #---------------------------------------------------------------------------
+    # Receive & dispatch one message
+    #---------------------------------------------------------------------------
+
+    def connected(self):
+        """Returns `True` while messages can still be received from PSCAD"""
+
+        return self._sock is not None  and  self._sock.rx_open()
+
+    def poll(self):
+        """
+        Receive and dispatch at most one message from PSCAD.
+
+        Returns:
+            The message, or `None` if nothing arrived before the socket timed
+            out or if the connection is closed.
+        """
+
+        if not self.connected():
+            return None
+
+        msg = self._recv()
+        self._dispatch(msg)
+        return msg
 
 
     #---------------------------------------------------------------------------
@@ -135,12 +243,15 @@ class CmdProcessor:
             msg = self._recv()
             try:
                 handled = consumer.send(msg)
-                if handled is StopIteration:
-                    break
-                if not handled:
-                    self._dispatch(msg)
             except StopIteration:
+                handled = StopIteration
+            if handled is StopIteration:
+                # The consumer is done, but other handlers (such as an event
+                # stream) still need to see the message which ended it
+                self._dispatch(msg)
                 break
+            if not handled:
+                self._dispatch(msg)
 
 
     #---------------------------------------------------------------------------
@@ -180,9 +291,17 @@ class CmdProcessor:
         else:
             seq_no = cmd.get(COMMAND_SEQ_ID)
 
-        xpath = "[@sequence-id='{}']".format(seq_no)
+        # Replies are matched on the sequence-id attribute alone, which
+        # does not require the reply to be fully parsed.
+        while self._sock.rx_open():
+            msg = self._recv()
+            self._dispatch(msg)
+
+            if msg is not None  and  msg.get(COMMAND_SEQ_ID) == seq_no:
+                return msg
 
-        return self.wait_for(xpath)
+        LOG.warning("PSCAD unexpectedly disconnected")
+        raise Exception("PSCAD unexpectedly disconnected")
 
 
     #===========================================================================
@@ -198,13 +317,153 @@ class CmdProcessor:
         return str(self._cmd_seq)
 
 
+    #===========================================================================
+    # Parameter shadow cache
+    #
+    # When delta writes are enabled, the last known value of every parameter
+    # read or written is remembered, by scope.  Writes then send only the
+    # parameters whose values differ from the remembered ones.
+    #
+    # Each scope's entry holds the remembered values, and whether they are
+    # the complete list of parameters (from a 'list-parameters' reply) or
+    # only those which have been written.
+    #===========================================================================
+
+    def enable_delta_writes(self, enable=True):
+        """
+        Enable or disable delta parameter writes.
+
+        While enabled, setting parameters sends only those parameters whose
+        value differs from the last value read from or written to PSCAD.
+
+        Warning:
+            Parameters changed by other means (the PSCAD user interface,
+            another client, or a command this library does not track) leave
+            the remembered values stale.  Call :meth:`invalidate_parameters`
+            after such changes.
+        """
+
+        self._shadow = {} if enable else None
+
+    def delta_writes(self):
+        """Returns `True` if delta parameter writes are enabled"""
+
+        return self._shadow is not None
+
+    def invalidate_parameters(self, project=None):
+        """
+        Forget remembered parameter values.
+
+        Parameters:
+            project (str): Only forget the parameters of this project's
+                components. (optional)
+        """
+
+        if self._shadow:
+            if project is None:
+                self._shadow.clear()
+            else:
+                item = ('project', project)
+                for key in [key for key in self._shadow if item in key[1]]:
+                    del self._shadow[key]
+
+    def _shadow_entry(self, key):
+        if self._shadow is None:
+            return None
+        return self._shadow.get(key)
+
+    def _shadow_update(self, key, values, complete=False):
+        if self._shadow is not None:
+            entry = self._shadow.get(key)
+            if complete or entry is None:
+                self._shadow[key] = (dict(values), complete)
+            else:
+                entry[0].update(values)
+
+    def _shadow_forget(self, key):
+        if self._shadow:
+            self._shadow.pop(key, None)
+
+
+    #===========================================================================
+    # Metrics
+    #
+    # Every command sent is remembered until the first message carrying its
+    # sequence-id arrives, and then recorded under the command's name.
+    #===========================================================================
+
+    def metrics(self):
+        """
+        Per-command-name metrics since the connection was established, or
+        since :meth:`reset_metrics`.
+
+        Returns:
+            dict: Totals (`count`, `failed`, `tx_bytes`, `rx_bytes`, ...)
+            and, under `'commands'`, the statistics of each command name,
+            including latency percentiles and histogram, in seconds.
+        """
+
+        return self._metrics.snapshot()
+
+    def reset_metrics(self):
+        """Discard the metrics collected so far"""
+
+        self._metrics.reset()
+
+    def enable_metrics(self, enable=True):
+        """
+        Enable or disable collecting metrics for :meth:`metrics`.
+
+        Metrics are collected by default.  Profiles collect metrics of
+        their regions even when this is disabled.
+        """
+
+        self._metrics.enable(enable)
+
+    def profile(self):
+        """
+        Collect metrics of the commands sent in a region of a script::
+
+            with pscad.profile() as prof:
+                project.run()
+            print(prof.report())
+
+        Returns:
+            Profile: The context manager, whose :meth:`~.Profile.snapshot`
+            and :meth:`~.Profile.report` give the region's metrics.
+        """
+
+        return self._metrics.profile()
+
+
     #===========================================================================
     # Send Command
     #===========================================================================
 
     def _send(self, cmd):
-        xml = cmd.root if isinstance(cmd, Command) else cmd
-        self._sock.send(xml)
+        # Queued commands go first, so that this command sees their effects
+        if self._batch is not None  and  len(self._batch):
+            self._batch.flush()
+
+        if isinstance(cmd, Command):
+            data = cmd.tostring()
+            self._sock.send_bytes(data)
+            if self._metrics.active:
+                self._sent(cmd.get_id(), cmd.name, len(data))
+        else:
+            self._sock.send(cmd)
+            if self._metrics.active:
+                # Raw ElementTree commands are not serialised here; their
+                # size is not counted
+                self._sent(cmd.get(COMMAND_SEQ_ID), cmd.get(COMMAND_NAME), 0)
+
+    def _sent(self, seq_id, name, size):
+        in_flight = self._in_flight
+        in_flight[seq_id] = (name, size, time.perf_counter())
+
+        # Dicts keep insertion order, so the first entry is the oldest
+        if len(in_flight) > IN_FLIGHT_LIMIT:
+            del in_flight[next(iter(in_flight))]
 
 
     #===========================================================================
@@ -241,11 +500,59 @@ class CmdProcessor:
         return self._wait_for_response(cmd)
 
 
+    #---------------------------------------------------------------------------
+    # Send several commands, wait for all responses
+    #---------------------------------------------------------------------------
+
+    def execute_many(self, cmds, window=64):
+        """
+        Execute several commands, without waiting for each reply before
+        sending the next command.
+
+        Up to `window` commands are in flight at once, which keeps both
+        ends' socket buffers from filling up.  Other messages which arrive
+        meanwhile are dispatched as usual.
+
+        Returns:
+            The replies, in the same order as the commands.
+        """
+
+        cmds = list(cmds)
+        seq_nos = [cmd.get_id() if isinstance(cmd, Command)
+                   else cmd.get(COMMAND_SEQ_ID) for cmd in cmds]
+        replies = dict.fromkeys(seq_nos)
+
+        sent = received = 0
+        while received < len(cmds):
+            while sent < len(cmds)  and  sent - received < window:
+                self._send(cmds[sent])
+                sent += 1
+
+            if not self._sock.rx_open():
+                LOG.warning("PSCAD unexpectedly disconnected")
+                raise Exception("PSCAD unexpectedly disconnected")
+
+            msg = self._recv()
+            self._dispatch(msg)
+
+            if msg is not None:
+                seq_no = msg.get(COMMAND_SEQ_ID)
+                if seq_no in replies  and  replies[seq_no] is None:
+                    replies[seq_no] = msg
+                    received += 1
+
+        return [replies[seq_no] for seq_no in seq_nos]
+
+
     #---------------------------------------------------------------------------
     # Migration help
     #---------------------------------------------------------------------------
 
     def send_command(self, cmd, wait_for_response=True):
+        if self._batch is not None  and  self._batch.accepts(cmd):
+            resp = self._batch.queue(cmd)
+            return resp if wait_for_response else None
+
         resp = None
         if wait_for_response:
             resp = self.execute(cmd)
@@ -254,63 +561,241 @@ class CmdProcessor:
 
         return resp
 
+    #===========================================================================
+    # Canvas watchers
+    #
+    # Objects which mirror the layout of a canvas (such as a CanvasIndex) are
+    # told when this library moves, adds or deletes a component.
+    #===========================================================================
+
+    def _watch(self, watcher):
+        self._watchers.add(watcher)
+
+    def _unwatch(self, watcher):
+        self._watchers.discard(watcher)
+
+    def _component_moved(self, component, location):
+        """A component was moved to (or added at) the location, or deleted
+        if the location is `None`"""
+
+        if self._watchers:
+            for watcher in list(self._watchers):
+                watcher.component_moved(component, location)
+
+
+    #===========================================================================
+    # Batch
+    #===========================================================================
+
+    def batch(self, window=64):
+        """
+        Queue state-changing commands, and send them together::
+
+            with pscad.batch():
+                for cmp in components:
+                    cmp.set_parameters(Enab='true')
+                    cmp.add_to_layer('Disabled')
+
+        Parameter writes to the same scope are merged into one command.
+        The queue is sent as a pipelined burst at the end of the batch, or
+        before any other command, so reads still see the queued writes.
+
+        Parameters:
+            window (int): Number of commands in flight at once, when sending.
+
+        Returns:
+            Batch: The context manager. See :mod:`.batch`.
+        """
+
+        if self._batch is not None:
+            return self._batch
+        return Batch(self, window)
+
+
     #===========================================================================
     # Post Command
     #===========================================================================
 
     def post_command(self, cmd, func, *args, **kwargs):
 
-        xpath = "[@sequence-id='{}']".format(cmd.get_id())
-
-        def consumer():
-            LOG.debug("Handler started: xpath = %s", xpath)
-            while True:
-                try:
-                    msg = yield False
-                    if msg is not None  and  msg.find(xpath) is not None:
-                        func(msg, *args, **kwargs)
-                        break
-                except GeneratorExit:
-                    break
-            LOG.debug("Handler exited: xpath = %s", xpath)
-
         LOG.debug("post_command: %s", cmd)
-        handler = consumer()
-        next(handler)
-        self.add_handler(handler)
+        self._replies[cmd.get_id()] = (func, args, kwargs)
         self._send(cmd)
 
 
+#===============================================================================
+# Command Templates
+#===============================================================================
+
+# Escapes for attribute values, in addition to &, < and >, matching those
+# ElementTree uses, so the XML is what ET.tostring() would produce.
+_ATTRIB_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;',
+                    '\t': '&#09;'}
+
+def _escape_attrib(value):
+    return escape(value, _ATTRIB_ENTITIES)
+
+_SEQ_HEAD = ('<{} {}="'.format(COMMAND_TAG, COMMAND_SEQ_ID)).encode()
+_SCOPE_END = '</{}>'.format(SCOPE_TAG).encode()
+_COMMAND_END = '</{}>'.format(COMMAND_TAG).encode()
+_EMPTY_END = b' />'
+
+
+def _attributes(attrs):
+    return "".join(' {}="{}"'.format(key, _escape_attrib(value))
+                   for key, value in attrs)
+
+
+def _leaf(tag_name, attrs):
+    """Serialise an empty <tag_name attr='value' .../> element"""
+
+    return "<{}{} />".format(tag_name, _attributes(attrs)).encode(
+        'ascii', 'xmlcharrefreplace')
+
+
+class CommandTemplate:
+
+    """
+    The constant part of a command, pre-serialised.
+
+    Everything in a command except the sequence-id, the component id chain
+    and the body (params & other subtags) depends only on the command name
+    and the scope, so it is serialised once and cached.
+    """
+
+    __slots__ = ('name', '_open', '_scoped')
+
+    _CACHE = {}
+
+    def __init__(self, cmd_name, scope_name, scope):
+
+        self.name = cmd_name
+
+        attrs = [(COMMAND_NAME, cmd_name)]
+        if scope_name is not None:
+            attrs.append((COMMAND_SCOPE, scope_name))
+
+        # Everything after the sequence-id, up to the missing component ids
+        # (scoped) or up to the end of the command's opening tag (unscoped)
+        text = '"' + _attributes(attrs)
+        self._scoped = scope is not None
+        if self._scoped:
+            text += '><{}>'.format(SCOPE_TAG)
+            text += "".join('<{}{} />'.format(key,
+                                              _attributes((('name', val),)))
+                            for key, val in scope)
+
+        self._open = text.encode('ascii', 'xmlcharrefreplace')
+
+    @classmethod
+    def get(cls, cmd_name, scope_name=None, scope=None):
+        """Retrieve the (cached) template for the command"""
+
+        key = (cmd_name, scope_name, scope)
+        template = cls._CACHE.get(key)
+        if template is None:
+            template = cls._CACHE.setdefault(key, cls(*key))
+        return template
+
+    def serialise(self, seq_id, ids, body):
+        """Fill in the variable parts of the command"""
+
+        parts = [_SEQ_HEAD, seq_id.encode(), self._open]
+        if self._scoped:
+            parts.extend(_leaf('component', (('id', str(iid)),))
+                         for iid in ids)
+            parts.append(_SCOPE_END)
+        elif not body:
+            parts.append(_EMPTY_END)
+            return b"".join(parts)
+        else:
+            parts.append(b'>')
+        parts.extend(body)
+        parts.append(_COMMAND_END)
+        return b"".join(parts)
+
+
 #===============================================================================
 # Command (sending commands from ATS to PSCAD over socket
 #===============================================================================
 
 class Command:
 
-    """Command (wrapper for an XML node containing a command)"""
+    """Command (wrapper for an XML node containing a command)
+
+    The XML node is only constructed if `root` is accessed.  Commands which
+    are built only with `add_param()` and `add_tag()` are serialised
+    directly from a cached :class:`CommandTemplate`."""
 
     def __init__(self, pscad, cmd_name, scope=None):
         self.pscad = pscad
+        self._seq_id = pscad.cmd_seq()
+        self._template = CommandTemplate.get(cmd_name, scope)
+        self._ids = ()
+        self._body = []
+        self._root = None
         self._scope = None
 
-        self.root = ET.Element(COMMAND_TAG)
-        self.root.set(COMMAND_SEQ_ID, pscad.cmd_seq())
-        self.root.set(COMMAND_NAME, cmd_name)
+    @classmethod
+    def scoped(cls, pscad, cmd_name, scope_name, scope, ids=()):
+        """Create a command with a <scope> tag, for the given scope mapping
+        and component id chain"""
+
+        cmd = cls.__new__(cls)
+        cmd.pscad = pscad
+        cmd._seq_id = pscad.cmd_seq()
+        cmd._template = CommandTemplate.get(cmd_name, scope_name,
+                                            tuple(scope.items()))
+        cmd._ids = ids
+        cmd._body = []
+        cmd._root = None
+        cmd._scope = None
+        return cmd
+
+    @property
+    def root(self):
+        """The command's XML node"""
+
+        if self._root is None:
+            self._root = ET.fromstring(self.tostring())
+            self._scope = self._root.find(SCOPE_TAG)
+            self._body = None
+        return self._root
+
+    def tostring(self):
+        """The serialised command, as bytes"""
 
-        if scope is not None:
-            self.root.set(COMMAND_SCOPE, scope)
+        if self._root is not None:
+            return ET.tostring(self._root)
+        return self._template.serialise(self._seq_id, self._ids, self._body)
 
     def get_id(self):
-        return self.root.get(COMMAND_SEQ_ID)
+        if self._root is not None:
+            return self._root.get(COMMAND_SEQ_ID)
+        return self._seq_id
+
+    def target(self):
+        """A key identifying what the command applies to: its scope and
+        component"""
+
+        return self._template, self._ids
+
+    @property
+    def name(self):
+        """The command's name"""
+
+        if self._root is not None:
+            return self._root.get(COMMAND_NAME)
+        return self._template.name
 
     def dump(self):
         ET.dump(self.root)
 
     def __str__(self):
-        return str(ET.tostring(self.root), "utf-8")
+        return str(self.tostring(), "utf-8")
 
     def __repr__(self):
-        return str(ET.tostring(self.root), "utf-8")
+        return str(self.tostring(), "utf-8")
 
 
     #---------------------------------------------------------------------------
@@ -334,6 +819,15 @@ class Command:
         param.set(PARAM_VALUE, value)
         return param
 
+    def add_param(self, name, value):
+        """Append a <param name='..' value='..'/> tag to the command"""
+
+        if self._root is not None:
+            self.param(self._root, name, value)
+        else:
+            self._body.append(_leaf(PARAM_TAG, ((PARAM_NAME, name),
+                                                (PARAM_VALUE, value))))
+
     #---------------------------------------------------------------------------
     # Other subtags
     #---------------------------------------------------------------------------
@@ -341,6 +835,16 @@ class Command:
     def tag(self, tag_name):
         return ET.SubElement(self.root, tag_name)
 
+    def add_tag(self, tag_name, **attrs):
+        """Append an empty <tag_name key='value' .../> tag to the command"""
+
+        if self._root is not None:
+            tag = self.tag(tag_name)
+            for key, value in attrs.items():
+                tag.set(key, value)
+        else:
+            self._body.append(_leaf(tag_name, attrs.items()))
+
 
     #---------------------------------------------------------------------------
     # "Execute" the command (sending it to PSCAD)
@@ -350,25 +854,41 @@ class Command:
         if LOG.isEnabledFor(logging.DEBUG):
             LOG.debug("execute %s", self)
 
-        resp = self.pscad.send_command(self.root, wait_for_response)
+        resp = self.pscad.send_command(self, wait_for_response)
 
         if resp is not None and resp.get("success") != "true":
             LOG.error("execute %s failed", self)
-            LOG.error("  resp %s", str(ET.tostring(resp), "utf-8"))
+            LOG.error("  resp %s", resp)
 
         elif LOG.isEnabledFor(logging.DEBUG):
-            if resp is not None:
-                LOG.debug("  resp %s", str(ET.tostring(resp), "utf-8"))
-            else:
-                LOG.debug("  resp %s", resp)
+            LOG.debug("  resp %s", resp)
 
         return resp
 
     def submit(self, consumer):
         if LOG.isEnabledFor(logging.DEBUG):
-            LOG.debug("submit: %s", str(ET.tostring(self.root), "utf-8"))
+            LOG.debug("submit: %s", self)
 
-        return self.pscad.submit(self.root, consumer)
+        return self.pscad.submit(self, consumer)
+
+
+#===============================================================================
+# Shared scopes
+#===============================================================================
+
+# Every proxy for a component on the same canvas has an identical scope
+# (project & definition), so they all share one read-only mapping instead of
+# each holding its own dictionary.
+_SCOPES = {}
+
+def intern_scope(scope):
+    """Return the shared, read-only copy of the given scope mapping"""
+
+    key = tuple(scope.items())
+    shared = _SCOPES.get(key)
+    if shared is None:
+        shared = _SCOPES.setdefault(key, MappingProxyType(dict(key)))
+    return shared
 
 
 #===============================================================================
@@ -377,18 +897,24 @@ class Command:
 
 class CommandScope:
 
+    __slots__ = ('_pscad', '_scope_name', '_scope')
+
     def __init__(self, pscad, scope_name, **scope):
 
         self._pscad = pscad
         self._scope_name = scope_name
-        self._scope = scope
+        self._scope = intern_scope(scope)
+
+    def _rescope(self, **scope):
+        self._scope = intern_scope(dict(self._scope, **scope))
 
     def command(self, cmd_name):
+        return self._command(cmd_name)
+
+    def _command(self, cmd_name, ids=()):
         if self._scope:
-            cmd = Command(self._pscad, cmd_name)
-            scope = cmd.scope(self._scope_name)
-            for key, val in self._scope.items():
-                ET.SubElement(scope, key).set('name', val)
+            cmd = Command.scoped(self._pscad, cmd_name, self._scope_name,
+                                 self._scope, ids)
         else:
             cmd = Command(self._pscad, cmd_name, self._scope_name)
 
@@ -396,7 +922,7 @@ class CommandScope:
 
     def _set_value(self, name, value):
         cmd = self.command('set-' + name)
-        cmd.tag(name).set('value', str(value))
+        cmd.add_tag(name, value=str(value))
         resp = cmd.execute()
         success = resp.get('success') == 'true'
         if not success:
@@ -414,24 +940,79 @@ class CommandScope:
 
         return value
 
+    def _shadow_key(self, name):
+        return (self._scope_name, tuple(self._scope.items()), (), name)
+
+    def _known_parameters(self, name=None):
+        """The remembered list of all parameters, if delta writes are enabled
+        and it is known; otherwise `None`"""
+
+        entry = self._pscad._shadow_entry(self._shadow_key(name))
+        if entry is not None and entry[1]:
+            return entry[0]
+        return None
+
+    @staticmethod
+    def _parameter_values(parameters):
+        values = {}
+        for key, value in parameters.items():
+            if isinstance(value, bool):
+                value = 'true' if value else 'false'
+            values[key] = str(value)
+        return values
+
+    def _parameters_command(self, name=None, values=None):
+        """A 'set-parameters' command for the given (string) values, or
+        a 'list-parameters' command if no values are given"""
+
+        cmd = self.command('set-parameters' if values else 'list-parameters')
+        if name:
+            cmd.add_tag('name', value=name)
+        if values:
+            for key, value in values.items():
+                cmd.add_param(key, value)
+        return cmd
+
+    @staticmethod
+    def _parameter_list(resp):
+        parameters = {}
+        for param in resp.findall('paramlist/param'):
+            parameters[param.get('name')] = param.get('value')
+        return parameters
+
     def _parameters(self, name=None, parameters=None):
         if parameters:
-            cmd = self.command('set-parameters')
-            if name:
-                cmd.tag('name').set('value', name)
-            for key, value in parameters.items():
-                if isinstance(value, bool):
-                    value = 'true' if value else 'false'
-                cmd.param(cmd.root, key, str(value))
-            cmd.execute()
+            values = self._parameter_values(parameters)
+
+            shadow_key = self._shadow_key(name)
+            entry = self._pscad._shadow_entry(shadow_key)
+            batch = self._pscad._batch
+            if entry is not None:
+                known = entry[0]
+                # Values queued in the batch will replace the known ones
+                pending = batch.pending(shadow_key) if batch is not None \
+                          else None
+                if pending:
+                    known = dict(known, **pending)
+                values = {key: value for key, value in values.items()
+                          if known.get(key) != value}
+                if not values:
+                    return parameters
+
+            if batch is not None:
+                batch.set_parameters(self, name, shadow_key, values)
+                return parameters
+
+            resp = self._parameters_command(name, values).execute()
+            if resp is not None and resp.get('success') == 'true':
+                self._pscad._shadow_update(shadow_key, values)
+            else:
+                self._pscad._shadow_forget(shadow_key)
         else:
-            cmd = self.command('list-parameters')
-            if name:
-                cmd.tag('name').set('value', name)
-            resp = cmd.execute()
-            parameters = {}
-            for param in resp.findall('paramlist/param'):
-                parameters[param.get('name')] = param.get('value')
+            resp = self._parameters_command(name).execute()
+            parameters = self._parameter_list(resp)
+            self._pscad._shadow_update(self._shadow_key(name), parameters,
+                                       complete=True)
 
         return parameters
 
@@ -441,7 +1022,7 @@ class CommandScope:
             for key, value in parameters.items():
                 if isinstance(value, bool):
                     value = 'true' if value else 'false'
-                cmd.param(cmd.root, key, str(value))
+                cmd.add_param(key, str(value))
             cmd.execute()
 
         return parameters
@@ -15,7 +15,6 @@ over a socket to a PSCAD process.
 
 # Standard Python imports
 import logging
-import xml.etree.ElementTree as ET
 
 # Automation imports
 from .command import CommandScope
@@ -37,6 +36,8 @@ class ComponentCommand(CommandScope):
 
     Create and submit commands with scope focused on a componnet id chain."""
 
+    __slots__ = ('_id', 'name')
+
     def __init__(self, parent, scope_name, *iid):
 
         """Create a command object for a component specified by an id chain."""
@@ -58,11 +59,10 @@ class ComponentCommand(CommandScope):
 
         """Construct a command object for the component"""
 
-        cmd = super().command(cmd_name)
-        for iid in self._id:
-            ET.SubElement(cmd._scope, 'component').set('id', str(iid))  # pylint: disable=protected-access
+        return self._command(cmd_name, self._id)
 
-        return cmd
+    def _shadow_key(self, name):
+        return (self._scope_name, tuple(self._scope.items()), self._id, name)
 
 
     #===========================================================================
@@ -126,27 +126,22 @@ class ComponentCommand(CommandScope):
         Delete this component.
         """
 
-        self._generic('IDM_DELETE')
+        resp = self._generic('IDM_DELETE')
+        if self._pscad is not None  and  resp is not None  and  \
+           resp.get('success') == 'true':
+            self._pscad._component_moved(self, None)
 
     #===========================================================================
     # Base methods for Set/Get Location
     #===========================================================================
 
-    def _set_location(self, x, y):
-
+    def _location_command(self, x, y):
         cmd = self.command('set-location')
-        tag = cmd.tag('location')
-        tag.set('x', str(x))
-        tag.set('y', str(y))
-
-        resp = cmd.execute()
-
-        return resp
-
-    def _get_location(self):
+        cmd.add_tag('location', x=str(x), y=str(y))
+        return cmd
 
-        cmd = self.command('get-location')
-        resp = cmd.execute()
+    @staticmethod
+    def _location_of(resp):
         loc = resp.find('location')
         if loc is not None:
             x = int(loc.get('x'))
@@ -155,6 +150,20 @@ class ComponentCommand(CommandScope):
         else:
             return None
 
+    def _set_location(self, x, y):
+
+        resp = self._location_command(x, y).execute()
+        if resp is not None  and  resp.get('success') == 'true':
+            self._pscad._component_moved(self, (x, y))
+
+        return resp
+
+    def _get_location(self):
+
+        cmd = self.command('get-location')
+        resp = cmd.execute()
+        return self._location_of(resp)
+
     #---------------------------------------------------------------------------
     # Allow attribute style access, e.g.)
     #    resistor.location = (10, 30)
@@ -207,9 +216,7 @@ class ComponentCommand(CommandScope):
             name (str): The layer to add the component to.
         """
 
-        cmd = self.command('add-to-layer')
-        cmd.tag('layer').set('name', name)
-        resp = cmd.execute()
+        resp = self._layer_command(name, True).execute()
         return resp
 
     def remove_from_layer(self, name):
@@ -222,8 +229,11 @@ class ComponentCommand(CommandScope):
             name (str): The layer to remove the component from.
         """
 
-        cmd = self.command('remove-from-layer')
-        cmd.tag('layer').set('name', name)
-        resp = cmd.execute()
+        resp = self._layer_command(name, False).execute()
         return resp
 
+    def _layer_command(self, name, add):
+        cmd = self.command('add-to-layer' if add else 'remove-from-layer')
+        cmd.add_tag('layer', name=name)
+        return cmd
+
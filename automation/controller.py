@@ -15,9 +15,9 @@ versions."""
 # Standard Python imports
 import os, logging, time
 import xml.etree.ElementTree as ET
-import win32api, win32con
 
 # ATS imports
+from .launcher import WindowsLauncher
 from .pscad import PSCAD
 
 
@@ -54,7 +54,10 @@ class Controller:
     #===========================================================================
 
     def launch(self, pscad_ver=None, rxtx_logger=None, options=None, *,
-               settings=None, timeout=15):
+               settings=None, timeout=15, launcher=None):
+
+        """Launch PSCAD (by default, the installed `pscad_ver` application),
+        or start or attach to it with the given :class:`.Launcher`"""
 
         if options is None:
             options = {}
@@ -63,10 +66,12 @@ class Controller:
             settings = { 'cl_use_advanced': True }
 
         options['path'] = self.get_param('pscad', pscad_ver)
-        if options['path']:
-            LOG.info("Launching %s: %s", pscad_ver, options['path'])
+        needs_path = launcher is None  or  isinstance(launcher, WindowsLauncher)
+        if options['path']  or  not needs_path:
+            LOG.info("Launching %s: %s", pscad_ver,
+                     options['path'] or launcher)
             try:
-                app = PSCAD(rxtx_logger, options)
+                app = PSCAD(rxtx_logger, options, launcher=launcher)
                 if settings:
                     app.settings(**settings)
                 if not app.licensed() and timeout > 0:
@@ -101,6 +106,11 @@ class Controller:
 
     @staticmethod
     def _default_product_list():
+        try:
+            import win32api, win32con
+        except ImportError:
+            return None                 # Not Windows: nothing is installed
+
         # Default Public documents location
         public_docs = r'C:\Users\Public\Documents'
 
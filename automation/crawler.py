@@ -0,0 +1,342 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Project Hierarchy Crawler
+#===============================================================================
+
+"""
+*****************
+Hierarchy Crawler
+*****************
+
+A crawler walks the module hierarchy of a project, and builds a compact,
+in-memory model of every page, every component on it, and (optionally)
+every component's parameters::
+
+    model = project.crawl()
+
+    for page in model.pages():
+        print(page.name, len(page.components))
+
+    for page, cmp in model.instances('master:resistor'):
+        print(page.name, cmp.id, cmp.parameters['R'])
+
+Each page is the canvas of a module definition, so it is listed once, no
+matter how many instances of the module there are.  The crawl proceeds one
+level of the hierarchy at a time; at each level, the `list-components`
+commands of all the new pages are pipelined, then the `get-definition` and
+`list-parameters` commands of all their components, and then an `is-module`
+command for each definition not seen before.
+
+A :class:`Crawler` remembers which definitions are modules, and the contents
+of each page it has listed, so a second crawl with the same crawler only
+lists pages it has not seen.  Use :meth:`Crawler.clear` (or a new crawler)
+after the project has been changed.
+
+.. autoclass:: Crawler
+    :members:
+.. autoclass:: ProjectModel
+    :members:
+.. autoclass:: DefinitionInfo
+.. autoclass:: ComponentInfo
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging
+
+# ATS imports
+from .definition import Definition
+from .usercanvas import UserCanvas
+from .usercmp import UserComponent
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Project Model
+#===============================================================================
+
+class ComponentInfo:
+
+    """
+    A component on a page.
+
+    Attributes:
+        id (int): The component's Id attribute.
+        kind (str): `User`, `Wire`, `Frame`, ...
+        classid (str): `UserCmp`, `Bus`, `WireOrthogonal`, ...
+        name (str): The `name` attribute of the component, if any.
+        definition (str): Scoped name of a user component's definition.
+        parameters (dict): The component's parameters, if they were read.
+    """
+
+    __slots__ = ('id', 'kind', 'classid', 'name', 'definition', 'parameters')
+
+    def __init__(self, iid, kind, classid, name):
+        self.id = iid                               # pylint: disable=invalid-name
+        self.kind = kind
+        self.classid = classid
+        self.name = name
+        self.definition = None
+        self.parameters = None
+
+    def __repr__(self):
+        return "{}[{}]".format(self.definition or self.classid or self.kind,
+                               self.id)
+
+
+class DefinitionInfo:
+
+    """
+    A component definition used in the project.
+
+    Attributes:
+        name (str): Scoped name of the definition, such as `"master:resistor"`.
+        is_module (bool): Whether the definition has a canvas (a page).
+        components (list): The :class:`ComponentInfo` of each component on
+            the page, or `None` if the definition is not a module.
+    """
+
+    __slots__ = ('name', 'is_module', 'components')
+
+    def __init__(self, name, is_module, components=None):
+        self.name = name
+        self.is_module = is_module
+        self.components = components
+
+    def __repr__(self):
+        if self.components is None:
+            return "Definition[{}]".format(self.name)
+        return "Page[{}, {} components]".format(self.name,
+                                                len(self.components))
+
+
+class ProjectModel:
+
+    """
+    The pages and definitions of a project, as found by a :class:`Crawler`.
+
+    Attributes:
+        name (str): The project name.
+        root (str): Scoped name of the top-level page.
+        definitions (dict): :class:`DefinitionInfo`, by scoped name, of the
+            root page and of every definition used below it.
+    """
+
+    def __init__(self, name, root):
+        self.name = name
+        self.root = root
+        self.definitions = {}
+
+    def __repr__(self):
+        pages = self.pages()
+        return "ProjectModel({!r}: {} pages, {} components, {} definitions)" \
+               .format(self.name, len(pages),
+                       sum(len(page.components) for page in pages),
+                       len(self.definitions))
+
+    def pages(self):
+        """The :class:`DefinitionInfo` of every module definition"""
+
+        return [defn for defn in self.definitions.values() if defn.is_module]
+
+    def page(self, name):
+        """The :class:`DefinitionInfo` of the named page"""
+
+        return self.definitions[name]
+
+    def instances(self, definition):
+        """
+        Every use of a definition.
+
+        Returns:
+            list: `(page, component)` pairs, for each page the definition is
+            used on, rather than each instance of those pages.
+        """
+
+        return [(page, cmp) for page in self.pages()
+                for cmp in page.components if cmp.definition == definition]
+
+    def walk(self, name=None, path=()):
+        """
+        Visit every page instance in the hierarchy, depth first.
+
+        Yields:
+            `(path, page)`, where `path` is the tuple of component Ids of the
+            module instances leading to the page from the root.
+        """
+
+        page = self.definitions[name or self.root]
+        yield path, page
+
+        definitions = self.definitions
+        for cmp in page.components:
+            child = definitions.get(cmp.definition)
+            if child is not None  and  child.is_module  and  \
+               child is not page:
+                yield from self.walk(child.name, path + (cmp.id,))
+
+
+#===============================================================================
+# Crawler
+#===============================================================================
+
+class Crawler:
+
+    """
+    Walks the module hierarchy of a project, pipelining its requests.
+
+    Created by :meth:`.ProjectCommands.crawl`.
+
+    Parameters:
+        project: The project to crawl.
+        parameters (bool): Also read the parameters of every component.
+        window (int): Number of commands in flight at once.
+    """
+
+    def __init__(self, project, parameters=True, window=64):
+        self._project = project
+        self._pscad = project._pscad                # pylint: disable=protected-access
+        self._parameters = parameters
+        self._window = window
+
+        self._projects = {project.name: project}
+        self._modules = {}          # Whether a module, by (project, defn)
+        self._pages = {}            # DefinitionInfo, by (project, defn)
+        self._keys = {}             # (project, defn), by scoped name
+
+    def clear(self):
+        """Forget everything learnt by earlier crawls"""
+
+        self._modules.clear()
+        self._pages.clear()
+        self._keys.clear()
+
+    def _scoped(self, key):
+        name = "{}:{}".format(*key)
+        self._keys[name] = key
+        return name
+
+    def _canvas(self, key):
+        prj_name, defn_name = key
+        project = self._projects.get(prj_name)
+        if project is None:
+            project = self._pscad.project(prj_name)
+            self._projects[prj_name] = project
+        return UserCanvas(project, defn_name)
+
+
+    #===========================================================================
+    # Crawl
+    #===========================================================================
+
+    def crawl(self, root='Main'):
+        """
+        Walk the hierarchy below a page.
+
+        Parameters:
+            root (str): Definition name of the top-level page.
+
+        Returns:
+            ProjectModel: The model of the project.
+        """
+
+        key = (self._project.name, root)
+        model = ProjectModel(self._project.name, self._scoped(key))
+        self._modules[key] = True
+
+        level = [key]
+        depth = 0
+        while level:
+            self._list([key for key in level if key not in self._pages])
+
+            used = set()
+            for key in level:
+                page = self._pages[key]
+                model.definitions[page.name] = page
+                used.update(cmp.definition for cmp in page.components
+                            if cmp.definition is not None)
+            used = {name: self._keys[name] for name in used
+                    if name not in model.definitions}
+
+            self._classify([key for key in used.values()
+                            if key not in self._modules])
+
+            level = []
+            for name, key in used.items():
+                if self._modules[key]:
+                    level.append(key)
+                else:
+                    model.definitions[name] = DefinitionInfo(name, False)
+
+            depth += 1
+            LOG.debug("%s: crawled level %d, %d pages next",
+                      self._project, depth, len(level))
+
+        return model
+
+    def _list(self, keys):
+        """List the components of each page, then read their definitions
+        and parameters"""
+
+        if not keys:
+            return
+
+        canvases = [self._canvas(key) for key in keys]
+        replies = self._pscad.execute_many(
+            [canvas.command('list-components') for canvas in canvases],
+            self._window)
+
+        reads = []                  # (ComponentInfo, command, is-definition)
+        for key, canvas, resp in zip(keys, canvases, replies):
+            components = []
+            self._pages[key] = DefinitionInfo(self._scoped(key), True,
+                                              components)
+            if resp is None  or  resp.get('success') != 'true':
+                LOG.warning("%s: unable to list components", canvas)
+                continue
+
+            for node in resp.findall('components/*'):
+                cmp = ComponentInfo(int(node.get('id')), node.tag,
+                                    node.get('classid'), node.get('name'))
+                components.append(cmp)
+                proxy = canvas._to_component(node)  # pylint: disable=protected-access
+                if node.tag == 'User':
+                    reads.append((cmp, proxy.command('get-definition'), True))
+                if self._parameters  and  proxy is not None:
+                    reads.append((cmp, proxy._parameters_command(), False)) # pylint: disable=protected-access
+
+        replies = self._pscad.execute_many([cmd for _, cmd, _ in reads],
+                                           self._window)
+
+        for (cmp, _, is_definition), resp in zip(reads, replies):
+            if resp is None  or  resp.get('success') != 'true':
+                continue
+            if is_definition:
+                key = UserComponent._definition_of(resp) # pylint: disable=protected-access
+                if key is not None:
+                    cmp.definition = self._scoped(key)
+            else:
+                cmp.parameters = UserComponent._parameter_list(resp) # pylint: disable=protected-access
+
+    def _classify(self, keys):
+        """Find out which of the definitions are modules"""
+
+        if not keys:
+            return
+
+        definitions = [Definition(self._project, *key) for key in keys]
+        replies = self._pscad.execute_many(
+            [defn.command('is-module') for defn in definitions], self._window)
+
+        for key, resp in zip(keys, replies):
+            self._modules[key] = Definition._module_of(resp) # pylint: disable=protected-access
@@ -46,6 +46,8 @@ class Definition(CommandScope):
     the component is a module, with its own canvas containing other components.
     """
 
+    __slots__ = ()
+
     def __init__(self, parent, project_name, defn_name):
 
         """Construct a command component for a Definition, identified by name"""
@@ -96,14 +98,17 @@ class Definition(CommandScope):
         A `module` will have a canvas, which can contain other components.
         """
 
-        flag = False
-
         resp = self.command('is-module').execute()
+
+        return self._module_of(resp)
+
+    @staticmethod
+    def _module_of(resp):
+        flag = False
         if resp is not None:
             module = resp.find('module')
             if module is not None:
                 flag = module.get('value') == 'true'
-
         return flag
 
 
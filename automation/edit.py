@@ -0,0 +1,433 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Canvas Edit Sessions
+#===============================================================================
+
+"""
+*************
+Edit Sessions
+*************
+
+An edit session records changes to the components of a canvas, without
+sending anything to PSCAD, and then applies them all at once::
+
+    with canvas.edit(rollback=True) as edit:
+        for cmp, (x, y) in layout.items():
+            edit.move(cmp, x, y)
+            edit.add_to_layer(cmp, 'Relocated')
+        edit.set_vertices(wire, [(0, 0), (0, 72), (144, 72)])
+
+    if not edit.report.succeeded:
+        print(edit.report.failed())
+
+Only the final state of each component matters: moving a component twice
+sends one `set-location` command, and parameter changes to a component are
+merged into one `set-parameters` command.  The commands are pipelined.
+
+With `rollback=True`, the original locations, vertices and parameter values
+are read first (also pipelined), changes which would not change anything are
+dropped, and if any command fails, the changes which did succeed are undone.
+PSCAD cannot be asked which layers a component is on, so a layer change is
+only undone if the caller says whether the component was on the layer
+beforehand::
+
+    edit.add_to_layer(cmp, 'Relocated', was_member=False)
+
+Applied layer changes which cannot be undone are listed in the report's
+`not_undone`.
+
+If the `with` block raises an exception, nothing is sent.
+
+.. autoclass:: EditSession
+    :members:
+.. autoclass:: EditReport
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging
+from collections import namedtuple
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Edits
+#===============================================================================
+
+EditResult = namedtuple('EditResult', 'component change success reply')
+
+
+class _Move:
+
+    __slots__ = ('component', 'location', 'original')
+
+    def __init__(self, component, location):
+        self.component = component
+        self.location = location
+        self.original = None
+
+    def change(self):
+        return ('move', self.location)
+
+    def read(self):
+        return self.component.command('get-location')
+
+    def keep(self, resp):
+        self.original = self.component._location_of(resp) # pylint: disable=protected-access
+        return self.original != self.location
+
+    def command(self):
+        return self.component._location_command(*self.location) # pylint: disable=protected-access
+
+    def undo(self):
+        if self.original is None:
+            return None
+        return self.component._location_command(*self.original) # pylint: disable=protected-access
+
+
+class _Vertices:
+
+    __slots__ = ('component', 'vertices', 'original')
+
+    def __init__(self, component, vertices):
+        self.component = component
+        self.vertices = [tuple(vertex) for vertex in vertices]
+        self.original = None
+
+    def change(self):
+        return ('vertices', self.vertices)
+
+    def read(self):
+        return self.component.command('list-vertices')
+
+    def keep(self, resp):
+        self.original = self.component._vertices_of(resp) # pylint: disable=protected-access
+        # PSCAD reports the elbows an orthogonal wire was given, too
+        return not self.component._same_path(self.original, self.vertices) # pylint: disable=protected-access
+
+    def command(self):
+        return self.component._vertices_command(self.vertices) # pylint: disable=protected-access
+
+    def undo(self):
+        if not self.original:
+            return None
+        return self.component._vertices_command(self.original) # pylint: disable=protected-access
+
+
+class _Layer:
+
+    __slots__ = ('component', 'layer', 'add', 'original')
+
+    def __init__(self, component, layer, add, original=None):
+        self.component = component
+        self.layer = layer
+        self.add = add
+        self.original = original    # Membership before the edit, if known
+
+    def change(self):
+        return ('add-to-layer' if self.add else 'remove-from-layer',
+                self.layer)
+
+    read = None
+
+    def command(self):
+        return self.component._layer_command(self.layer, self.add) # pylint: disable=protected-access
+
+    def unchanged(self):
+        return self.original is not None  and  self.original == self.add
+
+    def undo(self):
+        if self.original is None  or  self.unchanged():
+            return None
+        return self.component._layer_command(self.layer, self.original) # pylint: disable=protected-access
+
+
+class _Parameters:
+
+    __slots__ = ('component', 'values', 'original')
+
+    def __init__(self, component):
+        self.component = component
+        self.values = {}
+        self.original = None
+
+    def change(self):
+        return ('parameters', self.values)
+
+    def read(self):
+        return self.component._parameters_command() # pylint: disable=protected-access
+
+    def keep(self, resp):
+        current = self.component._parameter_list(resp) # pylint: disable=protected-access
+        self.values = {key: value for key, value in self.values.items()
+                       if current.get(key) != value}
+        self.original = {key: current[key] for key in self.values
+                         if key in current}
+        return bool(self.values)
+
+    def command(self):
+        return self.component._parameters_command(None, self.values) # pylint: disable=protected-access
+
+    def undo(self):
+        if not self.original:
+            return None
+        return self.component._parameters_command(None, self.original) # pylint: disable=protected-access
+
+    def applied(self, success):
+        pscad = self.component._pscad               # pylint: disable=protected-access
+        key = self.component._shadow_key(None)      # pylint: disable=protected-access
+        if success:
+            pscad._shadow_update(key, self.values)  # pylint: disable=protected-access
+        else:
+            pscad._shadow_forget(key)               # pylint: disable=protected-access
+
+
+#===============================================================================
+# Edit Report
+#===============================================================================
+
+class EditReport:
+
+    """
+    The outcome of an edit session.
+
+    Attributes:
+        results (list): An `EditResult(component, change, success, reply)`
+            for each change sent.
+        skipped (int): Number of changes dropped, because they would not
+            have changed anything.
+        rolled_back (bool): Whether the successful changes were undone.
+        undo_failures (list): `EditResult` of each undo which failed.
+        not_undone (list): `EditResult` of each applied change which could
+            not be undone, because its original state was unknown.
+    """
+
+    def __init__(self):
+        self.results = []
+        self.skipped = 0
+        self.rolled_back = False
+        self.undo_failures = []
+        self.not_undone = []
+
+    @property
+    def succeeded(self):
+        """`True` if every change was applied"""
+
+        return all(result.success for result in self.results)
+
+    def failed(self):
+        """The results of the changes which failed"""
+
+        return [result for result in self.results if not result.success]
+
+    def __repr__(self):
+        return "EditReport({} sent, {} failed, {} skipped{})".format(
+            len(self.results), len(self.failed()), self.skipped,
+            ", rolled back" if self.rolled_back else "")
+
+
+#===============================================================================
+# Edit Session
+#===============================================================================
+
+class EditSession:
+
+    """
+    Changes to a canvas's components, recorded locally and sent together.
+
+    Created by :meth:`.UserCanvas.edit`.
+
+    Parameters:
+        canvas: The canvas being edited.
+        rollback (bool): Undo the applied changes if any change fails.
+        window (int): Number of commands in flight at once.
+    """
+
+    def __init__(self, canvas, rollback=False, window=64):
+        self._canvas = canvas
+        self._rollback = rollback
+        self._window = window
+        self._edits = {}            # Final change, by (component, kind)
+        self.report = None
+
+    def __len__(self):
+        return len(self._edits)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            LOG.warning("%s: edit session abandoned, nothing was sent",
+                        self._canvas)
+            self._edits = {}
+
+
+    #===========================================================================
+    # Record changes
+    #===========================================================================
+
+    @staticmethod
+    def _key(component):
+        return component._shadow_key(None)          # pylint: disable=protected-access
+
+    def move(self, component, x, y):
+        """Move a component to `(x, y)`"""
+
+        self._edits[self._key(component), 'move'] = _Move(component, (x, y))
+
+    def set_vertices(self, wire, vertices):
+        """Replace the vertices of a wire"""
+
+        self._edits[self._key(wire), 'vertices'] = _Vertices(wire, vertices)
+
+    def add_to_layer(self, component, layer, was_member=None):
+        """Add a component to a layer.  With rollback, the change is only
+        undone if `was_member` tells whether it was on the layer before."""
+
+        self._edits[self._key(component), 'layer', layer] = \
+            _Layer(component, layer, True, was_member)
+
+    def remove_from_layer(self, component, layer, was_member=None):
+        """Remove a component from a layer.  With rollback, the change is
+        only undone if `was_member` tells whether it was on the layer
+        before."""
+
+        self._edits[self._key(component), 'layer', layer] = \
+            _Layer(component, layer, False, was_member)
+
+    def set_parameters(self, component, **parameters):
+        """Change some of a component's parameters"""
+
+        key = self._key(component), 'parameters'
+        edit = self._edits.get(key)
+        if edit is None:
+            edit = self._edits[key] = _Parameters(component)
+        edit.values.update(component._parameter_values(parameters)) # pylint: disable=protected-access
+
+
+    #===========================================================================
+    # Apply
+    #===========================================================================
+
+    def commit(self):
+        """
+        Send the recorded changes.
+
+        Returns:
+            EditReport: The outcome of each change.
+        """
+
+        edits = list(self._edits.values())
+        self._edits = {}
+        report = EditReport()
+        self.report = report
+        if not edits:
+            return report
+
+        pscad = self._canvas._pscad                 # pylint: disable=protected-access
+
+        # Drop parameter values PSCAD is already known to have
+        for edit in edits:
+            if isinstance(edit, _Parameters):
+                known = pscad._shadow_entry(self._key(edit.component)) # pylint: disable=protected-access
+                if known is not None:
+                    edit.values = {key: value
+                                   for key, value in edit.values.items()
+                                   if known[0].get(key) != value}
+
+        if self._rollback:
+            edits = self._read_originals(pscad, edits, report)
+        else:
+            kept = [edit for edit in edits
+                    if not isinstance(edit, _Parameters) or edit.values]
+            report.skipped += len(edits) - len(kept)
+            edits = kept
+
+        if not edits:
+            return report
+
+        cmds = [edit.command() for edit in edits]
+        LOG.info("%s: applying %d changes", self._canvas, len(cmds))
+        replies = pscad.execute_many(cmds, self._window)
+
+        applied = []
+        for edit, cmd, resp in zip(edits, cmds, replies):
+            success = resp is not None  and  resp.get('success') == 'true'
+            if isinstance(edit, _Parameters):
+                edit.applied(success)
+            elif isinstance(edit, _Move) and success:
+                pscad._component_moved(edit.component, edit.location) # pylint: disable=protected-access
+            if success:
+                applied.append(edit)
+            else:
+                LOG.error("Edit failed: %s", cmd)
+                LOG.error("  resp %s", resp)
+            report.results.append(EditResult(edit.component, edit.change(),
+                                             success, resp))
+
+        if self._rollback  and  len(applied) < len(edits):
+            self._undo(pscad, applied, report)
+
+        return report
+
+    def _read_originals(self, pscad, edits, report):
+
+        readable = [edit for edit in edits if edit.read is not None]
+        replies = pscad.execute_many([edit.read() for edit in readable],
+                                     self._window)
+
+        dropped = set()
+        for edit, resp in zip(readable, replies):
+            if resp is None  or  resp.get('success') != 'true':
+                raise RuntimeError("Unable to read {!r} before editing"
+                                   .format(edit.component))
+            if not edit.keep(resp):
+                dropped.add(id(edit))
+
+        for edit in edits:
+            if isinstance(edit, _Layer)  and  edit.unchanged():
+                dropped.add(id(edit))
+
+        report.skipped += len(dropped)
+        return [edit for edit in edits if id(edit) not in dropped]
+
+    def _undo(self, pscad, applied, report):
+
+        LOG.warning("%s: rolling back %d changes", self._canvas, len(applied))
+
+        undo = [(edit, edit.undo()) for edit in reversed(applied)]
+        for edit, cmd in undo:
+            if cmd is None  and  isinstance(edit, _Layer):
+                LOG.warning("Cannot undo %s of %s: original membership "
+                            "unknown", edit.change(), edit.component)
+                report.not_undone.append(
+                    EditResult(edit.component, edit.change(), True, None))
+        undo = [(edit, cmd) for edit, cmd in undo if cmd is not None]
+        replies = pscad.execute_many([cmd for _, cmd in undo], self._window)
+
+        for (edit, cmd), resp in zip(undo, replies):
+            success = resp is not None  and  resp.get('success') == 'true'
+            if isinstance(edit, _Parameters):
+                pscad._shadow_forget(self._key(edit.component)) # pylint: disable=protected-access
+            elif isinstance(edit, _Move) and success:
+                pscad._component_moved(edit.component, edit.original) # pylint: disable=protected-access
+            if not success:
+                LOG.error("Undo failed: %s", cmd)
+                report.undo_failures.append(
+                    EditResult(edit.component, edit.change(), False, resp))
+
+        report.rolled_back = True
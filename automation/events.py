@@ -0,0 +1,342 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Event Streams
+#===============================================================================
+
+"""
+*************
+Event Streams
+*************
+
+An event stream turns the `build-events` and `load-events` subscriptions into
+a sequence of lightweight :class:`Event` records, which may be consumed with
+a plain or an asynchronous `for` loop::
+
+    with EventStream(pscad) as stream:
+        pscad.project('vdiv').run(...)
+        for event in stream.events(timeout=0):
+            print(event.phase, event.status, event.elapsed)
+
+Events are buffered in a bounded :class:`EventQueue`.  When the consumer
+falls behind, events are dropped (oldest first, by default) rather than
+holding up the connection to PSCAD.  Several streams, one per PSCAD
+instance, may share a single queue, so one orchestrator can follow the
+progress of many instances.
+
+.. autoclass:: Event
+.. autoclass:: EventQueue
+    :members:
+.. autoclass:: EventStream
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import asyncio, logging, threading, time
+from collections import deque, namedtuple
+
+# ATS imports
+from .handler import AbstractHandler
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Event record
+#===============================================================================
+
+_Event = namedtuple('Event', 'kind phase status project elapsed file_type '
+                    'source timestamp')
+
+class Event(_Event):
+
+    """Event(kind, phase, status, project, elapsed, file_type, source,\
+        timestamp)
+
+    ========= ==============================================================
+    kind      Type of event, such as 'BuildEvent' or 'LoadEvent'
+    phase     Name of the build/load phase
+    status    'BEGIN' or 'END' (or any other status PSCAD reports)
+    project   Name of the project the event applies to, or `None`
+    elapsed   Elapsed time reported by PSCAD, or `None`
+    file_type The 'file-type' of a load event, or `None`
+    source    Label of the stream (PSCAD instance) the event arrived on
+    timestamp Client-side `time.perf_counter()` when the event arrived
+    ========= ==============================================================
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, msg, source=None):
+        """Build an event record from a PSCAD event message, or return `None`
+        if the message does not contain an event"""
+
+        event = msg.find('event')
+        if event is None:
+            return None
+
+        etype = event.find('type')
+        phase = status = file_type = None
+        if etype is not None:
+            phase = etype.get('name')
+            status = etype.get('status')
+            file_type = etype.get('file-type')
+
+        project = event.find('project')
+        prj_name = project.get('name') if project is not None else None
+
+        elapsed = msg.get('elapsed')
+        elapsed = int(elapsed) if elapsed is not None else None
+
+        return cls(event.get('type'), phase, status, prj_name, elapsed,
+                   file_type, source, time.perf_counter())
+
+
+#===============================================================================
+# Bounded event queue
+#===============================================================================
+
+class EventQueue:
+
+    """
+    A bounded, thread-safe queue of events.
+
+    Parameters:
+        maxsize (int): Maximum number of events held.
+        overflow (str): When full, either `'drop-oldest'` (default) or
+            `'drop-newest'`.
+    """
+
+    OVERFLOW = ('drop-oldest', 'drop-newest')
+
+    def __init__(self, maxsize=1024, overflow='drop-oldest'):
+
+        if overflow not in self.OVERFLOW:
+            raise ValueError("Invalid overflow policy: {!r}".format(overflow))
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+
+        self._events = deque()
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._ready = threading.Condition()
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def put(self, event):
+        """Add an event, dropping one if the queue is full"""
+
+        with self._ready:
+            if len(self._events) >= self._maxsize:
+                self.dropped += 1
+                if self._overflow == 'drop-newest':
+                    return
+                self._events.popleft()
+            self._events.append(event)
+            self._ready.notify()
+
+    def get_nowait(self):
+        """Remove and return the next event, or `None` if empty"""
+
+        with self._ready:
+            return self._events.popleft() if self._events else None
+
+    def get(self, timeout=None):
+        """Remove and return the next event, waiting up to `timeout` seconds
+        for one to arrive.  Returns `None` on timeout."""
+
+        with self._ready:
+            if not self._events:
+                self._ready.wait(timeout)
+            return self._events.popleft() if self._events else None
+
+    def wake(self):
+        """Release any threads waiting in :meth:`get`"""
+
+        with self._ready:
+            self._ready.notify_all()
+
+
+#===============================================================================
+# Event Stream
+#===============================================================================
+
+class EventStream(AbstractHandler):
+
+    """
+    A stream of :class:`Event` records from one PSCAD instance.
+
+    Parameters:
+        pscad: The PSCAD controller to follow.
+        subscriptions: Event subscriptions to follow, any of
+            `'build-events'` and `'load-events'`.
+        queue (EventQueue): Queue to deliver events into.  Streams for
+            different instances may share a queue.  (optional)
+        source: Label stored in each event's `source`. (optional)
+        pump (bool): If `True` (default), a consumer waiting for events
+            reads the connection to PSCAD itself.  Use `False` when another
+            thread owns the connection (for instance, is blocked in
+            :meth:`.ProjectCommands.run`) and the events are consumed
+            elsewhere.
+    """
+
+    EVENT_TYPES = {'build-events': 'BuildEvent', 'load-events': 'LoadEvent'}
+
+    def __init__(self, pscad, subscriptions=('build-events', 'load-events'),
+                 queue=None, source=None, pump=True):
+
+        super().__init__()
+
+        unknown = set(subscriptions) - set(self.EVENT_TYPES)
+        if unknown:
+            raise ValueError("Unknown subscriptions: {}".format(unknown))
+
+        self._pscad = pscad
+        self._subscriptions = tuple(subscriptions)
+        self._subscribed = []
+        self.event_types = tuple(self.EVENT_TYPES[name]
+                                 for name in subscriptions)
+        self.queue = queue if queue is not None else EventQueue()
+        self.source = source
+        self.pump = pump
+        self._closed = True
+
+
+    #===========================================================================
+    # Attach / Detach
+    #===========================================================================
+
+    def attach(self):
+        """Subscribe to the events, and start queuing them"""
+
+        if self._closed:
+            self._closed = False
+            self._pscad.add_handler(self)
+            for name in self._subscriptions:
+                if not self._pscad.subscribed(name):
+                    self._pscad.subscribe(name)
+                    self._subscribed.append(name)
+        return self
+
+    def detach(self):
+        """Stop queuing events, and drop any subscriptions this stream made"""
+
+        if not self._closed:
+            self._pscad.remove_handler(self)
+            for name in self._subscribed:
+                self._pscad.unsubscribe(name)
+            self._subscribed = []
+        self.close()
+
+    def close(self):
+        self._closed = True
+        self.queue.wake()
+
+    @property
+    def closed(self):
+        """`True` once the stream has been detached or closed"""
+
+        return self._closed
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
+
+
+    #===========================================================================
+    # Handler
+    #===========================================================================
+
+    def send(self, msg):
+        if msg is not None  and  not self._closed:
+            event = Event.parse(msg, self.source)
+            if event is not None:
+                self.queue.put(event)
+
+        # Observe only; let other handlers see the event, too.
+        return False
+
+
+    #===========================================================================
+    # Consumers
+    #===========================================================================
+
+    def get(self, timeout=None):
+        """
+        Retrieve the next event, waiting up to `timeout` seconds.
+
+        Returns:
+            The next :class:`Event`, or `None` if none arrived in time.
+        """
+
+        event = self.queue.get_nowait()
+        if event is None  and  timeout != 0:
+            if self.pump:
+                deadline = None if timeout is None else \
+                           time.perf_counter() + timeout
+                while event is None  and  self._pumping():
+                    self._pscad.poll()
+                    event = self.queue.get_nowait()
+                    if deadline is not None  and  \
+                       time.perf_counter() >= deadline:
+                        break
+            elif not self._closed:
+                event = self.queue.get(timeout)
+        return event
+
+    def _pumping(self):
+        return not self._closed  and  self._pscad.connected()
+
+    def events(self, timeout=None):
+        """
+        Iterate over the events.
+
+        Parameters:
+            timeout (float): Stop iterating once no event has arrived for
+                this many seconds.  With `timeout=0`, only the events
+                already queued are returned.  By default, iteration stops
+                only when the stream is detached or PSCAD disconnects.
+        """
+
+        while True:
+            event = self.get(timeout)
+            if event is None:
+                if timeout is not None  or  self._closed:
+                    return
+                if self.pump  and  not self._pscad.connected():
+                    return
+                continue
+            yield event
+
+    def __iter__(self):
+        return self.events()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            event = self.queue.get_nowait()
+            if event is None:
+                if self._closed:
+                    raise StopAsyncIteration
+                if self.pump  and  not self._pscad.connected():
+                    raise StopAsyncIteration
+                event = await loop.run_in_executor(None, self.get, 0.5)
+            if event is not None:
+                return event
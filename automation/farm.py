@@ -0,0 +1,224 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Build Farm
+#===============================================================================
+
+"""
+**********
+Build Farm
+**********
+
+A build farm compiles the cases of a workspace on several PSCAD instances
+at once.  Each instance of the :class:`.InstancePool` must have the same
+workspace loaded; the pool's factory is responsible for loading it.
+
+Cases are handed out one at a time to whichever instance is free, so a
+few long builds do not hold up the rest.  The build messages of every
+case are collected into a single :class:`BuildReport`.
+
+::
+
+    def launch(slot):
+        pscad = mhrc.automation.launch_pscad()
+        pscad.load(r'C:\\Work\\regression.pswx')
+        return pscad
+
+    farm = BuildFarm(InstancePool(launch, 4))
+    report = farm.build()
+    for result in report.failed():
+        print(result.project, result.error or len(result.errors()))
+
+.. autoclass:: BuildFarm
+    :members:
+.. autoclass:: BuildReport
+    :members:
+.. autoclass:: BuildResult
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging, time
+from collections import namedtuple
+
+# ATS imports
+from .events import EventStream
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Build results
+#===============================================================================
+
+_BuildResult = namedtuple('BuildResult', 'project instance elapsed messages '
+                          'events error')
+
+class BuildResult(_BuildResult):
+
+    """BuildResult(project, instance, elapsed, messages, events, error)
+
+    ========= ==============================================================
+    project   Name of the case
+    instance  Index of the instance which built the case
+    elapsed   Wall-clock build time, in seconds
+    messages  The case's :meth:`.ProjectCommands.messages` after the build
+    events    The build :class:`.Event` records, if collected
+    error     Description of the exception which aborted the build, or
+              `None`
+    ========= ==============================================================
+    """
+
+    __slots__ = ()
+
+    def errors(self):
+        """The build messages with an `error` status"""
+
+        return [msg for msg in self.messages if msg.status == 'error']
+
+    def warnings(self):
+        """The build messages with a `warning` status"""
+
+        return [msg for msg in self.messages if msg.status == 'warning']
+
+    @property
+    def succeeded(self):
+        """`True` if the build completed without error messages"""
+
+        return self.error is None  and  not self.errors()
+
+
+class BuildReport:
+
+    """The results of building a set of cases"""
+
+    def __init__(self, results=(), elapsed=None):
+        self._results = {result.project: result for result in results}
+        self.elapsed = elapsed
+
+    def __iter__(self):
+        return iter(self._results.values())
+
+    def __len__(self):
+        return len(self._results)
+
+    def __getitem__(self, project):
+        return self._results[project]
+
+    def add(self, result):
+        """Add (or replace) the result of a case"""
+
+        self._results[result.project] = result
+
+    def failed(self):
+        """The results of the cases which did not build cleanly"""
+
+        return [result for result in self if not result.succeeded]
+
+    def summary(self):
+        """A one-line-per-case textual summary"""
+
+        lines = []
+        for result in sorted(self, key=lambda result: result.project):
+            if result.error is not None:
+                status = "FAILED: " + result.error
+            else:
+                status = "{} errors, {} warnings".format(
+                    len(result.errors()), len(result.warnings()))
+            lines.append("{:<20} [{}] {:8.2f}s  {}".format(
+                result.project, result.instance, result.elapsed, status))
+        if self.elapsed is not None:
+            lines.append("Total: {} cases, {:.2f}s".format(len(self),
+                                                          self.elapsed))
+        return "\n".join(lines)
+
+
+#===============================================================================
+# Build Farm
+#===============================================================================
+
+class BuildFarm:
+
+    """
+    Build cases in parallel over a pool of PSCAD instances.
+
+    Parameters:
+        pool (InstancePool): The PSCAD instances, each with the workspace
+            loaded.
+        queue (EventQueue): If given, build events from all instances are
+            delivered to this queue as they happen, for progress monitoring
+            by another thread.  Otherwise, each case's events are kept in
+            its :class:`BuildResult`. (optional)
+    """
+
+    def __init__(self, pool, queue=None):
+        self._pool = pool
+        self._queue = queue
+
+    def cases(self):
+        """The names of the cases in the workspace"""
+
+        slot = self._pool.slots[0]
+        if not slot.alive():
+            slot.relaunch()
+
+        return [prj['name'] for prj in slot.pscad.list_projects()
+                if prj['type'] == 'Case']
+
+    def build(self, projects=None):
+        """
+        Build the given cases, or all cases in the workspace.
+
+        Returns:
+            BuildReport: The result of each case.
+        """
+
+        if projects is None:
+            projects = self.cases()
+
+        report = BuildReport()
+
+        def failed(project, ex):
+            report.add(BuildResult(project, None, 0.0, [], [], str(ex)))
+
+        start = time.perf_counter()
+        self._pool.run(projects, lambda slot, project:
+                       report.add(self._build(slot, project)), failed)
+        report.elapsed = time.perf_counter() - start
+
+        LOG.info("Built %d cases in %.2fs, %d failed", len(report),
+                 report.elapsed, len(report.failed()))
+        return report
+
+    def _build(self, slot, project):
+
+        pscad = slot.pscad
+        prj = pscad.project(project)
+
+        stream = EventStream(pscad, ('build-events',), queue=self._queue,
+                             source=slot.index, pump=False)
+
+        LOG.info("%r: building %s", slot, project)
+        start = time.perf_counter()
+        with stream:
+            prj.build()
+        elapsed = time.perf_counter() - start
+
+        events = []
+        if self._queue is None:
+            events = list(stream.events(timeout=0))
+            if not events  or  events[-1].status != 'END':
+                LOG.warning("%r: %s: no build END event received", slot,
+                            project)
+
+        return BuildResult(project, slot.index, elapsed, prj.messages(),
+                           events, None)
@@ -108,6 +108,8 @@ class GraphFrame(CanvasComponent):
 
     """
 
+    __slots__ = ('_canvas',)
+
     def __init__(self, canvas, *iid):
 
         """Construct a command component for a Graph Frame"""
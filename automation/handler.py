@@ -27,6 +27,10 @@ LOG = logging.getLogger(__name__)
 
 class AbstractHandler:
 
+    # Event types (such as 'BuildEvent') the handler is interested in.
+    # If None, the handler is shown every message.
+    event_types = None
+
     def __init__(self):
         pass
 
@@ -43,6 +47,8 @@ class AbstractHandler:
 
 class BuildEvent(AbstractHandler):
 
+    event_types = ('BuildEvent',)
+
     def __init__(self):
         super().__init__()
         self._level = 0
@@ -50,7 +56,7 @@ class BuildEvent(AbstractHandler):
     def send(self, msg):
         handled = False
 
-        if msg is not None:
+        if msg is not None  and  msg.event_type() == 'BuildEvent':
             event = msg.find("event[@type='BuildEvent']")
             if event is not None:
                 handled = self._build_event(msg, event)
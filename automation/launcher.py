@@ -0,0 +1,182 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Process Launchers
+#===============================================================================
+
+"""
+*********
+Launchers
+*********
+
+A launcher starts the process the :class:`.PSCAD` controller talks to, and
+establishes the connection to it.
+
+By default, PSCAD itself is started, on Windows, and told to connect back
+to the port the controller is listening on.  Other launchers allow the
+controller to be used with any program speaking the same protocol, such as
+a :mod:`replay server <.replay>` or another protocol simulator, on any
+platform::
+
+    launcher = CommandLauncher([sys.executable, '-m', 'automation.replay',
+                                '--port', '{port}', 'session.000000.rxtx'])
+    pscad = PSCAD(None, {}, launcher=launcher)
+
+.. autoclass:: Launcher
+    :members:
+.. autoclass:: WindowsLauncher
+.. autoclass:: CommandLauncher
+.. autoclass:: AttachLauncher
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging, shlex, socket, subprocess
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Launcher
+#===============================================================================
+
+class Launcher:
+
+    """
+    Base class for launchers.
+
+    A launcher whose `connects_back` is true starts a process which connects
+    to the port the controller listens on (as PSCAD does).  Otherwise, the
+    controller connects to the endpoint given by :meth:`attach`.
+    """
+
+    connects_back = True
+
+    def launch(self, port, options):
+        """
+        Start the process, telling it to connect to the given port.
+
+        Returns:
+            The `subprocess.Popen` process handle, or `None`.
+        """
+
+        raise NotImplementedError()
+
+    def attach(self):
+        """
+        Connect to an already listening process.
+
+        Returns:
+            socket.socket: The connected socket.
+        """
+
+        raise NotImplementedError()
+
+
+#===============================================================================
+# Windows PSCAD launcher
+#===============================================================================
+
+class WindowsLauncher(Launcher):
+
+    """
+    Launch the PSCAD application, on Windows.
+
+    Uses `options['path']`, plus the `'/silence'` and `'launch-minimized'`
+    options.
+    """
+
+    def launch(self, port, options):
+
+        # Windows-only modules are imported only when actually launching
+        import ctypes, win32con               # pylint: disable=import-outside-toplevel
+
+        path = options['path']
+
+        args = [path, '/startup:au', '/host:localhost', '/port:'+str(port),
+                '/nologo']
+        if '/silence' in options:
+            args.append('/silence:{}'.format(options['/silence']))
+
+        LOG.debug("Execute: %r", args)
+
+        # Suppress the "<Application> has stopped responding" Dialog.
+        # Child processes (PSCAD) and grand-child processes (EMTDC) will
+        # inherit this Error Mode, exiting immediately if they crash.
+        ctypes.windll.kernel32.SetErrorMode(win32con.SEM_NOGPFAULTERRORBOX)
+
+        # Start the PSCAD child process.
+        sui = subprocess.STARTUPINFO()
+        if 'launch-minimized' in options:
+            if options['launch-minimized']:
+                sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                sui.wShowWindow = win32con.SW_SHOWMINNOACTIVE
+            else:
+                sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                sui.wShowWindow = win32con.SW_SHOWNOACTIVATE
+
+        return subprocess.Popen(args, close_fds=True, startupinfo=sui)
+
+
+#===============================================================================
+# Generic command launcher
+#===============================================================================
+
+class CommandLauncher(Launcher):
+
+    """
+    Run any command which connects back to the controller.
+
+    Parameters:
+        command: The command, as a list of arguments or a string.  The
+            placeholders `{port}` and `{host}` are replaced by the port the
+            controller is listening on, and `localhost`.
+        **popen_args: Extra arguments for `subprocess.Popen`.
+    """
+
+    def __init__(self, command, **popen_args):
+        if isinstance(command, str):
+            command = shlex.split(command)
+        self._command = list(command)
+        self._popen_args = popen_args
+
+    def launch(self, port, options):
+        args = [arg.format(port=port, host='localhost')
+                for arg in self._command]
+        LOG.debug("Execute: %r", args)
+        return subprocess.Popen(args, close_fds=True, **self._popen_args)
+
+
+#===============================================================================
+# Attach launcher
+#===============================================================================
+
+class AttachLauncher(Launcher):
+
+    """
+    Connect to a process which is already listening, instead of starting
+    one.
+
+    Parameters:
+        port (int): The port the process listens on.
+        host (str): The host it runs on.
+        timeout (float): Connection timeout, in seconds.
+    """
+
+    connects_back = False
+
+    def __init__(self, port, host='localhost', timeout=30.0):
+        self._address = (host, port)
+        self._timeout = timeout
+
+    def attach(self):
+        LOG.info("Connecting to %s:%d", *self._address)
+        return socket.create_connection(self._address, self._timeout)
@@ -0,0 +1,266 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Command Metrics
+#===============================================================================
+
+"""
+***************
+Command Metrics
+***************
+
+Every command sent to PSCAD is counted, by command name, along with the
+size of the command and of its reply, and the time from sending the
+command to receiving its reply.  Latencies are kept in a histogram with
+power-of-two microsecond buckets, so recording a command costs a couple of
+additions, however many commands are sent.
+
+::
+
+    with pscad.profile() as prof:
+        project.run()
+    print(prof.report())
+
+    for name, stats in pscad.metrics()['commands'].items():
+        print(name, stats['count'], stats['p90'])
+
+The reply size is the length of the decoded reply text, which is its size
+in bytes for the ASCII text PSCAD sends.
+
+.. autoclass:: CommandMetrics
+    :members:
+.. autoclass:: Profile
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import time
+
+
+#===============================================================================
+# Per-command statistics
+#===============================================================================
+
+_BUCKETS = 32           # Bucket i counts latencies below 2**i microseconds
+
+
+class CommandStats:
+
+    """Statistics of one command name"""
+
+    __slots__ = ('count', 'failed', 'tx_bytes', 'rx_bytes', 'total',
+                 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.tx_bytes = 0
+        self.rx_bytes = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, tx_bytes, rx_bytes, seconds, success):
+        self.count += 1
+        if not success:
+            self.failed += 1
+        self.tx_bytes += tx_bytes
+        self.rx_bytes += rx_bytes
+        self.total += seconds
+        if self.min is None  or  seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), _BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the latency below which `fraction` of the replies
+        arrived, from the histogram (clamped to the largest latency seen)"""
+
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank  and  count:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'failed': self.failed,
+            'tx_bytes': self.tx_bytes,
+            'rx_bytes': self.rx_bytes,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max if self.count else None,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p99': self.percentile(0.99),
+            'histogram': {(1 << index) / 1e6: count
+                          for index, count in enumerate(self.buckets)
+                          if count},
+            }
+
+
+#===============================================================================
+# Collection
+#===============================================================================
+
+class CommandMetrics:
+
+    """
+    Per-command-name metrics of one PSCAD connection.
+
+    Statistics are recorded into every active "sink": the connection's
+    running totals, while enabled, and each :class:`Profile` in progress.
+    """
+
+    def __init__(self):
+        self._totals = {}
+        self._started = time.perf_counter()
+        self._sinks = [self._totals]
+
+    @property
+    def active(self):
+        """`True` if anything is recording"""
+
+        return bool(self._sinks)
+
+    @property
+    def enabled(self):
+        """`True` if the running totals are being recorded"""
+
+        return any(sink is self._totals for sink in self._sinks)
+
+    def enable(self, enable=True):
+        """Start or stop recording the running totals"""
+
+        if enable != self.enabled:
+            if enable:
+                self._sinks = self._sinks + [self._totals]
+            else:
+                self._sinks = [sink for sink in self._sinks
+                               if sink is not self._totals]
+
+    def record(self, name, tx_bytes, rx_bytes, seconds, success=True):
+        """Record one command and its reply"""
+
+        for sink in self._sinks:
+            stats = sink.get(name)
+            if stats is None:
+                stats = sink[name] = CommandStats()
+            stats.add(tx_bytes, rx_bytes, seconds, success)
+
+    def reset(self):
+        """Discard the running totals"""
+
+        self._totals.clear()
+        self._started = time.perf_counter()
+
+    def snapshot(self):
+        """The running totals, as a dictionary"""
+
+        return _snapshot(self._totals, time.perf_counter() - self._started)
+
+    def profile(self):
+        """A :class:`Profile` of the commands sent while it is active"""
+
+        return Profile(self)
+
+    def _attach(self, sink):
+        self._sinks = self._sinks + [sink]      # Copy on write
+
+    def _detach(self, sink):
+        self._sinks = [other for other in self._sinks if other is not sink]
+
+
+def _snapshot(stats, elapsed):
+
+    commands = {name: stats[name].snapshot() for name in sorted(stats)}
+    count = sum(entry['count'] for entry in commands.values())
+    latency = sum(entry['total'] for entry in commands.values())
+    return {
+        'elapsed': elapsed,
+        'count': count,
+        'failed': sum(entry['failed'] for entry in commands.values()),
+        'tx_bytes': sum(entry['tx_bytes'] for entry in commands.values()),
+        'rx_bytes': sum(entry['rx_bytes'] for entry in commands.values()),
+        'latency': latency,
+        'rate': count / elapsed if elapsed > 0 else None,
+        'commands': commands,
+        }
+
+
+#===============================================================================
+# Profile
+#===============================================================================
+
+class Profile:
+
+    """
+    Metrics of the commands sent during a region of a script.
+
+    Used as a context manager; the metrics remain available afterwards.
+    """
+
+    def __init__(self, metrics):
+        self._metrics = metrics
+        self._stats = {}
+        self._start = None
+        self._end = None
+
+    def __enter__(self):
+        self._stats.clear()
+        self._start = time.perf_counter()
+        self._end = None
+        self._metrics._attach(self._stats)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics._detach(self._stats)
+        self._end = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        """Wall-clock duration of the profiled region, in seconds"""
+
+        if self._start is None:
+            return 0.0
+        end = self._end if self._end is not None else time.perf_counter()
+        return end - self._start
+
+    def snapshot(self):
+        """The region's metrics, as a dictionary"""
+
+        return _snapshot(self._stats, self.elapsed)
+
+    def report(self):
+        """The region's metrics, as a table, slowest commands first"""
+
+        snap = self.snapshot()
+        lines = ["{:<28} {:>7} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+            "Command", "Count", "Total ms", "Mean ms", "p90 ms", "Tx bytes",
+            "Rx bytes")]
+        rows = sorted(snap['commands'].items(),
+                      key=lambda item: -item[1]['total'])
+        for name, entry in rows:
+            lines.append(
+                "{:<28} {:>7} {:>10.2f} {:>10.3f} {:>10.3f} {:>10} {:>10}"
+                .format(name, entry['count'], entry['total'] * 1e3,
+                        entry['mean'] * 1e3, entry['p90'] * 1e3,
+                        entry['tx_bytes'], entry['rx_bytes']))
+        lines.append("{} commands in {:.3f}s, {:.3f}s total reply latency"
+                     .format(snap['count'], snap['elapsed'], snap['latency']))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
@@ -0,0 +1,344 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Simulation Set Orchestration
+#===============================================================================
+
+"""
+***************************
+Simulation Set Orchestrator
+***************************
+
+The simulation sets of a workspace, linked by their
+:meth:`depends_on <.SimulationSet.depends_on>` settings, form a directed
+acyclic graph.  The orchestrator runs each set on one instance of an
+:class:`.InstancePool` as soon as the set it depends on has finished, so
+independent sets run concurrently on different instances.
+
+Every instance must have the same workspace loaded, and the sets must
+exchange data only through files visible to all instances.
+
+::
+
+    graph = SimulationGraph.read(pscad)
+    report = Orchestrator(graph).run(InstancePool(launch, 3))
+
+    names, seconds = report.critical_path()
+    print("Critical path", " -> ".join(names), seconds)
+    print("Makespan", report.makespan)
+
+A set whose dependency failed is not run; it is reported as skipped.
+
+.. autoclass:: SimulationGraph
+    :members:
+.. autoclass:: Orchestrator
+    :members:
+.. autoclass:: OrchestrationReport
+    :members:
+.. autoclass:: SetRun
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging, threading, time
+from collections import namedtuple
+
+# ATS imports
+from .simulation import SimulationSet
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Simulation set graph
+#===============================================================================
+
+class SimulationGraph:
+
+    """
+    Simulation sets and their dependencies.
+
+    Parameters:
+        depends_on (dict): The names of the sets each set depends on,
+            by set name.
+
+    Raises:
+        ValueError: if a dependency is unknown, or the dependencies form a
+            cycle.
+    """
+
+    def __init__(self, depends_on):
+
+        self._deps = {name: frozenset(deps) for name, deps in depends_on.items()}
+        for name, deps in self._deps.items():
+            unknown = deps - set(self._deps)
+            if unknown:
+                raise ValueError("{} depends on unknown sets {}".format(
+                    name, sorted(unknown)))
+
+        self._order = self._topological_order()
+
+    @classmethod
+    def read(cls, pscad):
+        """
+        Read the simulation sets of the workspace, and their dependencies.
+
+        The dependencies of all sets are fetched with pipelined commands.
+        """
+
+        names = pscad.workspace().list_simulation_sets()
+        cmds = [SimulationSet(pscad, name).command('get-dependson')
+                for name in names]
+
+        depends_on = {}
+        for name, resp in zip(names, pscad.execute_many(cmds)):
+            deps = ()
+            tag = resp.find('dependson') \
+                  if resp.get('success') == 'true' else None
+            if tag is not None:
+                dep = tag.get('value')
+                if dep  and  dep != 'None':
+                    deps = (dep,)
+            depends_on[name] = deps
+
+        return cls(depends_on)
+
+    def _topological_order(self):
+
+        order = []
+        state = {}
+
+        def visit(name, path):
+            mark = state.get(name)
+            if mark == 'done':
+                return
+            if mark == 'visiting':
+                cycle = path[path.index(name):] + [name]
+                raise ValueError("Dependency cycle: " + " -> ".join(cycle))
+            state[name] = 'visiting'
+            for dep in sorted(self._deps[name]):
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in sorted(self._deps):
+            visit(name, [])
+
+        return order
+
+    def __iter__(self):
+        """The sets, in an order where every set follows its dependencies"""
+
+        return iter(self._order)
+
+    def __len__(self):
+        return len(self._order)
+
+    def depends_on(self, name):
+        """The sets the given set depends on"""
+
+        return self._deps[name]
+
+    def dependents(self, name):
+        """The sets which depend on the given set"""
+
+        return {other for other, deps in self._deps.items() if name in deps}
+
+
+#===============================================================================
+# Run records
+#===============================================================================
+
+_SetRun = namedtuple('SetRun', 'name instance start end status error')
+
+class SetRun(_SetRun):
+
+    """SetRun(name, instance, start, end, status, error)
+
+    ======== ==============================================================
+    name     Name of the simulation set
+    instance Index of the instance which ran the set, or `None`
+    start    Start time, in seconds from the start of the orchestration
+    end      End time, in seconds from the start of the orchestration
+    status   `'done'`, `'failed'` or `'skipped'`
+    error    Description of the failure, or `None`
+    ======== ==============================================================
+    """
+
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        """Time taken to run the set, in seconds"""
+
+        return self.end - self.start
+
+
+class OrchestrationReport:
+
+    """The runs of the simulation sets of a :class:`SimulationGraph`"""
+
+    def __init__(self, graph, runs, makespan):
+        self._graph = graph
+        self._runs = runs
+        self.makespan = makespan
+
+    def __iter__(self):
+        return (self._runs[name] for name in self._graph if name in self._runs)
+
+    def __getitem__(self, name):
+        return self._runs[name]
+
+    def failed(self):
+        """The runs which did not complete"""
+
+        return [run for run in self if run.status != 'done']
+
+    def total_work(self):
+        """The sum of the durations of all runs, in seconds"""
+
+        return sum(run.duration for run in self)
+
+    def critical_path(self):
+        """
+        The chain of dependent sets with the longest total run time.
+
+        No schedule can finish in less time than this, however many
+        instances are used.
+
+        Returns:
+            tuple: The names of the sets on the path, and their total
+            duration in seconds.
+        """
+
+        longest = {}
+        via = {}
+        for name in self._graph:
+            run = self._runs.get(name)
+            duration = run.duration if run is not None else 0.0
+            best = None
+            for dep in self._graph.depends_on(name):
+                if best is None  or  longest[dep] > longest[best]:
+                    best = dep
+            via[name] = best
+            longest[name] = duration + (longest[best] if best else 0.0)
+
+        if not longest:
+            return [], 0.0
+
+        name = max(longest, key=longest.get)
+        total = longest[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = via[name]
+
+        return path[::-1], total
+
+
+#===============================================================================
+# Orchestrator
+#===============================================================================
+
+class Orchestrator:
+
+    """
+    Runs the sets of a :class:`SimulationGraph` concurrently, respecting
+    their dependencies.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def run(self, pool):
+        """
+        Run all simulation sets over the instances of the pool.
+
+        An instance which dies while running a set is relaunched, and the
+        set is run again, up to the pool's `retries` times.
+
+        Returns:
+            OrchestrationReport: The timing and outcome of each set.
+        """
+
+        graph = self._graph
+        waiting = {name: set(graph.depends_on(name)) for name in graph}
+        ready = [name for name in graph if not waiting[name]]
+        attempts = {}
+        runs = {}
+        cond = threading.Condition()
+        t0 = time.perf_counter()
+
+        def finish(name, run):
+            # Called with cond held
+            runs[name] = run
+            for other in graph.dependents(name):
+                if other in runs:
+                    continue
+                if run.status != 'done':
+                    now = time.perf_counter() - t0
+                    finish(other, SetRun(other, None, now, now, 'skipped',
+                                         "{} did not complete".format(name)))
+                else:
+                    waiting[other].discard(name)
+                    if not waiting[other]:
+                        ready.append(other)
+            cond.notify_all()
+
+        def work(slot):
+            while True:
+                with cond:
+                    while not ready  and  len(runs) < len(graph):
+                        cond.wait()
+                    if not ready:
+                        return
+                    name = ready.pop(0)
+
+                start = time.perf_counter() - t0
+                try:
+                    if not slot.alive():
+                        slot.relaunch()
+                    LOG.info("%r: running simulation set %s", slot, name)
+                    slot.pscad.simulation_set(name).run()
+                    run = SetRun(name, slot.index, start,
+                                 time.perf_counter() - t0, 'done', None)
+
+                except Exception as ex:         # pylint: disable=broad-except
+                    attempt = attempts.get(name, 0)
+                    if not slot.alive()  and  attempt < pool.retries:
+                        LOG.warning("%r: instance lost; retrying %s",
+                                    slot, name)
+                        with cond:
+                            attempts[name] = attempt + 1
+                            ready.append(name)
+                            cond.notify_all()
+                        continue
+                    LOG.error("%r: simulation set %s failed: %s",
+                              slot, name, ex)
+                    run = SetRun(name, slot.index, start,
+                                 time.perf_counter() - t0, 'failed', str(ex))
+
+                with cond:
+                    finish(name, run)
+
+        threads = [threading.Thread(target=work, args=(slot,),
+                                    name="pscad-{}".format(slot.index))
+                   for slot in pool.slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report = OrchestrationReport(graph, runs, time.perf_counter() - t0)
+        path, seconds = report.critical_path()
+        LOG.info("Ran %d simulation sets in %.2fs; critical path %.2fs: %s",
+                 len(runs), report.makespan, seconds, " -> ".join(path))
+        return report
@@ -45,6 +45,8 @@ class OverlayGraph(CanvasComponent):
 
     """Overlay Graph Command Object"""
 
+    __slots__ = ()
+
     def __init__(self, canvas, *iid):
 
         """Construct a command component for a Overlay Graph"""
@@ -0,0 +1,225 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Instance Pool
+#===============================================================================
+
+"""
+*************
+Instance Pool
+*************
+
+A pool of PSCAD instances, used to spread independent jobs (sweep points,
+builds, simulation sets) across several copies of PSCAD running at once.
+
+Each instance is owned by one worker thread for its entire life; the
+connection to an instance is never shared between threads.  If an instance
+dies while working on a job, it is relaunched and the job is handed back
+to the pool to be retried.
+
+::
+
+    def launch(slot):
+        pscad = mhrc.automation.launch_pscad()
+        pscad.load(r'C:\\Work\\study.pswx')
+        return pscad
+
+    pool = InstancePool(launch, 4)
+    pool.run(jobs, worker)
+
+.. autoclass:: InstancePool
+    :members:
+.. autoclass:: Slot
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging, queue, threading
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Instance slot
+#===============================================================================
+
+class Slot:
+
+    """
+    One position in an :class:`InstancePool`.
+
+    Attributes:
+        index (int): Position of the slot in the pool.
+        pscad: The PSCAD instance currently occupying the slot.
+        state (dict): Scratch space for the worker, describing what it
+            has done to the instance (such as the last parameters applied).
+            It is cleared whenever the instance is relaunched.
+    """
+
+    def __init__(self, pool, index):
+        self._pool = pool
+        self.index = index
+        self.pscad = None
+        self.state = {}
+
+    def alive(self):
+        """Is the instance still connected?"""
+
+        return self.pscad is not None  and  self.pscad.connected()
+
+    def relaunch(self):
+        """Discard the current instance, and launch a replacement"""
+
+        if self.pscad is not None:
+            LOG.warning("Instance %d: relaunching", self.index)
+            try:
+                self.pscad._kill()              # pylint: disable=protected-access
+            except Exception as ex:             # pylint: disable=broad-except
+                LOG.warning("Instance %d: kill failed: %s", self.index, ex)
+        self.pscad = None
+        self.state = {}
+        self.pscad = self._pool._launch(self)   # pylint: disable=protected-access
+
+    def __repr__(self):
+        return "Slot[{}]".format(self.index)
+
+
+#===============================================================================
+# Instance Pool
+#===============================================================================
+
+class InstancePool:
+
+    """
+    A pool of PSCAD instances.
+
+    Parameters:
+        factory: A callable, `factory(slot)`, returning a new, ready-to-use
+            PSCAD instance for the given :class:`Slot`.
+        size (int): Number of instances.
+        instances (list): Already launched instances, used before any are
+            launched by `factory`. (optional)
+        retries (int): Number of times a job is retried after the instance
+            running it dies.
+    """
+
+    def __init__(self, factory, size, instances=(), retries=2):
+
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._factory = factory
+        self._slots = [Slot(self, index) for index in range(size)]
+        for slot, pscad in zip(self._slots, instances):
+            slot.pscad = pscad
+        self.retries = retries
+
+    @property
+    def slots(self):
+        """The slots of the pool"""
+
+        return list(self._slots)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _launch(self, slot):
+        pscad = self._factory(slot)
+        if pscad is None:
+            raise RuntimeError("Instance {}: launch failed".format(slot.index))
+        return pscad
+
+
+    #===========================================================================
+    # Run jobs
+    #===========================================================================
+
+    def run(self, jobs, worker, on_failure=None):
+        """
+        Run `worker(slot, job)` for every job, spread over the pool.
+
+        A job whose instance dies is retried on a fresh instance, up to
+        `retries` times.  A job which raises an exception while its instance
+        is still alive is not retried.
+
+        Parameters:
+            jobs: The jobs to run.
+            worker: Callable performing one job on a slot's instance.
+            on_failure: Callable `(job, exception)` invoked for jobs which
+                could not be completed. (optional)
+
+        Returns:
+            A list of `(job, exception)` for every job which failed.
+        """
+
+        pending = queue.Queue()
+        for job in jobs:
+            pending.put((job, 0))
+
+        failures = []
+        lock = threading.Lock()
+
+        def fail(job, ex):
+            with lock:
+                failures.append((job, ex))
+            if on_failure is not None:
+                on_failure(job, ex)
+
+        def work(slot):
+            while True:
+                try:
+                    job, attempt = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    if not slot.alive():
+                        slot.relaunch()
+                    worker(slot, job)
+
+                except Exception as ex:         # pylint: disable=broad-except
+                    if slot.alive():
+                        LOG.error("%r: job %r failed: %s", slot, job, ex)
+                        fail(job, ex)
+                    elif attempt < self.retries:
+                        LOG.warning("%r: instance lost; retrying %r", slot, job)
+                        pending.put((job, attempt + 1))
+                    else:
+                        LOG.error("%r: instance lost; giving up on %r",
+                                  slot, job)
+                        fail(job, ex)
+
+        threads = [threading.Thread(target=work, args=(slot,),
+                                    name="pscad-{}".format(slot.index))
+                   for slot in self._slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return failures
+
+
+    #===========================================================================
+    # Shutdown
+    #===========================================================================
+
+    def quit(self):
+        """Quit all instances in the pool"""
+
+        for slot in self._slots:
+            if slot.pscad is not None:
+                try:
+                    slot.pscad.quit()
+                except Exception as ex:         # pylint: disable=broad-except
+                    LOG.warning("%r: quit failed: %s", slot, ex)
+                slot.pscad = None
@@ -36,6 +36,7 @@ Build & Run
 
 .. automethod:: ProjectCommands.build
 .. automethod:: ProjectCommands.run
+.. automethod:: ProjectCommands.run_async
 .. .. automethod:: ProjectCommands.get_run_status
 .. automethod:: ProjectCommands.pause
 .. automethod:: ProjectCommands.stop
@@ -85,6 +86,12 @@ Finding Canvases
 .. automethod:: ProjectCommands.user_canvas
 
 
+Hierarchy
+---------
+
+.. automethod:: ProjectCommands.crawl
+
+
 Finding Components
 ------------------
 
@@ -116,8 +123,10 @@ from collections import namedtuple
 
 # ATS imports
 from .command import CommandScope
+from .crawler import Crawler
 from .usercanvas import UserCanvas
 from .definition import Definition
+from .run import RunHandle
 
 
 #===============================================================================
@@ -143,6 +152,8 @@ class ProjectCommands(CommandScope):
     >>> master_library = pscad.project('master')  # Get master library project
     """
 
+    __slots__ = ('name',)
+
     def __init__(self, pscad, project_name):
 
         super().__init__(pscad, "Project", project=project_name)
@@ -237,6 +248,21 @@ class ProjectCommands(CommandScope):
         cmd = self.command('run')
         return self._pscad.execute_build_run_cmd(cmd, consumer)
 
+    def run_async(self, build_dir=None):
+        """
+        Build and run this project, without waiting for the run to finish.
+
+        Parameters:
+            build_dir (str): The project's build directory.  If given, the
+                handle follows the output files there, to report the run's
+                progress. (optional)
+
+        Returns:
+            RunHandle: A handle to follow, wait for, or stop the run.
+        """
+
+        return RunHandle(self, build_dir)._start()
+
     #---------------------------------------------------------------------------
 
     def get_run_status(self, func, *args, **kwargs):
@@ -519,6 +545,7 @@ class ProjectCommands(CommandScope):
             cmd = self.command('set-scenario')
             cmd.tag('scenario').set('name', name)
             cmd.execute()
+            self._pscad.invalidate_parameters(self.name)
         else:
             resp = self.command('current-scenario').execute()
             name = resp.find('scenario').get('name')
@@ -537,6 +564,7 @@ class ProjectCommands(CommandScope):
             cmd = self.command('delete-scenario')
             cmd.tag('scenario').set('name', name)
             cmd.execute()
+            self._pscad.invalidate_parameters(self.name)
         else:
             print("Can not delete default base scenario")
 
@@ -621,8 +649,10 @@ class ProjectCommands(CommandScope):
         # Combined **kwargs in parameters dictionary
         parameters = dict(parameters, **kwargs) if parameters else kwargs
 
-        # get a current list from the project
-        settings_list = self.parameters()
+        # get a current list from the project, unless one is remembered
+        settings_list = self._known_parameters('Settings')
+        if settings_list is None:
+            settings_list = self.parameters()
 
         # check if user is trying to set an invalid setting
         valid = True
@@ -713,6 +743,7 @@ class ProjectCommands(CommandScope):
         cmd = self.command('import-parameters')
         cmd.tag('csv_file').set('name', name)
         resp = cmd.execute()
+        self._pscad.invalidate_parameters(self.name)
         return resp
 
 
@@ -743,6 +774,34 @@ class ProjectCommands(CommandScope):
         return UserCanvas(self, name)
 
 
+    #===========================================================================
+    # Hierarchy
+    #===========================================================================
+
+    def crawl(self, root='Main', parameters=True, window=64):
+        """
+        Build an in-memory model of the project's module hierarchy: every
+        page, every component on it, and every component's parameters::
+
+            model = project.crawl()
+            for path, page in model.walk():
+                print(path, page)
+
+        Each module definition's canvas is listed once, and the commands
+        are pipelined, one level of the hierarchy at a time.
+
+        Parameters:
+            root (str): Definition name of the top-level page.
+            parameters (bool): Also read every component's parameters.
+            window (int): Number of commands in flight at once.
+
+        Returns:
+            ProjectModel: The model. See :mod:`.crawler`.
+        """
+
+        return Crawler(self, parameters, window).crawl(root)
+
+
     #===========================================================================
     # Project canvas command entities
     #===========================================================================
@@ -86,6 +86,38 @@ These methods are used to get asynchronous events from the PSCAD application.
 .. automethod:: PSCAD.subscribed
 
 
+Parameter Writes
+----------------
+
+Scripts which repeatedly apply mostly identical parameter sets can have
+only the changed parameters sent to PSCAD.
+
+.. automethod:: PSCAD.enable_delta_writes
+.. automethod:: PSCAD.delta_writes
+.. automethod:: PSCAD.invalidate_parameters
+
+
+Batches
+-------
+
+State-changing commands may be queued and sent together, with parameter
+writes to the same scope merged; see :mod:`.batch`.
+
+.. automethod:: PSCAD.batch
+
+
+Metrics
+-------
+
+The number, size and reply latency of the commands sent to PSCAD are
+recorded by command name; see :mod:`.metrics`.
+
+.. automethod:: PSCAD.metrics
+.. automethod:: PSCAD.reset_metrics
+.. automethod:: PSCAD.enable_metrics
+.. automethod:: PSCAD.profile
+
+
 Termination
 -----------
 
@@ -98,8 +130,7 @@ Termination
 #===============================================================================
 
 # Standard Python imports
-import logging, socket, subprocess
-import ctypes, win32con, win32gui, win32process
+import logging, socket
 
 import xml.etree.ElementTree as ET
 
@@ -108,6 +139,7 @@ from .command import CmdProcessor, Command
 from .certificate import Certificate
 from .handler import BuildEvent
 from .keystroke import KeyStrokes
+from .launcher import WindowsLauncher
 from .mouse import MouseEvents
 from .project import ProjectCommands
 from .resource import RES_ID
@@ -153,13 +185,18 @@ class PSCAD(CmdProcessor):
     :meth:`launch_pscad() <mhrc.automation.launch_pscad>` command::
 
         pscad = mhrc.automation.launch_pscad()
+
+    A :class:`launcher <.Launcher>` may be given to start (or attach to) some
+    other process speaking the same protocol, such as a protocol simulator.
+    By default, PSCAD is launched on Windows.
     """
 
-    def __init__(self, rxtx_logger, options):
+    def __init__(self, rxtx_logger, options, launcher=None):
 
         super().__init__()
 
         self._proc = None   # PSCAD process handle
+        self._launcher = launcher if launcher is not None else WindowsLauncher()
         self._subscription = {}
         self._cache = {}
 
@@ -184,9 +221,13 @@ class PSCAD(CmdProcessor):
     #===========================================================================
 
     def _launch_pscad(self, options, rxtx_logger):
-        serversock, port = self._open_listener()
-        self._launch(port, options)
-        self._wait_for_connection(serversock, rxtx_logger)
+        if self._launcher.connects_back:
+            serversock, port = self._open_listener()
+            self._launch(port, options)
+            self._wait_for_connection(serversock, rxtx_logger)
+        else:
+            self._sock = XmlSocket(self._launcher.attach())
+            self._sock.logger(rxtx_logger)
 
 
     #---------------------------------------------------------------------------
@@ -210,32 +251,9 @@ class PSCAD(CmdProcessor):
         to connect back to the automated test suite on the given port.
         """
 
-        path = options['path']
-
-        args = [path, '/startup:au', '/host:localhost', '/port:'+str(port),
-                '/nologo']
-        if '/silence' in options:
-            args.append('/silence:{}'.format(options['/silence']))
-
-        LOG.debug("Execute: %r", args)
-
-        # Suppress the "<Application> has stopped responding" Dialog.
-        # Child processes (PSCAD) and grand-child processes (EMTDC) will
-        # inherit this Error Mode, exiting immediately if they crash.
-        ctypes.windll.kernel32.SetErrorMode(win32con.SEM_NOGPFAULTERRORBOX)
-
-        # Start the PSCAD child process.
-        sui = subprocess.STARTUPINFO()
-        if 'launch-minimized' in options:
-            if options['launch-minimized']:
-                sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                sui.wShowWindow = win32con.SW_SHOWMINNOACTIVE
-            else:
-                sui.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                sui.wShowWindow = win32con.SW_SHOWNOACTIVATE
-
-        self._proc = subprocess.Popen(args, close_fds=True, startupinfo=sui)
-        LOG.info("Process ID = %d", self._proc.pid)
+        self._proc = self._launcher.launch(port, options)
+        if self._proc is not None:
+            LOG.info("Process ID = %d", self._proc.pid)
 
 
     #---------------------------------------------------------------------------
@@ -272,13 +290,20 @@ class PSCAD(CmdProcessor):
     #---------------------------------------------------------------------------
 
     def is_alive(self):
-        return self._proc  and  self._sock.is_open()
+        if self._proc is None  and  self._launcher.connects_back:
+            return False
+        return self._sock is not None  and  self._sock.is_open()
 
 
     #---------------------------------------------------------------------------
 
     def hwnd(self):
 
+        import win32gui, win32process         # pylint: disable=import-outside-toplevel
+
+        if self._proc is None:
+            return None
+
         process_id = self._proc.pid
 
         def callback(hwnd, hwnds):
@@ -591,6 +616,8 @@ class PSCAD(CmdProcessor):
 
         LOG.info("Loading %s", filenames)
 
+        self.invalidate_parameters()
+
         auto_subscribe = not self.subscribed('load-events')
         if auto_subscribe:
             self.subscribe('load-events')
@@ -624,6 +651,7 @@ class PSCAD(CmdProcessor):
         """
 
         LOG.info("New Workspace")
+        self.invalidate_parameters()
         cmd = self._command_id_cmd('ID_RIBBON_MAIN_NEW_WORKSPACE')
         return cmd.execute()
 
@@ -0,0 +1,280 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Rx/Tx Protocol Recorder
+#===============================================================================
+
+"""
+*****************
+Protocol Recorder
+*****************
+
+A recorder captures the raw bytes exchanged with PSCAD, with high
+resolution timestamps, into a series of size-limited binary log files.
+Recording costs the connection only a timestamp and a queue append per
+socket read or write; the files are written by a background thread.
+
+::
+
+    recorder = RxTxRecorder(r'C:\\Work\\logs\\pscad')
+    pscad = mhrc.automation.launch_pscad(rxtx_logger=recorder)
+    ...
+    recorder.close()
+
+    for direction, timestamp, data in read_records(recorder.files()[0]):
+        ...
+
+File Format
+-----------
+
+Each file starts with a 24-byte header: the magic bytes `PSCADRXT`, the
+format version (uint32), reserved (uint32) and the wall-clock time of the
+start of the recording in nanoseconds (uint64).  Records follow, each a
+13-byte header (direction byte, nanoseconds since the start of the
+recording as uint64, payload length as uint32; all little-endian) followed
+by the payload.
+
+============ ==================================================
+Direction    Payload
+============ ==================================================
+`R`          Bytes received from PSCAD
+`T`          Bytes sent to PSCAD
+`r`, `t`     A connection state note (such as `socket-close`)
+============ ==================================================
+
+.. autoclass:: RxTxRecorder
+    :members:
+.. autofunction:: read_records
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import glob, logging, os, struct, threading, time
+import xml.etree.ElementTree as ET
+from collections import deque
+
+# ATS imports
+from .rxtxlog import RxTxLog
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# File format
+#===============================================================================
+
+MAGIC = b'PSCADRXT'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sIIQ')
+_RECORD = struct.Struct('<cQI')
+
+RX = b'R'
+TX = b'T'
+RX_NOTE = b'r'
+TX_NOTE = b't'
+
+
+def read_records(path):
+    """
+    Read the records of one recorder log file.
+
+    Yields:
+        tuple: `(direction, timestamp, data)`, where `timestamp` is the
+        wall-clock time in seconds, and `direction` is one of `b'R'`,
+        `b'T'`, `b'r'`, `b't'`.
+    """
+
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        magic, version, _, start_ns = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a recorder log: " + path)
+
+        while True:
+            head = file.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return                  # End of file, or a truncated record
+            direction, offset_ns, length = _RECORD.unpack(head)
+            data = file.read(length)
+            if len(data) < length:
+                return
+            yield direction, (start_ns + offset_ns) / 1e9, data
+
+
+#===============================================================================
+# Recorder
+#===============================================================================
+
+class RxTxRecorder(RxTxLog):
+
+    """
+    Record the raw Rx/Tx byte stream into rotating binary log files.
+
+    Parameters:
+        prefix (str): Path prefix of the log files; files are named
+            `<prefix>.<n>.rxtx`.
+        max_bytes (int): Size at which a new file is started.
+        backups (int): Number of files kept; the oldest are deleted.
+            `None` keeps all files.
+        flush_interval (float): Longest time recorded data waits in memory
+            before being written.
+    """
+
+    raw = True
+
+    def __init__(self, prefix, max_bytes=64 << 20, backups=8,
+                 flush_interval=0.25):
+
+        super().__init__()
+
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._prefix = prefix
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._flush_interval = flush_interval
+
+        self._start_ns = time.time_ns()
+        self._clock0 = time.perf_counter_ns()
+
+        # deque.append is atomic, so the connection thread needs no lock
+        self._pending = deque()
+        self._wakeup = threading.Event()
+        self._closing = False
+
+        existing = self.files()
+        self._index = self._file_index(existing[-1]) + 1 if existing else 0
+        self._file = None
+        self._size = 0
+        self.records = 0
+        self.bytes = 0
+
+        self._thread = threading.Thread(target=self._writer, daemon=True,
+                                        name="rxtx-recorder")
+        self._thread.start()
+
+
+    #===========================================================================
+    # RxTxLog hooks (connection thread)
+    #===========================================================================
+
+    def rx_raw(self, data):
+        self._pending.append((RX, time.perf_counter_ns(), data))
+
+    def tx_raw(self, data):
+        self._pending.append((TX, time.perf_counter_ns(), data))
+
+    def rx_log(self, xml_node):
+        self._pending.append((RX_NOTE, time.perf_counter_ns(),
+                              ET.tostring(xml_node)))
+
+    def tx_log(self, xml_node):
+        self._pending.append((TX_NOTE, time.perf_counter_ns(),
+                              ET.tostring(xml_node)))
+
+
+    #===========================================================================
+    # Files
+    #===========================================================================
+
+    def files(self):
+        """The log files of this recorder's prefix, oldest first"""
+
+        return sorted(glob.glob(glob.escape(self._prefix) + '.*.rxtx'),
+                      key=self._file_index)
+
+    @staticmethod
+    def _file_index(path):
+        return int(path.rsplit('.', 2)[-2])
+
+    def _open_next(self):
+
+        if self._file is not None:
+            self._file.close()
+
+        path = "{}.{:06d}.rxtx".format(self._prefix, self._index)
+        self._index += 1
+        self._file = open(path, 'ab')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 0, self._start_ns))
+        self._size = _HEADER.size
+
+        if self._backups is not None:
+            for old in self.files()[:-self._backups]:
+                try:
+                    os.remove(old)
+                except OSError as ex:
+                    LOG.warning("Unable to remove %s: %s", old, ex)
+
+
+    #===========================================================================
+    # Writer (background thread)
+    #===========================================================================
+
+    def _writer(self):
+
+        pending = self._pending
+        pack = _RECORD.pack
+        clock0 = self._clock0
+
+        self._open_next()
+        while True:
+            closing = self._closing
+            chunks = []
+            size = 0
+            while pending:
+                direction, clock, data = pending.popleft()
+                chunks.append(pack(direction, clock - clock0, len(data)))
+                chunks.append(data)
+                size += _RECORD.size + len(data)
+                self.records += 1
+                self.bytes += len(data)
+
+                if self._size + size >= self._max_bytes:
+                    self._file.write(b''.join(chunks))
+                    chunks = []
+                    size = 0
+                    self._open_next()
+
+            if chunks:
+                self._file.write(b''.join(chunks))
+                self._size += size
+                self._file.flush()
+
+            if closing:
+                break
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+
+        self._file.close()
+        self._file = None
+
+
+    #===========================================================================
+    # Close
+    #===========================================================================
+
+    def flush(self):
+        """Ask the writer thread to write out recorded data now"""
+
+        self._wakeup.set()
+
+    def close(self):
+        """Write out all recorded data, and stop the writer thread"""
+
+        if not self._closing:
+            self._closing = True
+            self._wakeup.set()
+            self._thread.join()
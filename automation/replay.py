@@ -0,0 +1,308 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Protocol Replay Server
+#===============================================================================
+
+"""
+*************
+Replay Server
+*************
+
+A replay server stands in for PSCAD, answering the client's commands with
+the replies found in sessions captured by an :class:`.RxTxRecorder`.  It
+needs neither Windows nor a PSCAD licence, and answers the same commands
+the same way every time, which makes it useful for benchmarking and
+testing the client.
+
+Like PSCAD, the server connects to the port the client is listening on::
+
+    python -m automation.replay --port 54321 session.000000.rxtx
+
+Commands are matched with recorded commands by their name and scope, not
+by their sequence-id.  When a command was recorded several times, the
+recorded replies are used in turn.  The sequence-ids of the replayed
+replies are rewritten to those of the live commands.
+
+Recorded replies, and events such as build events, are replayed with the
+command whose sequence-id they carry, so pipelined commands each get their
+own replies.  Messages without a known sequence-id are replayed with the
+command most recently sent before them.
+
+.. autoclass:: ReplayServer
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import argparse, logging, re, socket, sys, time
+from collections import deque
+
+# ATS imports
+from .recorder import read_records, RX, TX
+from .xml_sock import XmlSocket
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Message splitting
+#===============================================================================
+
+class _Splitter:
+
+    """Splits a stream of text into XML messages, the same way the client's
+    XmlSocket does"""
+
+    _extract_xml = XmlSocket._extract_xml   # pylint: disable=protected-access
+
+    def __init__(self):
+        self._rxbuf = ''
+        self._end_tag = None
+
+    def feed(self, text):
+        self._rxbuf += text
+        messages = []
+        while True:
+            # The client's stream is wrapped in <content> ... </content>
+            stripped = self._rxbuf.lstrip()
+            for wrapper in ('<content>', '</content>'):
+                if stripped.startswith(wrapper):
+                    stripped = stripped[len(wrapper):]
+            self._rxbuf = stripped
+
+            msg = self._extract_xml()
+            if msg is None:
+                return messages
+            messages.append(msg)
+
+
+_SEQ_ID = re.compile(r'''(sequence-id\s*=\s*)(["'])([^"']*)\2''')
+
+def _with_seq_id(text, seq_id):
+    """Replace the sequence-id of the message's opening tag"""
+
+    end = text.find('>')
+    head = _SEQ_ID.sub(lambda m: m.group(1) + m.group(2) + seq_id +
+                       m.group(2), text[:end], count=1)
+    return head + text[end:]
+
+
+def _command_key(msg):
+    scope = msg.find('scope')
+    scope_key = None
+    if scope is not None:
+        scope_key = tuple((node.tag, tuple(sorted(node.attrib.items())))
+                          for node in scope.iter())
+    return msg.get('name'), msg.get('scope'), scope_key
+
+
+#===============================================================================
+# Recorded exchange
+#===============================================================================
+
+class _Exchange:
+
+    """One recorded command, and what PSCAD sent until the next command"""
+
+    __slots__ = ('seq_id', 'sent', 'messages')
+
+    def __init__(self, seq_id, sent):
+        self.seq_id = seq_id
+        self.sent = sent
+        self.messages = []          # (delay after command, text)
+
+
+#===============================================================================
+# Replay Server
+#===============================================================================
+
+class ReplayServer:
+
+    """
+    Answer a client's commands from recorded sessions.
+
+    Parameters:
+        *paths (str): Recorder log files, in order.
+        latency (float): Extra delay before each reply, in seconds.
+        recorded_timing (bool): Reproduce the recorded delays between each
+            command and the messages which followed it.
+        time_scale (float): Multiplier applied to recorded delays.
+    """
+
+    def __init__(self, *paths, latency=0.0, recorded_timing=False,
+                 time_scale=1.0):
+
+        self.latency = latency
+        self.recorded_timing = recorded_timing
+        self.time_scale = time_scale
+
+        self._greeting = []
+        self._by_key = {}
+        self._by_name = {}
+        self._load(paths)
+
+        self._sock = None
+        self._seq_map = {}
+        self.commands = 0
+        self.unmatched = 0
+
+    def _load(self, paths):
+
+        tx_split = _Splitter()
+        rx_split = _Splitter()
+        current = None
+        by_seq_id = {}              # Latest exchange, by recorded sequence-id
+
+        for path in paths:
+            for direction, timestamp, data in read_records(path):
+                text = data.decode('utf-8', errors='replace')
+                if direction == TX:
+                    for msg in tx_split.feed(text):
+                        current = _Exchange(msg.get('sequence-id'), timestamp)
+                        if current.seq_id is not None:
+                            by_seq_id[current.seq_id] = current
+                        self._by_key.setdefault(_command_key(msg),
+                                                []).append(current)
+                        self._by_name.setdefault(msg.get('name'),
+                                                 []).append(current)
+                elif direction == RX:
+                    for msg in rx_split.feed(text):
+                        exchange = by_seq_id.get(msg.get('sequence-id'),
+                                                 current)
+                        if exchange is None:
+                            self._greeting.append(str(msg))
+                        else:
+                            exchange.messages.append(
+                                (timestamp - exchange.sent, str(msg)))
+
+        self._queues = {key: deque(exchanges)
+                        for key, exchanges in self._by_key.items()}
+        LOG.info("Replay: %d distinct commands loaded", len(self._by_key))
+
+    def _match(self, msg):
+
+        key = _command_key(msg)
+        queue = self._queues.get(key)
+        if queue:
+            exchange = queue.popleft()
+            if not queue:
+                # Keep answering with the last recording of this command
+                queue.append(exchange)
+            return exchange
+
+        exchanges = self._by_name.get(msg.get('name'))
+        if exchanges:
+            return exchanges[-1]
+        return None
+
+
+    #===========================================================================
+    # Connection
+    #===========================================================================
+
+    def connect(self, port, host='localhost', timeout=30.0):
+        """Connect to the client, as PSCAD would"""
+
+        self._sock = socket.create_connection((host, port), timeout)
+        self._sock.settimeout(None)
+        LOG.info("Replay: connected to %s:%d", host, port)
+
+        for text in self._greeting:
+            self._sock.sendall(text.encode('utf-8'))
+
+    def serve(self):
+        """Answer commands until the client disconnects"""
+
+        splitter = _Splitter()
+        try:
+            while True:
+                data = self._sock.recv(65536)
+                if not data:
+                    break
+                for msg in splitter.feed(data.decode('utf-8')):
+                    self._answer(msg)
+        except ConnectionResetError:
+            pass
+        finally:
+            self._sock.close()
+            self._sock = None
+
+        LOG.info("Replay: %d commands, %d unmatched", self.commands,
+                 self.unmatched)
+
+    def _answer(self, msg):
+
+        self.commands += 1
+        seq_id = msg.get('sequence-id')
+        exchange = self._match(msg)
+
+        if exchange is None:
+            self.unmatched += 1
+            LOG.warning("Replay: no recording of %s", msg.get('name'))
+            text = ('<commandresponse sequence-id="{}" success="false" />'
+                    .format(seq_id))
+            self._sock.sendall(text.encode('utf-8'))
+            return
+
+        if exchange.seq_id is not None  and  seq_id is not None:
+            self._seq_map[exchange.seq_id] = seq_id
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        start = time.perf_counter()
+        for delay, text in exchange.messages:
+            if self.recorded_timing:
+                wait = delay * self.time_scale - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+
+            match = _SEQ_ID.search(text[:text.find('>')])
+            if match:
+                live = self._seq_map.get(match.group(3))
+                if live is not None:
+                    text = _with_seq_id(text, live)
+
+            self._sock.sendall(text.encode('utf-8'))
+
+
+#===============================================================================
+# Command line
+#===============================================================================
+
+def main(argv=None):
+    """Run a replay server from the command line"""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m automation.replay",
+        description="Answer PSCAD automation commands from recorded sessions")
+    parser.add_argument('logs', nargs='+', help="recorder log files, in order")
+    parser.add_argument('--port', type=int, required=True,
+                        help="port the client is listening on")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="extra delay before each reply, in seconds")
+    parser.add_argument('--recorded-timing', action='store_true',
+                        help="reproduce the recorded reply delays")
+    parser.add_argument('--time-scale', type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    server = ReplayServer(*args.logs, latency=args.latency,
+                          recorded_timing=args.recorded_timing,
+                          time_scale=args.time_scale)
+    server.connect(args.port, args.host)
+    server.serve()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main(sys.argv[1:])
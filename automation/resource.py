@@ -30,8 +30,18 @@ RES_ID = {}
 def _set_id(key, value):
     RES_ID[key] = int(value, 0)
 
+def _resource_h():
+    # The header is shipped as "Resource.h"; names only match regardless of
+    # case on Windows.
+    directory = os.path.dirname(__file__)
+    for name in ("Resource.h", "resource.h"):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(os.path.join(directory, "Resource.h"))
+
 def _load_ids():
-    resource_h = os.path.join(os.path.dirname(__file__), "resource.h")
+    resource_h = _resource_h()
     with open(resource_h) as file:
         for line in file:
             if line.startswith("#define "):
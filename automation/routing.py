@@ -0,0 +1,409 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Wire Routing
+#===============================================================================
+
+"""
+************
+Wire Routing
+************
+
+A router finds short orthogonal paths for wires, entirely on the client,
+around the bounding boxes of the components on a canvas and without
+running along wires it has already routed::
+
+    boxes = {cmp: (x1, y1, x2, y2), ...}
+    router = Router(boxes)
+
+    vertices = router.route(r1.get_port_location('N1'),
+                            r2.get_port_location('N2'))
+    canvas.add_wire(*vertices)
+
+    canvas.add_wire(port_a, port_b, router=router)
+
+Routing is an A* search over the points of a grid, with a cost for every
+bend, so paths have few vertices.  A path may cross a previously routed
+wire at right angles, but never runs along one, turns on one, or passes
+through its ends, since PSCAD would connect the two wires there.  Only the
+obstacles near the two ends are examined, using a :class:`.GridIndex`; the
+search area is widened only when no path is found.
+
+A wire may start or end on the end or bend of a wire routed earlier, since
+that joins the same node.  When an end of a new wire is such a point, the
+new wire may instead start (or end) at any end or bend of the wires already
+joined to it, whichever gives the better path.
+
+The ends of a wire are snapped to the routing grid, which should match the
+grid the ports are on.
+
+.. autoclass:: Router
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import heapq, itertools, logging, math
+
+# ATS imports
+from .spatial import GridIndex
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Routing grid
+#===============================================================================
+
+_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))   # Opposites are d ^ 1
+
+_HORIZONTAL = 1
+_VERTICAL = 2
+_JOINT = 4                  # A wire's end or bend: nothing else may touch it
+
+
+#===============================================================================
+# Router
+#===============================================================================
+
+class Router:
+
+    """
+    Orthogonal wire router.
+
+    Parameters:
+        obstacles: A :class:`.GridIndex`, or a mapping of keys to
+            `(x1, y1, x2, y2)` bounding boxes, of what wires must avoid.
+        pitch (int): Spacing of the routing grid.
+        bend_cost (float): Cost of a bend, in grid steps.
+        cross_cost (float): Cost of crossing another wire, in grid steps.
+        margin (int): Initial number of grid steps the search may stray
+            beyond the rectangle spanned by the two ends.
+        attempts (int): Number of times the margin is doubled, before
+            giving up.
+    """
+
+    def __init__(self, obstacles=(), pitch=18, bend_cost=2.0, cross_cost=1.0,
+                 margin=8, attempts=3):
+
+        if isinstance(obstacles, GridIndex):
+            self._obstacles = obstacles
+        else:
+            self._obstacles = GridIndex(pitch * 4)
+            items = obstacles.items() if hasattr(obstacles, 'items') \
+                    else obstacles
+            for key, box in items:
+                self._obstacles.insert(key, box)
+
+        self._pitch = pitch
+        self._bend_cost = bend_cost
+        self._cross_cost = cross_cost
+        self._margin = margin
+        self._attempts = attempts
+        self._wires = {}            # Wire usage, by grid point
+        self._node_of = {}          # Node number, by wire joint
+        self._joints = {}           # Wire joints, by node number
+        self._numbers = itertools.count()
+
+    @property
+    def obstacles(self):
+        """The :class:`.GridIndex` of obstacles"""
+
+        return self._obstacles
+
+    def add_obstacle(self, key, box):
+        """Add or move an obstacle"""
+
+        self._obstacles.insert(key, box)
+
+    def remove_obstacle(self, key):
+        """Remove an obstacle"""
+
+        self._obstacles.remove(key)
+
+
+    #===========================================================================
+    # Grid
+    #===========================================================================
+
+    def _snap(self, point):
+        return (round(point[0] / self._pitch), round(point[1] / self._pitch))
+
+    def _open(self, point):
+        """Can a wire leave the grid point in some direction?"""
+
+        col, row = point
+        around = [(col + dcol, row + drow) for dcol, drow in _DIRECTIONS]
+        blocked = self._blocked((col - 1, row - 1, col + 1, row + 1))
+        wires = self._wires
+        for direction, nxt in enumerate(around):
+            used = wires.get(nxt, 0)
+            axis = _HORIZONTAL if direction < 2 else _VERTICAL
+            if nxt not in blocked  and  not used & (axis | _JOINT):
+                return True
+        return False
+
+    def _node(self, point):
+        """The joints of the wires joined at the grid point (which need not
+        be a joint)"""
+
+        number = self._node_of.get(point)
+        if number is None:
+            return {point}
+        return self._joints[number]
+
+    @staticmethod
+    def _within(points, window):
+        left, top, right, bottom = window
+        return {(col, row) for col, row in points
+                if left <= col <= right  and  top <= row <= bottom}
+
+    def _blocked(self, window):
+        """Grid points covered by obstacles, within the window"""
+
+        pitch = self._pitch
+        left, top, right, bottom = window
+        area = (left * pitch, top * pitch, right * pitch, bottom * pitch)
+
+        blocked = set()
+        for key in self._obstacles.query(area):
+            x1, y1, x2, y2 = self._obstacles.rect(key)
+            cols = range(max(math.floor(x1 / pitch), left),
+                         min(math.ceil(x2 / pitch), right) + 1)
+            for row in range(max(math.floor(y1 / pitch), top),
+                             min(math.ceil(y2 / pitch), bottom) + 1):
+                blocked.update((col, row) for col in cols)
+        return blocked
+
+
+    #===========================================================================
+    # Route
+    #===========================================================================
+
+    def route(self, start, end):
+        """
+        Find a path for a wire, and reserve it.
+
+        Parameters:
+            start: The `(x, y)` location of one end of the wire.
+            end: The `(x, y)` location of the other end.
+
+        Returns:
+            list: The wire's `(x, y)` vertices, or `None` if no path was
+            found.  If an end is on a wire routed earlier, the path may
+            begin or end at another joint of that wire's node instead.
+        """
+
+        src = self._snap(start)
+        dst = self._snap(end)
+        if src == dst:
+            return None
+
+        sources = self._node(src)
+        targets = self._node(dst)
+        if sources is targets:
+            LOG.warning("No route from %r to %r: already joined", start, end)
+            return None
+
+        sources = {point for point in sources if self._open(point)}
+        targets = {point for point in targets if self._open(point)}
+        if not (sources and targets):
+            LOG.warning("No route from %r to %r: an end is enclosed",
+                        start, end)
+            return None
+
+        margin = self._margin
+        for _ in range(self._attempts):
+            window = (min(src[0], dst[0]) - margin,
+                      min(src[1], dst[1]) - margin,
+                      max(src[0], dst[0]) + margin,
+                      max(src[1], dst[1]) + margin)
+            path = None
+            near_sources = self._within(sources, window)
+            near_targets = self._within(targets, window)
+            if near_sources  and  near_targets:
+                path = self._search(near_sources, near_targets, window,
+                                    self._blocked(window))
+            if path is not None:
+                self._reserve(path)
+                pitch = self._pitch
+                return [(col * pitch, row * pitch) for col, row in path]
+            margin *= 2
+
+        LOG.warning("No route from %r to %r", start, end)
+        return None
+
+    def route_all(self, nets):
+        """
+        Route several wires, shortest first, since they are the least able
+        to go around others.
+
+        Parameters:
+            nets: `(start, end)` pairs of locations.
+
+        Returns:
+            list: The vertices (or `None`) of each net, in the given order.
+        """
+
+        nets = list(nets)
+        order = sorted(range(len(nets)), key=lambda index: (
+            abs(nets[index][0][0] - nets[index][1][0]) +
+            abs(nets[index][0][1] - nets[index][1][1])))
+
+        paths = [None] * len(nets)
+        for index in order:
+            paths[index] = self.route(*nets[index])
+        return paths
+
+    def add_wire(self, canvas, start, end):
+        """
+        Route a wire, and add it to the canvas.
+
+        Returns:
+            The created :class:`.Wire`, or `None` if no path was found.
+        """
+
+        vertices = self.route(start, end)
+        if vertices is None:
+            return None
+        return canvas.add_wire(*vertices)
+
+
+    #===========================================================================
+    # Search
+    #===========================================================================
+
+    def _search(self, sources, targets, window, blocked):   # pylint: disable=too-many-locals
+
+        left, top, right, bottom = window
+        wires = self._wires
+        bend_cost = self._bend_cost
+        cross_cost = self._cross_cost
+
+        def estimate(point):
+            return min(abs(point[0] - col) + abs(point[1] - row)
+                       for col, row in targets)
+
+        best = {}
+        parent = {}
+        # Among equal estimates, the longest partial path is tried first
+        heap = []
+        for counter, src in enumerate(sources):
+            start = (src, -1)
+            best[start] = 0.0
+            heap.append((estimate(src), 0.0, counter, start))
+        heapq.heapify(heap)
+        counter = len(heap)
+
+        while heap:
+            _, cost, _, state = heapq.heappop(heap)
+            cost = -cost
+            if cost > best[state]:
+                continue
+
+            point, heading = state
+            if point in targets:
+                return self._path(parent, state)
+
+            col, row = point
+            turning_allowed = heading < 0  or  not wires.get(point)
+            for direction, (dcol, drow) in enumerate(_DIRECTIONS):
+                if heading >= 0:
+                    if direction == heading ^ 1:
+                        continue
+                    bend = direction != heading
+                    if bend and not turning_allowed:
+                        continue
+                else:
+                    bend = False
+
+                nxt = (col + dcol, row + drow)
+                if not (left <= nxt[0] <= right  and  top <= nxt[1] <= bottom):
+                    continue
+
+                step = 1.0
+                if nxt not in targets:
+                    if nxt in blocked:
+                        continue
+                    used = wires.get(nxt)
+                    if used:
+                        axis = _HORIZONTAL if direction < 2 else _VERTICAL
+                        if used & (axis | _JOINT):
+                            continue
+                        step += cross_cost
+                if bend:
+                    step += bend_cost
+
+                nxt_state = (nxt, direction)
+                nxt_cost = cost + step
+                if nxt_cost < best.get(nxt_state, math.inf):
+                    best[nxt_state] = nxt_cost
+                    parent[nxt_state] = state
+                    counter += 1
+                    heapq.heappush(heap, (nxt_cost + estimate(nxt), -nxt_cost,
+                                          counter, nxt_state))
+
+        return None
+
+    @staticmethod
+    def _path(parent, state):
+        """The path's vertices: its ends and its bends"""
+
+        points = [state]
+        while state in parent:
+            state = parent[state]
+            points.append(state)
+        points.reverse()
+
+        vertices = [points[0][0]]
+        for (point, heading), (_, next_heading) in zip(points[1:],
+                                                       points[2:]):
+            if heading != next_heading:
+                vertices.append(point)
+        vertices.append(points[-1][0])
+        return vertices
+
+    def _reserve(self, path):
+        """Mark the grid points the wire uses"""
+
+        wires = self._wires
+        for (col1, row1), (col2, row2) in zip(path, path[1:]):
+            if row1 == row2:
+                axis = _HORIZONTAL
+                points = ((col, row1) for col in range(min(col1, col2),
+                                                        max(col1, col2) + 1))
+            else:
+                axis = _VERTICAL
+                points = ((col1, row) for row in range(min(row1, row2),
+                                                        max(row1, row2) + 1))
+            for point in points:
+                wires[point] = wires.get(point, 0) | axis
+
+        for point in path:
+            wires[point] = wires.get(point, 0) | _JOINT
+
+        # The wire joins the nodes at its ends into one
+        joints = set(path)
+        for end in (path[0], path[-1]):
+            number = self._node_of.get(end)
+            if number is not None:
+                joints |= self._joints.pop(number)
+        number = next(self._numbers)
+        self._joints[number] = joints
+        for point in joints:
+            self._node_of[point] = number
+
+    def clear_wires(self):
+        """Forget the wires routed so far"""
+
+        self._wires.clear()
+        self._node_of.clear()
+        self._joints.clear()
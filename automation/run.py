@@ -0,0 +1,279 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Run Handles
+#===============================================================================
+
+"""
+***********
+Run Handles
+***********
+
+A run handle follows a run started with :meth:`.ProjectCommands.run_async`,
+which returns as soon as the run command has been sent.  The handle is
+driven by the thread which owns the PSCAD connection: each call reads and
+dispatches whatever PSCAD has sent meanwhile.
+
+::
+
+    runs = [pscad.project('vdiv').run_async(build_dir)
+            for pscad, build_dir in instances]
+    while not all(run.done() for run in runs):
+        for run in runs:
+            if not run.done()  and  diverging(run):
+                run.stop()
+            run.wait(0.5)
+
+Given the project's build directory, a handle also follows the run's
+output files as EMTDC writes them, and reports how far the simulation has
+got with :meth:`~RunHandle.progress`.
+
+.. autoclass:: RunHandle
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging, os, time
+
+# ATS imports
+from .handler import BuildEvent
+from .utilities.tail import TailOutFile
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Completion tracker
+#===============================================================================
+
+class _RunTracker(BuildEvent):
+
+    """Build event handler noting when the run's event nesting ends"""
+
+    def __init__(self):
+        super().__init__()
+        self.finished = False
+
+    def send(self, msg):
+        handled = super().send(msg)
+        if handled is StopIteration:
+            self.finished = True
+        return handled
+
+
+#===============================================================================
+# Run Handle
+#===============================================================================
+
+class RunHandle:
+
+    """
+    A run in progress.
+
+    Created by :meth:`.ProjectCommands.run_async`.
+
+    Parameters:
+        project (ProjectCommands): The project being run.
+        build_dir (str): The project's build directory, where its output
+            files are written. (optional)
+
+    Attributes:
+        stopped (bool): The run was stopped with :meth:`stop`.
+        failed (bool): The connection to PSCAD was lost before the run
+            ended.
+    """
+
+    def __init__(self, project, build_dir=None):
+
+        self._project = project
+        self._pscad = project._pscad        # pylint: disable=protected-access
+        self._tracker = _RunTracker()
+        self._auto_subscribe = False
+        self._build_dir = build_dir
+        self._basename = None               # Of the output files
+        self._duration = None               # time_duration, in seconds
+        self._tail = None
+        self._sim_time = None
+        self._launched = None               # Wall-clock time, for mtimes
+        self.started = None
+        self.finished = None
+        self.stopped = False
+        self.failed = False
+
+    def _start(self):
+
+        self._auto_subscribe = not self._pscad.subscribed('build-events')
+        if self._auto_subscribe:
+            self._pscad.subscribe('build-events')
+
+        if self._build_dir is not None:
+            params = self._project.parameters()
+            try:
+                self._duration = float(params.get('time_duration'))
+            except (TypeError, ValueError):
+                LOG.warning("%s: unknown time_duration; no progress",
+                            self._project)
+            name = params.get('output_filename') or self._project.name
+            self._basename = os.path.join(self._build_dir,
+                                          os.path.splitext(name)[0])
+
+        self._pscad.add_handler(self._tracker)
+        self._launched = time.time()
+        self.started = time.perf_counter()
+        self._project.command('run').execute(wait_for_response=False)
+        LOG.info("%s: run started", self._project)
+        return self
+
+    def _check(self):
+
+        if self.finished is None  and  (self._tracker.finished  or
+                                        not self._pscad.connected()):
+            self.finished = time.perf_counter()
+            self.failed = not self._tracker.finished
+            self._pscad.remove_handler(self._tracker)
+            self._stop_tailing()
+            if self._auto_subscribe  and  self._pscad.connected():
+                self._pscad.unsubscribe('build-events')
+            if self.failed:
+                LOG.error("%s: connection lost during the run", self._project)
+            else:
+                LOG.info("%s: run finished after %.2fs", self._project,
+                         self.elapsed)
+
+        return self.finished is not None
+
+
+    #===========================================================================
+    # State
+    #===========================================================================
+
+    def done(self):
+        """Has the run finished (or failed)?  Reads nothing from PSCAD."""
+
+        return self._check()
+
+    def sim_time(self):
+        """
+        The latest simulated time written to the run's output files.
+
+        Returns:
+            float: Seconds of simulated time, or `None` until output appears
+            (or if no build directory was given).
+        """
+
+        if self._basename is not None:
+            if self._tail is None:
+                try:
+                    fresh = os.path.getmtime(self._basename + '_01.out') >= \
+                            self._launched
+                except OSError:
+                    fresh = False
+                if not fresh:
+                    return self._sim_time   # None, or left by an earlier run
+                self._tail = TailOutFile(self._basename, num_files=1,
+                                         watcher='poll')
+
+            block = self._tail.read_block()
+            if block:
+                self._sim_time = block[-1][0]
+
+        return self._sim_time
+
+    def progress(self):
+        """
+        How far the run has got: the latest simulated time in its output
+        files, as a fraction of the project's `time_duration`.
+
+        Returns:
+            float: From 0 to 1, or `None` until output appears (or if no
+            build directory was given).
+        """
+
+        sim_time = self.sim_time()
+        if sim_time is None  or  not self._duration:
+            return None
+        return min(sim_time / self._duration, 1.0)
+
+    def _stop_tailing(self):
+
+        # Pick up the last rows written, then let the files go
+        self.sim_time()
+        if self._tail is not None:
+            self._tail.close()
+            self._tail = None
+        self._basename = None
+
+    @property
+    def elapsed(self):
+        """Wall-clock seconds since the run was started (until it ended)"""
+
+        end = self.finished if self.finished is not None else \
+              time.perf_counter()
+        return end - self.started
+
+
+    #===========================================================================
+    # Wait / Stop
+    #===========================================================================
+
+    def poll(self):
+        """Read and dispatch at most one message from PSCAD.
+
+        Returns:
+            bool: `True` if the run has finished.
+        """
+
+        if not self._check():
+            self._pscad.poll()
+        return self._check()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the run to finish.
+
+        Parameters:
+            timeout (float): Maximum time to wait, in seconds.  The actual
+                wait may be longer by up to the connection's read timeout.
+
+        Returns:
+            bool: `True` if the run has finished.
+        """
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self._check():
+            if deadline is not None  and  time.perf_counter() >= deadline:
+                break
+            self._pscad.poll()
+        return self._check()
+
+    def stop(self, wait=True):
+        """
+        Stop the run early.
+
+        Note:
+            As with :meth:`.ProjectCommands.stop`, all runs on the PSCAD
+            instance are stopped.
+
+        Parameters:
+            wait (bool): Wait for the run to wind down.
+        """
+
+        if not self._check():
+            LOG.info("%s: stopping run", self._project)
+            self.stopped = True
+            self._pscad.stop_run()
+            if wait:
+                self.wait()
+
+    def __repr__(self):
+        state = "done" if self.finished is not None else "running"
+        return "RunHandle[{}, {}]".format(self._project.name, state)
@@ -4,7 +4,13 @@
 # PSCAD Rx/Tx Log
 #===============================================================================
 
-"""Rx/Tx Log interface"""
+"""Rx/Tx Log interface
+
+A logger either receives each message as a parsed XML node (`rx_log` and
+`tx_log`), or, if its `raw` attribute is true, the bytes exactly as they
+cross the socket (`rx_raw` and `tx_raw`).  Raw loggers still receive the
+rare connection state nodes (such as `socket-close`) through `rx_log` and
+`tx_log`."""
 
 #===============================================================================
 # Imports
@@ -22,6 +28,9 @@ class RxTxLog:
 
     """Rx/Tx Log interface"""
 
+    # Set to True to receive raw bytes instead of parsed messages
+    raw = False
+
     def __init__(self):
         pass
 
@@ -30,3 +39,9 @@ class RxTxLog:
 
     def tx_log(self, _xml_node):
         pass
+
+    def rx_raw(self, _data):
+        pass
+
+    def tx_raw(self, _data):
+        pass
@@ -0,0 +1,274 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Scenario Manager
+#===============================================================================
+
+"""
+****************
+Scenario Manager
+****************
+
+A scenario manager keeps a local copy of the component parameters of each
+of a project's scenarios, so that differences between scenarios can be
+computed without asking PSCAD, and moving from one scenario to another
+sends only the parameters which differ.
+
+The parameters of all managed components are fetched with pipelined
+`list-parameters` commands: one round trip's latency per scenario,
+instead of one per component.
+
+::
+
+    scenarios = ScenarioManager.for_canvases(project, 'Main')
+    scenarios.capture_all()
+
+    for name in scenarios.names():
+        scenarios.switch(name)
+        project.run()
+
+Switching
+---------
+
+There are two ways of moving to a scenario:
+
+**apply**
+    Write the differing parameters of the managed components.  This makes
+    the live parameter values match the scenario, but PSCAD's current
+    scenario is not changed.  Saving the project in this state stores these
+    values in PSCAD's current scenario.
+
+**native**
+    PSCAD's own `set-scenario` command.  This is a single command, but
+    PSCAD reloads every component's parameters, and all remembered
+    parameter values are discarded.
+
+By default, the applied switch is used when few components differ, and
+the native switch otherwise.
+
+.. autoclass:: ScenarioManager
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging
+
+# ATS imports
+from .usercmp import UserComponent
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Scenario Manager
+#===============================================================================
+
+class ScenarioManager:
+
+    """
+    Local copies of a project's scenarios.
+
+    Parameters:
+        project (ProjectCommands): The project.
+        components: The component controllers whose parameters vary between
+            scenarios.
+        max_apply (int): The largest number of differing components for
+            which :meth:`switch` applies the differences itself, rather
+            than using PSCAD's scenario switch.
+    """
+
+    def __init__(self, project, components, max_apply=16):
+
+        self._project = project
+        self._pscad = project._pscad        # pylint: disable=protected-access
+        self._components = {self._key(cmp): cmp for cmp in components}
+        self._states = {}
+        self._live = None
+        self.max_apply = max_apply
+
+    @classmethod
+    def for_canvases(cls, project, *definitions, **kwargs):
+        """
+        Create a scenario manager for all user components on the canvases of
+        the given definitions.  Wires, buses, frames and other non-user
+        components on those canvases are not managed.
+        """
+
+        components = []
+        for defn in definitions:
+            components.extend(cmp for cmp in project.user_canvas(defn).find_all()
+                              if isinstance(cmp, UserComponent))
+        return cls(project, components, **kwargs)
+
+    @staticmethod
+    def _key(cmp):
+        return cmp._shadow_key(None)        # pylint: disable=protected-access
+
+
+    #===========================================================================
+    # Capture
+    #===========================================================================
+
+    def capture(self, name=None):
+        """
+        Fetch the parameters of all managed components in a scenario.
+
+        Parameters:
+            name (str): The scenario.  Defaults to PSCAD's current scenario.
+
+        Returns:
+            str: The name of the captured scenario.
+        """
+
+        current = self._project.scenario()
+        if name is None:
+            name = current
+
+        keys = list(self._components)
+        cmds = [self._components[key]._parameters_command(name) # pylint: disable=protected-access
+                for key in keys]
+        replies = self._pscad.execute_many(cmds)
+
+        state = {}
+        for key, resp in zip(keys, replies):
+            cmp = self._components[key]
+            if resp.get('success') != 'true':
+                raise ValueError("Unable to fetch parameters of {} "
+                                 "in scenario {}".format(cmp, name))
+            state[key] = cmp._parameter_list(resp) # pylint: disable=protected-access
+
+        self._states[name] = state
+        if name == current  and  self._live is None:
+            self._live = name
+
+        LOG.info("Captured scenario %s: %d components", name, len(state))
+        return name
+
+    def capture_all(self):
+        """Fetch the parameters of all managed components in every scenario"""
+
+        for name in self._project.list_scenarios():
+            self.capture(name)
+
+    def names(self):
+        """The names of the captured scenarios"""
+
+        return list(self._states)
+
+    def state(self, name):
+        """The captured parameters of a scenario, by component key"""
+
+        return self._states[name]
+
+    @property
+    def live(self):
+        """The scenario whose values the managed components currently hold,
+        or `None` if unknown"""
+
+        return self._live
+
+
+    #===========================================================================
+    # Differences
+    #===========================================================================
+
+    def diff(self, from_name, to_name):
+        """
+        The parameters which differ between two captured scenarios.
+
+        Returns:
+            dict: The values in `to_name` of the parameters which differ,
+            by component key.  Components without differences are omitted.
+        """
+
+        src = self._states[from_name]
+        dst = self._states[to_name]
+
+        changes = {}
+        for key, params in dst.items():
+            old = src.get(key, {})
+            delta = {param: value for param, value in params.items()
+                     if old.get(param) != value}
+            if delta:
+                changes[key] = delta
+
+        return changes
+
+
+    #===========================================================================
+    # Switch
+    #===========================================================================
+
+    def switch(self, name, method=None):
+        """
+        Make the managed components hold the parameters of a scenario.
+
+        Parameters:
+            name (str): A captured scenario.
+            method (str): `'apply'`, `'native'`, or `None` to choose the
+                cheaper of the two.
+
+        Returns:
+            int: The number of components whose parameters were written,
+            or `-1` for a native switch.
+        """
+
+        if name not in self._states:
+            raise KeyError("Scenario not captured: {}".format(name))
+
+        if name == self._live:
+            return 0
+
+        changes = None
+        if method is None:
+            if self._live is None:
+                method = 'native'
+            else:
+                changes = self.diff(self._live, name)
+                method = 'apply' if len(changes) <= self.max_apply else 'native'
+
+        if method == 'native':
+            self._project.scenario(name)
+            self._live = name
+            return -1
+
+        if method != 'apply':
+            raise ValueError("Unknown switch method: {}".format(method))
+
+        if self._live is None:
+            raise ValueError("Current values unknown; capture first")
+
+        if changes is None:
+            changes = self.diff(self._live, name)
+
+        self._apply(changes)
+        self._live = name
+        return len(changes)
+
+    def _apply(self, changes):
+
+        keys = list(changes)
+        cmds = [self._components[key]._parameters_command( # pylint: disable=protected-access
+            None, changes[key]) for key in keys]
+        replies = self._pscad.execute_many(cmds)
+
+        failed = []
+        for key, resp in zip(keys, replies):
+            if resp.get('success') == 'true':
+                self._pscad._shadow_update(key, changes[key]) # pylint: disable=protected-access
+            else:
+                self._pscad._shadow_forget(key) # pylint: disable=protected-access
+                failed.append(self._components[key])
+
+        if failed:
+            self._live = None
+            raise ValueError("Unable to set parameters of {}".format(failed))
@@ -44,6 +44,8 @@ class SelectorCommands(ComponentCommand):
 
     """Selector Command Object"""
 
+    __slots__ = ()
+
     def __init__(self, canvas, *iid):
 
         super().__init__(canvas, "Selector", *iid)
@@ -62,6 +62,8 @@ class SimulationSet(CommandScope):
 
     """Simulation Set command object"""
 
+    __slots__ = ()
+
     def __init__(self, pscad, simset_name):
 
         super().__init__(pscad, "Simulation", simulation=simset_name)
@@ -45,6 +45,8 @@ class SliderCommands(ComponentCommand):
 
     """Slider Command Object"""
 
+    __slots__ = ()
+
     def __init__(self, canvas, *iid):
 
         """Construct a command component for a Slider, identified by an id"""
@@ -0,0 +1,178 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Snapshot Warm Starts
+#===============================================================================
+
+"""
+***********
+Warm Starts
+***********
+
+Many studies share a long start-up: the case must first reach steady state
+before anything interesting happens.  A warm start simulates that start-up
+once, saves a snapshot of it, and starts every subsequent run from the
+snapshot instead of from time zero.
+
+This uses the snapshot project parameters:
+
+================= =============================================
+SnapType          1 = take a single timed snapshot
+SnapTime          Time at which the snapshot is taken
+snapshot_filename File the snapshot is written to
+StartType         1 = start the run from a snapshot file
+startup_filename  Snapshot file to start the run from
+================= =============================================
+
+::
+
+    warm = WarmStart('vdiv', 2.0, r'C:\\Work\\snapshots',
+                     build_dir=lambda slot: r'C:\\Work\\w{}\\vdiv.gf46'
+                                            .format(slot.index))
+    warm.prepare(pool.slots[0])
+
+    sweep = Sweep('vdiv', targets, points, store, prepare=warm)
+    sweep.run(pool)
+
+Each instance gets its own copy of the snapshot file, named after the
+instance's slot (`warmstart.0.snp`, `warmstart.1.snp`, ...), so instances
+never share an open file, even when they share a build directory.
+
+.. autoclass:: WarmStart
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import logging, os, shutil
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Warm Start
+#===============================================================================
+
+class WarmStart:
+
+    """
+    Run a case's start-up once, and start later runs from its snapshot.
+
+    Parameters:
+        project (str): Name of the case.
+        snap_time (float): Simulation time at which the start-up is complete.
+        directory (str): Where the master copy of the snapshot is kept.
+        build_dir: The case's build directory, where PSCAD writes the
+            snapshot, or a callable `build_dir(slot)` returning it, when each
+            instance builds in a different directory.
+        filename (str): Name of the snapshot file.
+    """
+
+    SNAPSHOT_PARAMS = ('SnapType', 'SnapTime', 'snapshot_filename',
+                       'StartType', 'startup_filename', 'time_duration')
+
+    def __init__(self, project, snap_time, directory, build_dir,
+                 filename='warmstart.snp'):
+
+        self._project = project
+        self._snap_time = snap_time
+        self._directory = directory
+        self._build_dir = build_dir
+        self._filename = filename
+
+    def _build_dir_of(self, slot):
+        return self._build_dir(slot) if callable(self._build_dir) \
+               else self._build_dir
+
+    @property
+    def snapshot(self):
+        """Path to the master copy of the snapshot"""
+
+        return os.path.join(self._directory, self._filename)
+
+    def prepared(self):
+        """Has the start-up snapshot been taken?"""
+
+        return os.path.exists(self.snapshot)
+
+
+    #===========================================================================
+    # Take the snapshot
+    #===========================================================================
+
+    def prepare(self, slot, force=False):
+        """
+        Simulate the start-up on the slot's instance, and keep the snapshot.
+
+        The project's snapshot parameters are restored afterwards.
+
+        Parameters:
+            slot (Slot): The pool slot whose instance runs the start-up.
+            force (bool): Take the snapshot even if one was already kept.
+        """
+
+        if self.prepared()  and  not force:
+            return self.snapshot
+
+        if not slot.alive():
+            slot.relaunch()
+
+        prj = slot.pscad.project(self._project)
+        params = prj.parameters()
+        saved = {key: params[key] for key in self.SNAPSHOT_PARAMS
+                 if key in params}
+
+        LOG.info("%s: simulating start-up to %gs", self._project,
+                 self._snap_time)
+        prj.parameters(SnapType=1, SnapTime=self._snap_time,
+                       snapshot_filename=self._filename, StartType=0,
+                       time_duration=self._snap_time)
+        try:
+            prj.run()
+        finally:
+            prj.parameters(saved)
+
+        src = os.path.join(self._build_dir_of(slot), self._filename)
+        if not os.path.exists(src):
+            raise FileNotFoundError("Snapshot not written: " + src)
+
+        os.makedirs(self._directory, exist_ok=True)
+        shutil.copy2(src, self.snapshot)
+        return self.snapshot
+
+
+    #===========================================================================
+    # Start from the snapshot
+    #===========================================================================
+
+    def __call__(self, slot, project):
+        """
+        Set up the slot's instance to start runs from the snapshot.
+
+        Intended as the `prepare` hook of a :class:`.Sweep`, which calls it
+        once per instance.  The snapshot is copied into the instance's
+        build directory, under a name of the instance's own, and the project
+        is pointed at that copy.
+        """
+
+        if not self.prepared():
+            raise RuntimeError("Start-up snapshot has not been taken")
+
+        build_dir = self._build_dir_of(slot)
+        os.makedirs(build_dir, exist_ok=True)
+        stem, ext = os.path.splitext(self._filename)
+        local = os.path.join(build_dir, "{}.{}{}".format(stem, slot.index, ext))
+        shutil.copy2(self.snapshot, local)
+
+        project.parameters(SnapType=0, StartType=1, startup_filename=local)
+        LOG.info("%r: %s starts from %s", slot, self._project, local)
+
+    apply = __call__
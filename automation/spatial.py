@@ -0,0 +1,533 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Spatial Indexing
+#===============================================================================
+
+"""
+*****************
+Spatial Indexing
+*****************
+
+A uniform grid index of rectangles, for answering "what is here?" on a
+canvas without asking PSCAD.
+
+Rectangles are `(x1, y1, x2, y2)` tuples, in canvas coordinates, with
+`x1 <= x2` and `y1 <= y2`; they include their edges.  Each rectangle is
+filed under every grid cell it overlaps, so the cell size should be about
+the size of a typical component.
+
+::
+
+    index = GridIndex()
+    index.insert('R1', (0, 0, 36, 18))
+    index.query((18, 0, 90, 90))        # -> ['R1']
+    index.nearest(100, 10)              # -> [(64.0, 'R1')]
+
+.. autoclass:: GridIndex
+    :members:
+
+
+Canvas Index
+------------
+
+A canvas index holds the bounding box of every component on a canvas, and
+optionally the locations of their ports, fetched with one pipelined burst of
+`get-location` (and `get-port-location`) commands::
+
+    index = canvas.spatial_index(ports=('N1', 'N2'))
+
+    index.in_rect(0, 0, 360, 180)       # -> [component, ...]
+    index.nearest(100, 10, count=3)     # -> [(distance, component), ...]
+    index.ports_near(90, 36, 18)        # -> [(distance, component, port), ...]
+
+    router = Router(index.boxes)
+
+The index is kept current when this library moves, adds or deletes a
+component on the canvas, through :meth:`.Component.set_location`,
+:meth:`.UserCanvas.add_component`, :meth:`.Component.delete` or an edit
+session.  Changes made any other way (by hand, or by another client) are
+only seen after :meth:`~CanvasIndex.refresh`.
+
+Components are only approximated by a box around their location, since
+PSCAD does not report a component's size.
+
+.. autoclass:: CanvasIndex
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import heapq, logging, math
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Rectangles
+#===============================================================================
+
+def rect(x1, y1, x2, y2):
+    """A normalised rectangle with the given corners"""
+
+    return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+
+def intersects(a, b):
+    """Do two rectangles overlap (or touch)?"""
+
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def distance(x, y, r):
+    """Distance from a point to a rectangle; 0 if the point is inside"""
+
+    dx = max(r[0] - x, 0, x - r[2])
+    dy = max(r[1] - y, 0, y - r[3])
+    return math.hypot(dx, dy)
+
+
+#===============================================================================
+# Grid Index
+#===============================================================================
+
+class GridIndex:
+
+    """
+    Index of rectangles, by key, on a uniform grid.
+
+    Parameters:
+        cell (int): Size of the grid cells.
+    """
+
+    def __init__(self, cell=72):
+        self._cell = cell
+        self._cells = {}            # Keys, by (column, row)
+        self._rects = {}            # Rectangle, by key
+        self._bounds = None         # Range of cells ever used
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, key):
+        return key in self._rects
+
+    def __iter__(self):
+        return iter(self._rects)
+
+    def rect(self, key):
+        """The rectangle of the given key"""
+
+        return self._rects[key]
+
+    def items(self):
+        """All (key, rectangle) pairs"""
+
+        return self._rects.items()
+
+    def _span(self, r):
+        cell = self._cell
+        return (range(math.floor(r[0] / cell), math.floor(r[2] / cell) + 1),
+                range(math.floor(r[1] / cell), math.floor(r[3] / cell) + 1))
+
+    #---------------------------------------------------------------------------
+    # Changes
+    #---------------------------------------------------------------------------
+
+    def insert(self, key, r):
+        """Add a rectangle, or move the key's rectangle"""
+
+        if key in self._rects:
+            self.remove(key)
+
+        r = rect(*r)
+        self._rects[key] = r
+        columns, rows = self._span(r)
+
+        bounds = (columns[0], rows[0], columns[-1], rows[-1])
+        if self._bounds is not None:
+            old = self._bounds
+            bounds = (min(old[0], bounds[0]), min(old[1], bounds[1]),
+                      max(old[2], bounds[2]), max(old[3], bounds[3]))
+        self._bounds = bounds
+
+        cells = self._cells
+        for col in columns:
+            for row in rows:
+                keys = cells.get((col, row))
+                if keys is None:
+                    cells[col, row] = {key}
+                else:
+                    keys.add(key)
+
+    def remove(self, key):
+        """Remove a key's rectangle, if it is indexed"""
+
+        r = self._rects.pop(key, None)
+        if r is None:
+            return
+
+        columns, rows = self._span(r)
+        cells = self._cells
+        for col in columns:
+            for row in rows:
+                keys = cells.get((col, row))
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del cells[col, row]
+
+    def clear(self):
+        """Remove everything"""
+
+        self._cells.clear()
+        self._rects.clear()
+        self._bounds = None
+
+    #---------------------------------------------------------------------------
+    # Queries
+    #---------------------------------------------------------------------------
+
+    def candidates(self, r):
+        """Keys filed in the grid cells the rectangle overlaps; a superset
+        of the keys whose rectangles overlap it"""
+
+        found = set()
+        cells = self._cells
+        columns, rows = self._span(rect(*r))
+        if len(columns) * len(rows) > len(cells):
+            for (col, row), keys in cells.items():
+                if col in columns  and  row in rows:
+                    found.update(keys)
+        else:
+            for col in columns:
+                for row in rows:
+                    keys = cells.get((col, row))
+                    if keys:
+                        found.update(keys)
+        return found
+
+    def query(self, r):
+        """Keys of the rectangles which overlap the given rectangle"""
+
+        r = rect(*r)
+        rects = self._rects
+        return [key for key in self.candidates(r) if intersects(rects[key], r)]
+
+    def at(self, x, y):
+        """Keys of the rectangles containing the point"""
+
+        return self.query((x, y, x, y))
+
+    def nearest(self, x, y, count=1, max_distance=None):
+        """
+        The rectangles nearest to a point.
+
+        Returns:
+            list: Up to `count` `(distance, key)` pairs, nearest first.
+        """
+
+        if not self._rects:
+            return []
+
+        cell = self._cell
+        col0, row0 = math.floor(x / cell), math.floor(y / cell)
+        left, top, right, bottom = self._bounds
+        limit = max(abs(col0 - left), abs(col0 - right),
+                    abs(row0 - top), abs(row0 - bottom))
+
+        seen = set()
+        best = []                   # Max-heap of (-distance, order, key)
+        rects = self._rects
+        for ring in range(limit + 1):
+            for col in range(col0 - ring, col0 + ring + 1):
+                edge = col in (col0 - ring, col0 + ring)
+                for row in (range(row0 - ring, row0 + ring + 1) if edge else
+                            (row0 - ring, row0 + ring)):
+                    for key in self._cells.get((col, row), ()):
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        dist = distance(x, y, rects[key])
+                        if max_distance is not None  and  dist > max_distance:
+                            continue
+                        if len(best) < count:
+                            heapq.heappush(best, (-dist, len(seen), key))
+                        elif dist < -best[0][0]:
+                            heapq.heapreplace(best, (-dist, len(seen), key))
+
+            # Anything in a cell further out is at least this far away
+            bound = ring * cell
+            if len(best) == count  and  -best[0][0] <= bound:
+                break
+            if max_distance is not None  and  bound > max_distance:
+                break
+
+        return [(-neg, key) for neg, _, key in sorted(best, reverse=True)]
+
+
+#===============================================================================
+# Canvas Index
+#===============================================================================
+
+class CanvasIndex:
+
+    """
+    Spatial index of the components on a canvas.
+
+    Created by :meth:`.UserCanvas.spatial_index`.
+
+    Parameters:
+        canvas: The canvas.
+        components: The components to index (default: all components on
+            the canvas).
+        extent: Bounding box of a component, relative to its location, as
+            `(x1, y1, x2, y2)`, or a function returning it for a component.
+        ports: Names of the ports to index, or a function returning them
+            for a component.  Only user components have ports.
+        cell (int): Size of the grid cells.
+        window (int): Number of commands in flight at once, when fetching.
+    """
+
+    def __init__(self, canvas, components=None, extent=(-18, -18, 18, 18), # pylint: disable=too-many-arguments
+                 ports=(), cell=72, window=64):
+
+        self._canvas = canvas
+        self._pscad = canvas._pscad                 # pylint: disable=protected-access
+        self._scope = self._key(canvas)
+        self._selection = components
+        self._extent = extent if callable(extent) else lambda cmp: extent
+        self._ports = ports if callable(ports) else lambda cmp: ports
+        self._window = window
+
+        self._components = {}       # Component, by id
+        self._locations = {}        # Location, by component id
+        self._boxes = GridIndex(cell)
+        self._port_index = GridIndex(cell)
+        self._port_names = {}       # Port names, by component id
+        self._unported = set()      # Ids of components whose ports are unread
+
+        self.refresh()
+        self._pscad._watch(self)                    # pylint: disable=protected-access
+
+    @staticmethod
+    def _key(scope):
+        return (scope._scope['project'], scope._scope['definition']) # pylint: disable=protected-access
+
+    def __len__(self):
+        return len(self._components)
+
+    def __contains__(self, component):
+        return component._id in self._components    # pylint: disable=protected-access
+
+    def __iter__(self):
+        return iter(self._components.values())
+
+    def close(self):
+        """Stop following changes to the canvas"""
+
+        self._pscad._unwatch(self)                  # pylint: disable=protected-access
+
+
+    #===========================================================================
+    # Fetch
+    #===========================================================================
+
+    def refresh(self):
+        """Fetch the location of every component (and port) again"""
+
+        if self._selection is None:
+            components = self._canvas.find_all()
+        else:
+            components = list(self._selection)
+
+        pscad = self._pscad
+        cmds = [cmp.command('get-location') for cmp in components]
+        LOG.debug("%s: fetching %d locations", self._canvas, len(cmds))
+        replies = pscad.execute_many(cmds, self._window)
+
+        self._components.clear()
+        self._locations.clear()
+        self._boxes.clear()
+        self._port_index.clear()
+        self._port_names.clear()
+        self._unported.clear()
+
+        for cmp, resp in zip(components, replies):
+            location = cmp._location_of(resp) if resp is not None else None # pylint: disable=protected-access
+            if location is not None:
+                self._place(cmp, location)
+            else:
+                LOG.warning("%s: no location for %r", self._canvas, cmp)
+
+        self._fetch_ports()
+
+    def _fetch_ports(self):
+
+        pending = []
+        for cid in self._unported:
+            cmp = self._components[cid]
+            if hasattr(cmp, '_port_location_command'):
+                pending.extend((cmp, name) for name in self._ports(cmp))
+            self._port_names[cid] = ()
+        self._unported.clear()
+        if not pending:
+            return
+
+        cmds = [cmp._port_location_command(name) for cmp, name in pending] # pylint: disable=protected-access
+        replies = self._pscad.execute_many(cmds, self._window)
+
+        found = {}
+        for (cmp, name), resp in zip(pending, replies):
+            location = cmp._location_of(resp) if resp is not None else None # pylint: disable=protected-access
+            if location is not None:
+                found.setdefault(cmp._id, []).append(name) # pylint: disable=protected-access
+                self._port_index.insert((cmp._id, name), location + location) # pylint: disable=protected-access
+
+        for cid, names in found.items():
+            self._port_names[cid] = tuple(names)
+
+    def _place(self, cmp, location):
+
+        cid = cmp._id                               # pylint: disable=protected-access
+        x, y = location
+        x1, y1, x2, y2 = self._extent(cmp)
+        self._components[cid] = cmp
+        self._locations[cid] = location
+        self._boxes.insert(cid, (x + x1, y + y1, x + x2, y + y2))
+        self._unported.add(cid)
+
+
+    #===========================================================================
+    # Changes
+    #===========================================================================
+
+    def component_moved(self, component, location):
+        """
+        Called when this library moves or adds a component to `location`,
+        or deletes it if `location` is `None`.
+        """
+
+        if self._key(component) != self._scope:
+            return
+
+        cid = component._id                         # pylint: disable=protected-access
+        if location is None:
+            self._forget(cid)
+            return
+
+        old = self._locations.get(cid)
+        if old is None:
+            if self._selection is None:
+                self._place(component, tuple(location))
+            return
+
+        names = self._port_names.get(cid)
+        self._place(component, tuple(location))
+        if names is not None:
+            # The component keeps its orientation, so its ports move with it
+            dx, dy = location[0] - old[0], location[1] - old[1]
+            for name in names:
+                key = cid, name
+                x, y = self._port_index.rect(key)[:2]
+                self._port_index.insert(key, (x + dx, y + dy) * 2)
+            self._unported.discard(cid)
+
+    def _forget(self, cid):
+
+        self._components.pop(cid, None)
+        self._locations.pop(cid, None)
+        self._boxes.remove(cid)
+        self._unported.discard(cid)
+        for name in self._port_names.pop(cid, ()):
+            self._port_index.remove((cid, name))
+
+
+    #===========================================================================
+    # Queries
+    #===========================================================================
+
+    @property
+    def boxes(self):
+        """The :class:`.GridIndex` of component boxes, keyed by component
+        id; suitable as the obstacles of a :class:`.Router`"""
+
+        return self._boxes
+
+    def location(self, component):
+        """The indexed `(x, y)` location of a component, or `None`"""
+
+        return self._locations.get(component._id)   # pylint: disable=protected-access
+
+    def box(self, component):
+        """The indexed bounding box of a component, or `None`"""
+
+        cid = component._id                         # pylint: disable=protected-access
+        return self._boxes.rect(cid) if cid in self._boxes else None
+
+    def in_rect(self, x1, y1, x2, y2):
+        """Components whose boxes overlap the rectangle"""
+
+        components = self._components
+        return [components[cid]
+                for cid in self._boxes.query((x1, y1, x2, y2))]
+
+    def at(self, x, y):
+        """Components whose boxes contain the point"""
+
+        return self.in_rect(x, y, x, y)
+
+    def nearest(self, x, y, count=1, max_distance=None):
+        """
+        The components nearest to a point.
+
+        Returns:
+            list: Up to `count` `(distance, component)` pairs, nearest first.
+        """
+
+        components = self._components
+        return [(dist, components[cid]) for dist, cid in
+                self._boxes.nearest(x, y, count, max_distance)]
+
+    def ports_near(self, x, y, radius=18):
+        """
+        The ports within a distance of a point.
+
+        Ports of components added since the index was built are fetched
+        first.
+
+        Returns:
+            list: `(distance, component, port_name)` tuples, nearest first.
+        """
+
+        if self._unported:
+            self._fetch_ports()
+
+        ports = self._port_index
+        components = self._components
+        found = []
+        for cid, name in ports.query((x - radius, y - radius,
+                                      x + radius, y + radius)):
+            dist = distance(x, y, ports.rect((cid, name)))
+            if dist <= radius:
+                found.append((dist, components[cid], name))
+        found.sort(key=lambda entry: entry[0])
+        return found
+
+    def port_location(self, component, name):
+        """The indexed location of a component's port, or `None`"""
+
+        if self._unported:
+            self._fetch_ports()
+
+        key = component._id, name                   # pylint: disable=protected-access
+        return self._port_index.rect(key)[:2] if key in self._port_index \
+               else None
@@ -0,0 +1,429 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# PSCAD Parameter Sweeps
+#===============================================================================
+
+"""
+****************
+Parameter Sweeps
+****************
+
+A parameter sweep runs a case once for every point in a parameter space,
+spreading the points over an :class:`.InstancePool` of PSCAD instances.
+
+Each swept variable is bound to a :class:`Target`: a project parameter,
+or a parameter of a user component on one of the project's canvases.
+Only the variables which differ from the last point run on an instance
+are written to that instance.
+
+Every completed point is appended to a :class:`ResultsStore` as soon as it
+finishes.  The store doubles as the sweep's checkpoint: running the same
+sweep against the same store skips the points already completed, so a
+sweep interrupted by a crash simply resumes where it left off.
+
+::
+
+    targets = {
+        'R':    Target('Main', 1234567890, 'R'),
+        'tmax': Target.project('time_duration'),
+        }
+    points = grid(R=['1 [ohm]', '2 [ohm]', '5 [ohm]'], tmax=[0.5, 1.0])
+
+    store = ResultsStore(r'C:\\Work\\sweep1')
+    sweep = Sweep('vdiv', targets, points, store,
+                  harvest=copy_outputs(r'C:\\Work\\vdiv.gf46'))
+    sweep.run(InstancePool(launch, 4))
+
+
+Parameter Spaces
+----------------
+
+.. autofunction:: grid
+.. autofunction:: latin_hypercube
+
+
+Sweeps
+------
+
+.. autoclass:: Target
+.. autoclass:: Sweep
+    :members: run
+.. autofunction:: copy_outputs
+
+
+Results
+-------
+
+.. autoclass:: ResultsStore
+    :members:
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import itertools, json, logging, os, random, shutil, threading, time
+from collections import namedtuple
+
+
+#===============================================================================
+# Logging
+#===============================================================================
+
+LOG = logging.getLogger(__name__)
+
+
+#===============================================================================
+# Parameter spaces
+#===============================================================================
+
+def grid(**axes):
+    """grid(name=values [, ...])
+
+    The full-factorial grid of the given variables.
+
+    The last variable varies fastest, so consecutive points differ in as few
+    variables as possible.
+
+    Returns:
+        List[dict]: One `name=value` dictionary per point.
+    """
+
+    names = list(axes)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(axes[name] for name in names))]
+
+
+def latin_hypercube(samples, seed=None, **ranges):
+    """latin_hypercube(samples, [seed,] name=(lower, upper) [, ...])
+
+    A Latin hypercube sample of the given variable ranges.
+
+    Each variable's range is split into `samples` equal strata, and every
+    stratum is sampled exactly once.
+
+    Returns:
+        List[dict]: One `name=value` dictionary per point.
+    """
+
+    rng = random.Random(seed)
+    columns = {}
+    for name, (lower, upper) in ranges.items():
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        span = (upper - lower) / samples
+        columns[name] = [lower + (stratum + rng.random()) * span
+                         for stratum in strata]
+
+    return [{name: columns[name][i] for name in ranges}
+            for i in range(samples)]
+
+
+#===============================================================================
+# Targets
+#===============================================================================
+
+_Target = namedtuple('Target', 'definition iid param')
+
+class Target(_Target):
+
+    """Target(definition, iid, param)
+
+    Where a swept variable is written to: parameter `param` of the user
+    component with Id `iid` on the canvas of `definition`.  Project
+    parameters have neither a definition nor an Id; use
+    :meth:`Target.project`.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def project(cls, param):
+        """A project parameter, such as `time_duration`"""
+
+        return cls(None, None, param)
+
+    def is_project(self):
+        return self.definition is None
+
+
+#===============================================================================
+# Results store
+#===============================================================================
+
+class ResultsStore:
+
+    """
+    An append-only store of sweep results, on disk.
+
+    `<directory>/results.jsonl` holds one JSON record per completed point.
+    Files harvested for a point are kept in `<directory>/<index>/`.
+    """
+
+    RESULTS = 'results.jsonl'
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def _results(self):
+        return os.path.join(self.directory, self.RESULTS)
+
+    def point_dir(self, index):
+        """Directory for the files harvested for the given point"""
+
+        path = os.path.join(self.directory, "{:06d}".format(index))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def record(self, index, point, result=None, error=None, **extra):
+        """Append the result of a point, and make sure it reaches the disk"""
+
+        entry = dict(index=index, point=point, result=result, error=error,
+                     **extra)
+        line = json.dumps(entry, default=str) + "\n"
+
+        with self._lock:
+            with open(self._results, 'a') as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def results(self):
+        """Iterate over the recorded results"""
+
+        if os.path.exists(self._results):
+            with open(self._results) as file:
+                for line in file:
+                    # A crash may leave a partial last line
+                    if line.endswith("\n"):
+                        yield json.loads(line)
+
+    def completed(self, points=None):
+        """
+        Indices of the points which have already completed.
+
+        Parameters:
+            points (list): If given, only a recorded point equal to the point
+                with the same index counts as completed.
+        """
+
+        if points is None:
+            return {entry['index'] for entry in self.results()
+                    if entry.get('error') is None}
+
+        done = set()
+        for entry in self.results():
+            index = entry['index']
+            if entry.get('error') is not None:
+                continue
+            if index < len(points)  and  \
+               entry['point'] == _as_recorded(points[index]):
+                done.add(index)
+            else:
+                LOG.warning("Results store: recorded point %d differs from "
+                            "the sweep's; it will be run again", index)
+        return done
+
+
+def _as_recorded(point):
+    """The point, as it reads back from the store"""
+
+    return json.loads(json.dumps(point, default=str))
+
+
+#===============================================================================
+# Harvesting
+#===============================================================================
+
+def copy_outputs(build_dir, exts=('.out', '.inf')):
+    """
+    Create a harvester which copies a run's output files into the results
+    store.
+
+    Parameters:
+        build_dir: Directory the case writes its output files to, or a
+            callable `build_dir(slot)` returning it, when each instance
+            works in a different directory.
+        exts: Extensions of the files to keep.
+
+    Returns:
+        A harvester suitable for :class:`Sweep`.
+    """
+
+    def harvest(slot, project, point, dest_dir):
+        src_dir = build_dir(slot) if callable(build_dir) else build_dir
+        files = []
+        for filename in sorted(os.listdir(src_dir)):
+            if os.path.splitext(filename)[1] in exts:
+                shutil.copy(os.path.join(src_dir, filename), dest_dir)
+                files.append(filename)
+        return {'files': files}
+
+    return harvest
+
+
+#===============================================================================
+# Sweep
+#===============================================================================
+
+class Sweep:
+
+    """
+    A parameter sweep of one project.
+
+    Parameters:
+        project (str): Name of the case to run.
+        targets (dict): The :class:`Target` of each swept variable.
+        points (list): The points to run: a `name=value` dictionary each.
+        store (ResultsStore): Where the results are recorded.
+        harvest: Callable `harvest(slot, project, point, dest_dir)` run after
+            each point, to collect its results into `dest_dir`.  Its return
+            value is recorded with the point. (optional)
+        chunk (int): Number of consecutive points given to an instance at
+            once.  Neighbouring points usually differ in fewer variables.
+        prepare: Callable `prepare(slot, project)` run once on each
+            instance before its first point, such as a :class:`.WarmStart`.
+            (optional)
+    """
+
+    _MISSING = object()
+
+    def __init__(self, project, targets, points, store, harvest=None,
+                 chunk=8, prepare=None):
+
+        points = list(points)
+        for point in points:
+            unknown = set(point) - set(targets)
+            if unknown:
+                raise ValueError("No target for {}".format(sorted(unknown)))
+
+        self._project = project
+        self._targets = targets
+        self._points = points
+        self._store = store
+        self._harvest = harvest
+        self._prepare = prepare
+        self._chunk = max(1, chunk)
+        self._done = set()
+        self._failed = []
+
+
+    #===========================================================================
+    # Run
+    #===========================================================================
+
+    def run(self, pool):
+        """
+        Run all points not yet recorded in the store.
+
+        Parameters:
+            pool (InstancePool): The PSCAD instances to run the points on.
+
+        Returns:
+            int: Number of points which failed.
+        """
+
+        done = self._store.completed(self._points)
+        self._done = set(done)
+        self._failed = []
+        todo = [index for index in range(len(self._points))
+                if index not in done]
+        LOG.info("Sweep %s: %d points, %d already done, %d to run",
+                 self._project, len(self._points), len(done), len(todo))
+
+        chunks = [todo[i:i+self._chunk]
+                  for i in range(0, len(todo), self._chunk)]
+        pool.run(chunks, self._run_chunk, on_failure=self._chunk_failed)
+
+        return len(self._failed)
+
+    def _run_chunk(self, slot, chunk):
+
+        # A retried chunk skips the points completed by an earlier attempt
+        for index in chunk:
+            if index in self._done:
+                continue
+            try:
+                self._run_point(slot, index)
+            except Exception as ex:         # pylint: disable=broad-except
+                # If the instance died, the pool retries the rest of the
+                # chunk on a relaunched instance
+                if not slot.alive():
+                    raise
+                LOG.error("Sweep %s: point %d failed: %s", self._project,
+                          index, ex)
+                self._point_failed(index, ex)
+            self._done.add(index)
+
+    def _chunk_failed(self, chunk, ex):
+        for index in chunk:
+            if index not in self._done:
+                self._point_failed(index, ex)
+                self._done.add(index)
+
+    def _point_failed(self, index, ex):
+        self._failed.append(index)
+        self._store.record(index, self._points[index], error=str(ex))
+
+
+    #===========================================================================
+    # One point
+    #===========================================================================
+
+    def _run_point(self, slot, index):
+
+        point = self._points[index]
+        project = slot.pscad.project(self._project)
+
+        # Relaunching an instance clears its state, so it is prepared again
+        if self._prepare is not None  and  not slot.state.get('prepared'):
+            self._prepare(slot, project)
+            slot.state['prepared'] = True
+
+        start = time.perf_counter()
+        changed = self._apply(slot, project, point)
+        project.run()
+        elapsed = time.perf_counter() - start
+
+        result = None
+        if self._harvest is not None:
+            dest_dir = self._store.point_dir(index)
+            result = self._harvest(slot, project, point, dest_dir)
+
+        self._store.record(index, point, result, instance=slot.index,
+                           changed=changed, elapsed=elapsed)
+
+    def _apply(self, slot, project, point):
+
+        """Write the variables which differ from what is on the instance"""
+
+        applied = slot.state.setdefault('applied', {})
+        delta = {name: value for name, value in point.items()
+                 if applied.get(name, self._MISSING) != value}
+
+        # One set_parameters() per component, one for the project
+        writes = {}
+        for name, value in delta.items():
+            target = self._targets[name]
+            key = (target.definition, target.iid)
+            writes.setdefault(key, {})[target.param] = value
+
+        for (definition, iid), params in writes.items():
+            if definition is None:
+                project.parameters(params)
+            else:
+                project.user_canvas(definition).user_cmp(iid) \
+                       .set_parameters(**params)
+
+            # Only remember values once they have been written
+            for name in delta:
+                target = self._targets[name]
+                if (target.definition, target.iid) == (definition, iid):
+                    applied[name] = delta[name]
+
+        return sorted(delta)
@@ -46,6 +46,8 @@ class SwitchCommands(ComponentCommand):
 
     """Switch Command Object"""
 
+    __slots__ = ()
+
     def __init__(self, canvas, *iid):
 
         super().__init__(canvas, "Switch", *iid)
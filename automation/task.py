@@ -48,6 +48,8 @@ class Task(CommandScope):
 
     """Task command object"""
 
+    __slots__ = ()
+
     def __init__(self, pscad, simset_name, task_name):
 
         super().__init__(pscad, "Task", simulation=simset_name, task=task_name)
@@ -47,6 +47,8 @@ class TLineComponent(ComponentCommand):
 
     """TLine Component Command Object"""
 
+    __slots__ = ('_defn',)
+
     def __init__(self, canvas, iid, defn=None):
 
         """Construct a command component for a TLine, identified by an id"""
@@ -56,6 +56,18 @@ Creating Components
 .. automethod:: UserCanvas.add_wire
 
 
+Edit Sessions
+-------------
+
+.. automethod:: UserCanvas.edit
+
+
+Spatial Index
+-------------
+
+.. automethod:: UserCanvas.spatial_index
+
+
 Clipboard Operations
 --------------------
 
@@ -79,9 +91,11 @@ import xml.etree.ElementTree as ET
 # ATS imports
 from .button import ButtonCommands
 from .canvas import CanvasComponent
+from .edit import EditSession
 from .graph_frame import GraphFrame
 from .overlay_graph import OverlayGraph
 from .selector import SelectorCommands
+from .spatial import CanvasIndex
 from .slider import SliderCommands
 from .switch import SwitchCommands
 from .usercmp import UserComponent
@@ -117,12 +131,14 @@ class UserCanvas(CanvasComponent):
         main = project.user_canvas('Main')
     """
 
+    __slots__ = ()
+
     def __init__(self, project, name, *iid):
 
         """Construct a command component for a User Canvas"""
 
         super().__init__(project, "UserCanvas", name, *iid)
-        self._scope['definition'] = name
+        self._rescope(definition=name)
         self.name = name
 
 
@@ -330,6 +346,64 @@ class UserCanvas(CanvasComponent):
         return SelectorCommands(self, *iid)
 
 
+    #===========================================================================
+    # Edit session
+    #===========================================================================
+
+    def edit(self, rollback=False, window=64):
+        """
+        Start an edit session, to change many components at once::
+
+            with canvas.edit() as edit:
+                for cmp, (x, y) in layout.items():
+                    edit.move(cmp, x, y)
+
+        Changes are recorded locally, and sent as one pipelined burst when
+        the `with` block ends.
+
+        Parameters:
+            rollback (bool): Undo the applied changes if any change fails.
+            window (int): Number of commands in flight at once.
+
+        Returns:
+            EditSession: The session. See :mod:`.edit`.
+        """
+
+        return EditSession(self, rollback, window)
+
+
+    #===========================================================================
+    # Spatial index
+    #===========================================================================
+
+    def spatial_index(self, components=None, extent=(-18, -18, 18, 18), # pylint: disable=too-many-arguments
+                      ports=(), cell=72, window=64):
+        """
+        Build a spatial index of the components on this canvas::
+
+            index = canvas.spatial_index(ports=('N1', 'N2'))
+            near = index.nearest(x, y, count=5)
+
+        All locations are fetched with one pipelined burst of commands.
+        The index follows the components this library moves, adds or
+        deletes afterwards.
+
+        Parameters:
+            components: The components to index (default: all of them).
+            extent: Bounding box of a component relative to its location,
+                or a function returning it for a component.
+            ports: Port names to index, or a function returning them for
+                a component.
+            cell (int): Size of the index's grid cells.
+            window (int): Number of commands in flight at once.
+
+        Returns:
+            CanvasIndex: The index. See :mod:`.spatial`.
+        """
+
+        return CanvasIndex(self, components, extent, ports, cell, window)
+
+
     #===========================================================================
     # select_components
     #===========================================================================
@@ -480,9 +554,9 @@ class UserCanvas(CanvasComponent):
     # add_wire
     #===========================================================================
 
-    def add_wire(self, *vertices):
+    def add_wire(self, *vertices, router=None):
 
-        """add_wire( (x1,y1), (x2,y2), [... (xn,yn) ...])
+        """add_wire( (x1,y1), (x2,y2), [... (xn,yn) ...], [router=router])
         Create a new wire and add it to the canvas.
 
         If more than two vertices are given, a multi-vertex wire will be
@@ -490,14 +564,31 @@ class UserCanvas(CanvasComponent):
         If any segment is neither horizontal or vertical, additional vertices
         will be inserted.
 
+        If a :class:`.Router` is given, exactly two vertices must be given:
+        the wire's path between them is found by the router, avoiding
+        components and other routed wires.
+
         Returns:
             A created :class:`.Wire`.
 
+        Raises:
+            ValueError: if the router found no path, or more than two
+                vertices were given with a router.
+
         Note:
             Use :meth:`.UserComponent.get_port_location()` to determine
             the locations to connect the wires to.
         """
 
+        if router is not None:
+            if len(vertices) != 2:
+                raise ValueError("A routed wire needs exactly 2 vertices")
+            path = router.route(vertices[0], vertices[-1])
+            if path is None:
+                raise ValueError("No route from {} to {}".format(
+                    vertices[0], vertices[-1]))
+            vertices = path
+
         cmd = self.command('add-components')
 
         component = cmd.tag('component')
@@ -78,6 +78,8 @@ class UserComponent(ComponentCommand):
 
     """User Component Command Object"""
 
+    __slots__ = ()
+
     def __init__(self, canvas, iid):
 
         """Construct a command component for a UserCmp, identified by an id"""
@@ -189,13 +191,22 @@ class UserComponent(ComponentCommand):
         resp = cmd.execute()
 
         defn = None
+        names = self._definition_of(resp)
+        if names is not None:
+            defn = Definition(self, *names)
+
+        return defn
+
+    @staticmethod
+    def _definition_of(resp):
+        """The (project, definition) names in a 'get-definition' reply"""
+
         scope = resp.find('scope') if resp is not None else None
         if scope is not None:
             prj_name = scope.find('project').get('name')
             defn_name = scope.find('definition').get('name')
-            defn = Definition(self, prj_name, defn_name)
-
-        return defn
+            return (prj_name, defn_name)
+        return None
 
 
     #===========================================================================
@@ -250,14 +261,11 @@ class UserComponent(ComponentCommand):
             or `None` if the port  is not enabled or does not exist.
         """
 
-        cmd = self.command('get-port-location')
-        cmd.tag('port').set('name', name)
-        resp = cmd.execute()
+        resp = self._port_location_command(name).execute()
 
-        loc = resp.find('location')
-        if loc is not None:
-            x = int(loc.get('x'))
-            y = int(loc.get('y'))
-            return (x,y)
-        else:
-            return None
+        return self._location_of(resp)
+
+    def _port_location_command(self, name):
+        cmd = self.command('get-port-location')
+        cmd.add_tag('port', name=name)
+        return cmd
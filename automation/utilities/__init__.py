@@ -11,5 +11,9 @@ mhrc.automation.utilities.file - Copy, move, and compare files
 
 mhrc.automation.utilities.mail - Send gmail or outlook mail utility
 
+mhrc.automation.utilities.monitor - Stop runs when channels misbehave
+
+mhrc.automation.utilities.tail - Follow output files while a simulation runs
+
 mhrc.automation.utilities.word - Create/modify Microsoft Word documents
 """
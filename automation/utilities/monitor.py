@@ -0,0 +1,257 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#  Power Systems Computer Aided Design (PSCAD)
+# ------------------------------------------------------------------------------
+#  PSCAD is a powerful graphical user interface that integrates seamlessly
+#  with EMTDC, a general purpose time domain program for simulating power
+#  system transients and controls in power quality studies, power electronics
+#  design, distributed generation, and transmission planning.
+#
+#  This Python script is a utility class that can be used by end users
+#
+#
+#     PSCAD Support Team <support@pscad.com>
+#     Manitoba HVDC Research Centre Inc.
+#     Winnipeg, Manitoba. CANADA
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Import dependancies
+import math
+from collections import namedtuple
+
+#---------------------------------------------------------------------
+# Trigger
+#
+# Where and why a condition was met.
+#---------------------------------------------------------------------
+
+Trigger = namedtuple('Trigger', 'condition time channel value')
+
+#---------------------------------------------------------------------
+# Conditions
+#
+# Each condition checks a whole block of rows at a time.  Each column
+# is first tested with a single builtin call (max, min, all, ...), and
+# only when that shows the condition is met is the block searched for
+# the first row which meets it.
+#---------------------------------------------------------------------
+
+class Condition:
+
+    """Base class for monitored conditions"""
+
+    name = None
+
+    def bind(self, columns):
+        """Resolve channel names to column numbers, using an OutFile or
+        TailOutFile (or anything with a column(name) method)"""
+
+    def check(self, block):
+        """Return a Trigger for the first row of the block which meets
+        the condition, or None"""
+
+        raise NotImplementedError()
+
+    def __str__(self):
+        return self.name or type(self).__name__
+
+
+def _resolve(columns, channel):
+    if isinstance(channel, int):
+        return channel
+    if columns is None:
+        raise ValueError("Channel names need an OutFile to resolve "
+                         "{!r}".format(channel))
+    return columns.column(channel)
+
+
+class Threshold(Condition):
+
+    """Met when a channel goes above `upper`, or below `lower`.
+    With absolute=True, the magnitude of the channel is tested.
+
+    eg)
+        Threshold("Vrms", upper=1.2)       # Overvoltage
+    """
+
+    def __init__(self, channel, upper=None, lower=None, absolute=False,
+                 name=None):
+
+        if upper is None and lower is None:
+            raise ValueError("Threshold needs an upper or lower limit")
+
+        self.channel = channel
+        self.upper = upper
+        self.lower = lower
+        self.absolute = absolute
+        self.name = name or "Threshold({})".format(channel)
+        self._col = channel if isinstance(channel, int) else None
+
+    def bind(self, columns):
+        self._col = _resolve(columns, self.channel)
+
+    def _met(self, value):
+        return ((self.upper is not None  and  value > self.upper)  or
+                (self.lower is not None  and  value < self.lower))
+
+    def check(self, block):
+        col = self._col
+        values = [row[col] for row in block]
+        if self.absolute:
+            values = list(map(abs, values))
+
+        if ((self.upper is None  or  max(values) <= self.upper)  and
+                (self.lower is None  or  min(values) >= self.lower)):
+            return None
+
+        for row, value in zip(block, values):
+            if self._met(value):
+                return Trigger(self, row[0], self.channel, row[col])
+        return None
+
+
+class FrequencyDeviation(Condition):
+
+    """Met when a frequency channel stays more than `tolerance` away from
+    `nominal` for at least `hold` seconds of simulation time.
+
+    eg)
+        FrequencyDeviation("F", 60.0, 0.5, hold=0.1)
+    """
+
+    def __init__(self, channel, nominal, tolerance, hold=0.0, name=None):
+
+        self.channel = channel
+        self.nominal = nominal
+        self.tolerance = tolerance
+        self.hold = hold
+        self.name = name or "FrequencyDeviation({})".format(channel)
+        self._col = channel if isinstance(channel, int) else None
+        self._since = None                  # Time the deviation started
+
+    def bind(self, columns):
+        self._col = _resolve(columns, self.channel)
+
+    def check(self, block):
+        col = self._col
+        low = self.nominal - self.tolerance
+        high = self.nominal + self.tolerance
+        values = [row[col] for row in block]
+
+        # Whole block within the band: any deviation in progress has ended
+        if self._since is None  and  min(values) >= low  and  \
+           max(values) <= high:
+            return None
+
+        for row, value in zip(block, values):
+            if low <= value <= high:
+                self._since = None
+            else:
+                if self._since is None:
+                    self._since = row[0]
+                if row[0] - self._since >= self.hold:
+                    return Trigger(self, row[0], self.channel, value)
+        return None
+
+
+class NonFinite(Condition):
+
+    """Met when a channel becomes NaN or infinite.  By default, every
+    channel is checked."""
+
+    def __init__(self, *channels, name=None):
+
+        self.channels = channels
+        self.name = name or "NonFinite"
+        self._cols = [ch for ch in channels if isinstance(ch, int)] or None
+
+    def bind(self, columns):
+        if self.channels:
+            self._cols = [_resolve(columns, ch) for ch in self.channels]
+
+    def check(self, block):
+        isfinite = math.isfinite
+        cols = self._cols or range(len(block[0]))
+
+        for col in cols:
+            if not all(map(isfinite, (row[col] for row in block))):
+                for row in block:
+                    if not isfinite(row[col]):
+                        return Trigger(self, row[0], col, row[col])
+        return None
+
+#---------------------------------------------------------------------
+# Monitor class
+#---------------------------------------------------------------------
+
+class Monitor:
+
+    """Evaluate conditions on each block of rows from a running simulation
+
+    on_trigger(trigger) is called for each condition as it is met; each
+    condition triggers only once.  If stop is given (such as
+    pscad.stop_run, or the stop method of a run handle), it is called the
+    first time any condition is met.
+
+    The monitor must be fed from the thread which owns the PSCAD
+    connection, since stopping the run sends a command to PSCAD.
+
+    eg)
+        monitor = Monitor([Threshold("Vrms", upper=1.3), NonFinite()],
+                          columns=tail, stop=run.stop)
+        while not run.done():
+            run.poll()
+            if monitor.feed(tail.read_block()):
+                break
+    """
+
+    def __init__(self, conditions, columns=None, on_trigger=None, stop=None):
+
+        self._conditions = list(conditions)
+        for condition in self._conditions:
+            condition.bind(columns)
+
+        self._on_trigger = on_trigger
+        self._stop = stop
+        self.triggers = []
+        self.stopped = False
+
+    def feed(self, block):
+
+        """Check a block of rows.  Returns the triggers it caused."""
+
+        if not block:
+            return []
+
+        fired = []
+        for condition in self._conditions:
+            if condition in (trigger.condition for trigger in self.triggers):
+                continue
+            trigger = condition.check(block)
+            if trigger is not None:
+                fired.append(trigger)
+
+        fired.sort(key=lambda trigger: trigger.time)
+        for trigger in fired:
+            self.triggers.append(trigger)
+            if self._on_trigger is not None:
+                self._on_trigger(trigger)
+
+        if fired  and  self._stop is not None  and  not self.stopped:
+            self.stopped = True
+            self._stop()
+
+        return fired
+
+    def watch(self, tail, idle_timeout=None):
+
+        """Feed every block from a TailOutFile until a condition stops
+        the run, or the output stops growing.  Returns the triggers."""
+
+        stop = (lambda: self.stopped) if self._stop is not None else None
+        for block in tail.blocks(idle_timeout=idle_timeout, stop=stop):
+            self.feed(block)
+            if self.stopped:
+                break
+
+        return self.triggers
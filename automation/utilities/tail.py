@@ -0,0 +1,314 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#  Power Systems Computer Aided Design (PSCAD)
+# ------------------------------------------------------------------------------
+#  PSCAD is a powerful graphical user interface that integrates seamlessly
+#  with EMTDC, a general purpose time domain program for simulating power
+#  system transients and controls in power quality studies, power electronics
+#  design, distributed generation, and transmission planning.
+#
+#  This Python script is a utility class that can be used by end users
+#
+#
+#     PSCAD Support Team <support@pscad.com>
+#     Manitoba HVDC Research Centre Inc.
+#     Winnipeg, Manitoba. CANADA
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Import dependancies
+import ctypes, ctypes.util, os, select, sys, time
+
+from .file import OutFile
+
+#---------------------------------------------------------------------
+# Directory watchers
+#
+# A watcher's wait(timeout) returns when something in the watched
+# directory may have changed, or when the timeout expires.
+#---------------------------------------------------------------------
+
+class PollingWatcher:
+
+    """Watcher which simply waits for a fixed interval"""
+
+    def __init__(self, directory, interval=0.1):
+        self._interval = interval
+
+    def wait(self, timeout=None):
+        """Wait for the polling interval (or the timeout, if shorter)"""
+
+        delay = self._interval
+        if timeout is not None:
+            delay = min(delay, max(timeout, 0))
+        time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+
+    """Watcher using Linux inotify, through ctypes"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0x00000800
+    IN_CLOEXEC = 0x00080000
+
+    def __init__(self, directory, interval=None):
+
+        libc_name = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO |
+                self.IN_CREATE)
+        path = os.fsencode(directory or '.')
+        if libc.inotify_add_watch(self._fd, path, mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, "inotify_add_watch failed")
+
+    def wait(self, timeout=None):
+        """Wait until a file in the directory changes"""
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            # Drain the pending events; which file changed does not matter
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def watcher_for(directory, kind='auto', interval=0.1):
+
+    """Create a watcher for the directory.  kind is 'auto', 'inotify' or
+    'poll'; 'auto' uses inotify where available"""
+
+    if kind == 'poll':
+        return PollingWatcher(directory, interval)
+
+    if kind in ('auto', 'inotify')  and  sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            if kind == 'inotify':
+                raise
+
+    elif kind == 'inotify':
+        raise OSError("inotify is only available on Linux")
+
+    return PollingWatcher(directory, interval)
+
+#---------------------------------------------------------------------
+# Growing file
+#
+# Reads whatever has been appended to one _##.out file, keeping any
+# partial last line until the rest of it has been written.
+#---------------------------------------------------------------------
+
+class _GrowingFile:
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+        self._partial = b''
+        self.rows = []
+
+    def read(self):
+        """Parse any newly completed lines; returns True if data arrived"""
+
+        if self._file is None:
+            try:
+                self._file = open(self.filename, 'rb')
+            except FileNotFoundError:
+                return False
+
+        data = self._file.read()
+        if not data:
+            return False
+
+        data = self._partial + data
+        end = data.rfind(b'\n') + 1
+        self._partial = data[end:]
+
+        for line in data[:end].splitlines():
+            try:
+                row = [float(value) for value in line.split()]
+            except ValueError:
+                continue            # Not a row of data (eg, a header line)
+            if row:
+                self.rows.append(row)
+
+        return True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+#---------------------------------------------------------------------
+# TailOutFile class
+#---------------------------------------------------------------------
+
+class TailOutFile:
+
+    """Follow PSCAD output files while EMTDC is still writing them"""
+
+    #---------------------------------------------------------------------
+    # Constructor
+    #---------------------------------------------------------------------
+
+    def __init__(self, basename, num_files=None, watcher='auto',
+                 interval=0.1):
+
+        """Construct an object which follows a set of growing PSCAD output
+        files (<basename>_##.out).
+
+        The channel names are read from <basename>.inf, which must exist,
+        unless the number of _##.out files is given.  watcher is 'auto',
+        'inotify', or 'poll'; interval is the polling interval in seconds.
+
+        eg)
+            with TailOutFile("vdiv") as tail:
+                for block in tail.blocks(idle_timeout=5):
+                    for row in block:
+                        time, ch1, ch2 = row[0], row[1], row[2]
+        """
+
+        self._basename = basename
+        self._out = None
+
+        if num_files is None:
+            self._out = OutFile(basename)
+            num_files = (len(self._out._column_names) + 8) // 10
+
+        filename_fmt = basename + "_{:02d}.out"
+        self._files = [_GrowingFile(filename_fmt.format(i+1))
+                       for i in range(num_files)]
+
+        self._watcher = watcher_for(os.path.dirname(basename), watcher,
+                                    interval)
+        self._last_growth = time.monotonic()
+
+    #---------------------------------------------------------------------
+    # Enter/Exit
+    #---------------------------------------------------------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+
+        """Close the output files, and stop watching the directory"""
+
+        for file in self._files:
+            file.close()
+        self._watcher.close()
+
+    #---------------------------------------------------------------------
+    # Column name to number
+    #---------------------------------------------------------------------
+
+    def column(self, name):
+
+        """Turn a column name into a number"""
+
+        if self._out is None:
+            raise KeyError("Channel names unknown; no .inf file was read")
+        return self._out.column(name)
+
+    #---------------------------------------------------------------------
+    # read_block
+    #
+    # Return the rows which are complete in every file.  Each row holds
+    # the time value once, followed by the channels of every file.
+    #---------------------------------------------------------------------
+
+    def read_block(self):
+
+        """Return the newly completed rows (possibly none), without
+        waiting"""
+
+        grew = [file.read() for file in self._files]
+        if any(grew):
+            self._last_growth = time.monotonic()
+
+        count = min(len(file.rows) for file in self._files)
+        if count == 0:
+            return []
+
+        first = self._files[0]
+        block = first.rows[:count]
+        del first.rows[:count]
+        for file in self._files[1:]:
+            for row, more in zip(block, file.rows):
+                row.extend(more[1:])
+            del file.rows[:count]
+
+        return block
+
+    #---------------------------------------------------------------------
+    # blocks
+    #
+    # Yield blocks of rows as they are completed, until stopped.
+    #---------------------------------------------------------------------
+
+    def blocks(self, idle_timeout=None, stop=None):
+
+        """Yield each block of newly completed rows.
+
+        Iteration ends when stop() returns True, or when the files have
+        not grown for idle_timeout seconds.  Any rows already complete
+        at that point are yielded first.
+        """
+
+        self._last_growth = time.monotonic()
+
+        while True:
+            block = self.read_block()
+            if block:
+                yield block
+                continue
+
+            if stop is not None  and  stop():
+                block = self.read_block()
+                if block:
+                    yield block
+                return
+
+            timeout = None
+            if idle_timeout is not None:
+                timeout = self._last_growth + idle_timeout - time.monotonic()
+                if timeout <= 0:
+                    return
+            if stop is not None:
+                timeout = 0.5 if timeout is None else min(timeout, 0.5)
+
+            self._watcher.wait(timeout)
+
+    #---------------------------------------------------------------------
+    # Iterator
+    #---------------------------------------------------------------------
+
+    def __iter__(self):
+
+        """Iterate over rows until the files stop growing for 5 seconds"""
+
+        for block in self.blocks(idle_timeout=5):
+            yield from block
@@ -65,6 +65,8 @@ class Wire(ComponentCommand):
     To construct a new wire, use `UserCanvas.add_wire()`.
     """
 
+    __slots__ = ()
+
     def __init__(self, canvas, scope_name, iid):
 
         """Construct a command component for a Wire, identified by an id"""
@@ -90,6 +92,10 @@ class Wire(ComponentCommand):
         cmd = self.command("list-vertices")
         resp = cmd.execute()
 
+        return self._vertices_of(resp)
+
+    @staticmethod
+    def _vertices_of(resp):
         vertices = []
         for point in resp.findall("points/point"):
             x = int(point.get('x'))
@@ -104,18 +110,44 @@ class Wire(ComponentCommand):
 
     def _set_vertices(self, vertices):
 
+        resp = self._vertices_command(vertices).execute()
+        return resp
+
+    def _vertices_command(self, vertices):
+
         if len(vertices) < 2:
             raise ValueError("Wires need at least 2 vertices")
 
         cmd = self.command("set-vertices")
 
         for vertex in vertices:
-            point = cmd.tag('point')
-            point.set('x', str(vertex[0]))
-            point.set('y', str(vertex[1]))
+            cmd.add_tag('point', x=str(vertex[0]), y=str(vertex[1]))
 
-        resp = cmd.execute()
-        return resp
+        return cmd
+
+    def _same_path(self, vertices, others):
+        """Do two vertex lists describe the same wire?"""
+
+        return self._path(vertices) == self._path(others)
+
+    def _path(self, vertices):
+        """The vertices, without repeated points or points in the middle of
+        a straight segment"""
+
+        path = []
+        for vertex in vertices:
+            vertex = (vertex[0], vertex[1])
+            if path  and  vertex == path[-1]:
+                continue
+            if len(path) >= 2:
+                (x1, y1), (x2, y2) = path[-2], path[-1]
+                dx1, dy1 = x2 - x1, y2 - y1
+                dx2, dy2 = vertex[0] - x2, vertex[1] - y2
+                if dx1 * dy2 == dy1 * dx2  and  dx1 * dx2 + dy1 * dy2 > 0:
+                    path[-1] = vertex
+                    continue
+            path.append(vertex)
+        return path
 
 
     #===========================================================================
@@ -142,6 +174,8 @@ class WireOrthogonal(Wire):
     Diagonal segments are not allowed.
     """
 
+    __slots__ = ()
+
     def __init__(self, canvas, iid):
 
         """Construct a cmd component for a WireOrthogonal, identified by id"""
@@ -149,7 +183,17 @@ class WireOrthogonal(Wire):
         super().__init__(canvas, "WireOrthogonal", iid)
 
 
-    def _set_vertices(self, vertices):
+    def _vertices_command(self, vertices):
+
+        return super()._vertices_command(self._elbows(vertices))
+
+    def _path(self, vertices):
+
+        return super()._path(self._elbows(vertices))
+
+    @staticmethod
+    def _elbows(vertices):
+        """The vertices, with elbows added to any diagonal segments"""
 
         new_vertices = []
 
@@ -160,7 +204,7 @@ class WireOrthogonal(Wire):
             new_vertices.append(curr)
             prev = curr
 
-        super()._set_vertices(new_vertices)
+        return new_vertices
 
     def get_parameters(self, scenario=None):
 
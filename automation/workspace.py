@@ -75,6 +75,8 @@ class Workspace(CommandScope):
         workspace = pscad.workspace()
     """
 
+    __slots__ = ()
+
     def __init__(self, pscad):
 
         super().__init__(pscad, "Workspace")
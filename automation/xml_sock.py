@@ -11,7 +11,7 @@
 # Imports
 #===============================================================================
 
-import logging, socket
+import logging, re, socket
 import xml.etree.ElementTree as ET
 
 
@@ -22,6 +22,181 @@ import xml.etree.ElementTree as ET
 LOG = logging.getLogger(__name__)
 
 
+#===============================================================================
+# XML Message
+#===============================================================================
+
+# attr="value" or attr='value'
+_ATTRIB = re.compile(r'([^\s=]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_AWKWARD = re.compile(r'[&\t\n\r]')
+# An <event> child, at the start of the text following the opening tag
+_EVENT = re.compile(r'\s*<event[\s/>]')
+
+
+class XmlMessage:
+
+    """
+    A message received from PSCAD.
+
+    Only the opening tag is decoded up front, which is enough to route the
+    message (`sequence-id`) and check its outcome (`success`).  The full
+    ElementTree is parsed the first time the body of the message is walked,
+    with :meth:`find`, :meth:`findall`, :meth:`iter`, and so on.
+    """
+
+    __slots__ = ('_text', '_tag', '_attrib', '_node')
+
+    def __init__(self, text):
+        self._text = text
+        self._tag = None
+        self._attrib = None
+        self._node = None
+
+    #---------------------------------------------------------------------------
+    # Opening tag
+    #---------------------------------------------------------------------------
+
+    def _decode_start_tag(self):
+        text = self._text
+        end = text.find('>')
+        tag, *attrs = text[1:end].split(None, 1) or ('',)
+        attrs = attrs[0] if attrs else ''
+
+        # Entity references, attribute-value whitespace normalization and
+        # anything unusual (such as quotes or '>' inside attribute values)
+        # are left to the real XML parser.
+        if end < 0  or  attrs.count('"') % 2  or  attrs.count("'") % 2  or \
+           _AWKWARD.search(attrs):
+            node = self.element()
+            self._tag = node.tag
+            self._attrib = node.attrib
+        else:
+            self._tag = tag.rstrip('/')
+            self._attrib = {key: dq or sq
+                            for key, dq, sq in _ATTRIB.findall(attrs)}
+
+    @property
+    def tag(self):
+        """The message's tag name"""
+
+        if self._tag is None:
+            self._decode_start_tag()
+        return self._tag
+
+    @property
+    def attrib(self):
+        """The message's attributes"""
+
+        if self._attrib is None:
+            self._decode_start_tag()
+        return self._attrib
+
+    def get(self, key, default=None):
+        """Retrieve an attribute of the message"""
+
+        return self.attrib.get(key, default)
+
+    def keys(self):
+        return self.attrib.keys()
+
+    #---------------------------------------------------------------------------
+    # Event type
+    #---------------------------------------------------------------------------
+
+    def event_type(self):
+        """
+        The `type` of the <event/> carried by this message, or `None` if the
+        message is not an event.
+
+        PSCAD sends each event as the first child of its message, so only the
+        opening <event> tag needs to be decoded.
+        """
+
+        if self._node is not None:
+            event = self._node.find('event')
+            return event.get('type') if event is not None else None
+
+        text = self._text
+        end = text.find('>')
+        if end < 0  or  text[end-1] == '/':
+            return None
+
+        if _EVENT.match(text, end + 1) is None:
+            # Not the first child; let the real XML parser look for it
+            if _EVENT.search(text, end + 1) is None:
+                return None
+            event = self.element().find('event')
+            return event.get('type') if event is not None else None
+
+        start = text.index('<event', end + 1)
+        event = XmlMessage(text[start:text.find('>', start) + 1])
+        return event.get('type')
+
+    def items(self):
+        return self.attrib.items()
+
+    #---------------------------------------------------------------------------
+    # Body
+    #---------------------------------------------------------------------------
+
+    def element(self):
+        """The message, parsed as an ElementTree node"""
+
+        if self._node is None:
+            self._node = ET.fromstring(self._text)
+        return self._node
+
+    @property
+    def text(self):
+        return self.element().text
+
+    @property
+    def tail(self):
+        return self.element().tail
+
+    def find(self, path, namespaces=None):
+        return self.element().find(path, namespaces)
+
+    def findall(self, path, namespaces=None):
+        return self.element().findall(path, namespaces)
+
+    def findtext(self, path, default=None, namespaces=None):
+        return self.element().findtext(path, default, namespaces)
+
+    def iterfind(self, path, namespaces=None):
+        return self.element().iterfind(path, namespaces)
+
+    def iter(self, tag=None):
+        return self.element().iter(tag)
+
+    def itertext(self):
+        return self.element().itertext()
+
+    def __iter__(self):
+        return iter(self.element())
+
+    def __len__(self):
+        return len(self.element())
+
+    def __getitem__(self, index):
+        return self.element()[index]
+
+    # A message is always "something", regardless of how many children the
+    # parsed tree would have; testing it must not force a parse.
+    def __bool__(self):
+        return True
+
+    #---------------------------------------------------------------------------
+    # Debugging
+    #---------------------------------------------------------------------------
+
+    def __str__(self):
+        return self._text
+
+    def __repr__(self):
+        return "XmlMessage({!r})".format(self._text)
+
+
 #===============================================================================
 # XML Socket
 #===============================================================================
@@ -45,6 +220,8 @@ class XmlSocket:
         self._end_tag = None
         self._rx = self._read_xml(sock, 1024, encoding)
         self._logger = None
+        self._msg_logger = None
+        self._raw_logger = None
         self._timeouts = 0
 
     #---------------------------------------------------------------------------
@@ -52,6 +229,13 @@ class XmlSocket:
     #---------------------------------------------------------------------------
 
     def logger(self, logger):
+        # A raw logger sees the bytes on the wire, instead of each message
+        if logger is not None  and  getattr(logger, 'raw', False):
+            self._raw_logger = logger
+            self._msg_logger = None
+        else:
+            self._raw_logger = None
+            self._msg_logger = logger
         self._logger = logger
 
 
@@ -89,6 +273,8 @@ class XmlSocket:
 
     def send_raw(self, msg_text):
         if self.tx_open():
+            if self._raw_logger:
+                self._raw_logger.tx_raw(msg_text)
             try:
                 self._sock.sendall(msg_text)
             except ConnectionResetError:
@@ -99,10 +285,19 @@ class XmlSocket:
     def send(self, msg):
         if self.tx_open():
             self._timeouts = 0
-            if self._logger:
-                self._logger.tx_log(msg)
+            if self._msg_logger:
+                self._msg_logger.tx_log(msg)
             self.send_raw(ET.tostring(msg))
 
+    def send_bytes(self, msg_bytes):
+        """Send an already serialised XML message"""
+
+        if self.tx_open():
+            self._timeouts = 0
+            if self._msg_logger:
+                self._msg_logger.tx_log(ET.fromstring(msg_bytes))
+            self.send_raw(msg_bytes)
+
     def tx_close(self):
         if self._tx_open  and  self._sock is not None:
             if self._logger:
@@ -147,8 +342,8 @@ class XmlSocket:
                     self._timeouts += 1
                     if self._timeouts >= 30:
                         self._send_heartbeat()
-                elif self._logger:
-                    self._logger.rx_log(xml)
+                elif self._msg_logger:
+                    self._msg_logger.rx_log(xml.element())
             except StopIteration:
                 self._rx = None
                 self.rx_closed()
@@ -195,6 +390,9 @@ class XmlSocket:
 
                 # Did we receive any data?
                 if data:
+                    if self._raw_logger:
+                        self._raw_logger.rx_raw(data)
+
                     # Yes.  Accumulate most recently received data into buffer
                     self._rxbuf += data.decode(encoding)
 
@@ -266,9 +464,9 @@ class XmlSocket:
 
         # Do we have a complete XML fragment? <tag>...</tag>  or <tag.../>
         if resp_len > 0:
-            # Yes!  Split the buffer at the end of the fragment,
-            # and parse the first part as an XML string
-            xml = ET.fromstring(rxbuf[:resp_len])
+            # Yes!  Split the buffer at the end of the fragment; the first
+            # part is only parsed as XML when it is actually examined.
+            xml = XmlMessage(rxbuf[:resp_len])
 
             # Remove first part from buffer.
             self._rxbuf = rxbuf[resp_len:]
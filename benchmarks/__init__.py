@@ -0,0 +1,19 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmarks
+#===============================================================================
+
+"""
+Client-side benchmarks for the automation library.
+
+Each benchmark module may be run directly, and prints its results as JSON::
+
+    python -m benchmarks.bench_proxies
+
+The whole suite is run with ``python -m benchmarks``, which produces a
+single JSON document and can compare it with the results of an earlier
+release.  Benchmarks which need PSCAD talk to a
+:class:`~benchmarks.peer.SimulatedPeer` over a local socket, so the suite
+runs on any platform.
+"""
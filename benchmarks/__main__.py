@@ -0,0 +1,164 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmarks: run the suite
+#===============================================================================
+
+"""
+Run all (or the named) benchmarks, and print the results as one JSON
+document::
+
+    python -m benchmarks --output results-1.2.4.json
+    python -m benchmarks roundtrip find_all --baseline results-1.2.3.json
+
+With a baseline, every measurement which got worse by more than the
+tolerance is listed on stderr, and the exit status is 1.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import argparse, json, platform, sys, time
+
+# Automation imports
+import automation
+from benchmarks import (bench_certificate, bench_commands, bench_dispatch,
+                        bench_find_all, bench_large_reply, bench_outfile,
+                        bench_proxies, bench_recorder, bench_replies,
+                        bench_roundtrip)
+
+
+#===============================================================================
+# Suite
+#===============================================================================
+
+BENCHMARKS = {
+    'command_serialise': bench_commands.bench_command_serialise,
+    'reply_routing': bench_replies.bench_reply_routing,
+    'dispatch': bench_dispatch.bench_dispatch,
+    'proxy_memory': bench_proxies.bench_proxy_memory,
+    'recorder': bench_recorder.bench_recorder,
+    'roundtrip': bench_roundtrip.bench_roundtrip,
+    'large_reply': bench_large_reply.bench_large_reply,
+    'find_all': bench_find_all.bench_find_all,
+    'outfile': bench_outfile.bench_outfile,
+    'certificate': bench_certificate.bench_certificate,
+    }
+
+
+def run(names=None):
+
+    """Run the benchmarks, returning the JSON-able results document"""
+
+    results = []
+    for name in names or BENCHMARKS:
+        start = time.perf_counter()
+        result = BENCHMARKS[name]()
+        result['seconds'] = time.perf_counter() - start
+        results.append(result)
+
+    return {
+        'version': automation.VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+        }
+
+
+#===============================================================================
+# Baseline comparison
+#===============================================================================
+
+def _measurements(result, prefix=''):
+
+    """Flatten a result into {path: value}; list entries are keyed by their
+    first (size) field"""
+
+    flat = {}
+    for key, value in result.items():
+        if key in ('name', 'seconds'):
+            continue
+        if isinstance(value, list):
+            for case in value:
+                size_key = next(iter(case))
+                label = '{}{}[{}={}].'.format(prefix, key, size_key,
+                                              case[size_key])
+                flat.update(_measurements(case, label))
+        elif isinstance(value, (int, float)):
+            flat[prefix + key] = value
+    return flat
+
+
+def _higher_is_better(key):
+    return key.endswith('_per_s')
+
+
+def compare(document, baseline, tolerance=0.10):
+
+    """Measurements which are worse than the baseline by more than the
+    tolerance, as (benchmark, measurement, baseline, current) tuples"""
+
+    before = {result['name']: _measurements(result)
+              for result in baseline['results']}
+    worse = []
+    for result in document['results']:
+        old = before.get(result['name'], {})
+        for key, value in _measurements(result).items():
+            if key not in old  or  not old[key]:
+                continue
+            ratio = value / old[key]
+            if _higher_is_better(key):
+                ratio = 1 / ratio if ratio else float('inf')
+            if key.endswith(('_per_s', '_ms', '_us', '_per_proxy',
+                             '_per_component')) and ratio > 1 + tolerance:
+                worse.append((result['name'], key, old[key], value))
+    return worse
+
+
+#===============================================================================
+# Command line
+#===============================================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run the automation client benchmarks")
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help="benchmarks to run (default: all): " +
+                        ", ".join(BENCHMARKS))
+    parser.add_argument('--output', help="write the results to this file")
+    parser.add_argument('--baseline', help="results of an earlier run")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="allowed slow-down relative to the baseline")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmark: " + ", ".join(unknown))
+
+    document = run(args.names)
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        worse = compare(document, baseline, args.tolerance)
+        for name, key, old, new in worse:
+            print("{}: {}: {:.6g} -> {:.6g}".format(name, key, old, new),
+                  file=sys.stderr)
+        return 1 if worse else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: licence certificate parsing
+#===============================================================================
+
+"""
+Measure :meth:`.Certificate.parse` on licence lists with many certificate
+groups, each with a full set of features.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time
+import xml.etree.ElementTree as ET
+
+# Automation imports
+from automation.certificate import Certificate
+
+
+#===============================================================================
+# Synthetic certificate list
+#===============================================================================
+
+SIZES = (10, 100, 500)
+
+
+def certificates_xml(groups, features=16):
+
+    """A reply containing a <NewDataSet> of `groups` licence groups"""
+
+    parts = ['<response><NewDataSet>']
+    for group in range(groups):
+        parts.append(
+            '<LicenseGroups><RowID>{0}</RowID><AccountID>13198</AccountID>'
+            '<AccountName>Account</AccountName><FeatureSetID>2</FeatureSetID>'
+            '<ProductID>13</ProductID><ProductName>PSCAD PRO {0}</ProductName>'
+            '<Count>1</Count><Owned>2</Owned><Notes /></LicenseGroups>'
+            .format(1000 + group))
+    for group in range(groups):
+        for feature in range(features):
+            parts.append(
+                '<Features><RowID>{}</RowID><FeatureID>{}</FeatureID>'
+                '<FeatureName>Feature {}</FeatureName><Owned>1</Owned>'
+                '<FeatureValue>16</FeatureValue><Notes /></Features>'
+                .format(1000 + group, feature, feature))
+    parts.append('</NewDataSet></response>')
+    return ET.fromstring(''.join(parts))
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+def bench_certificate(sizes=SIZES, repeat=3):
+
+    """Time to parse certificate lists of several sizes"""
+
+    cases = []
+    for groups in sizes:
+        msg = certificates_xml(groups)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            certificates = Certificate.parse(msg)
+        elapsed = (time.perf_counter() - start) / repeat
+        assert len(certificates) == groups
+
+        cases.append({
+            'groups': groups,
+            'parse_ms': elapsed * 1e3,
+            })
+
+    return {
+        'name': 'certificate',
+        'cases': cases,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(json.dumps(bench_certificate(sizes), indent=2))
+
+
+if __name__ == '__main__':
+    main()
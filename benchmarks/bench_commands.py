@@ -0,0 +1,74 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: command construction & serialisation
+#===============================================================================
+
+"""
+Measure the client CPU cost of building and serialising the hot commands
+(`set-parameters`, `get-location`, `set-location`) for a component.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time
+
+# Automation imports
+from automation.command import CmdProcessor
+from automation.project import ProjectCommands
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+def _rate(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def bench_command_serialise(count=20000):
+
+    """Commands built & serialised per second"""
+
+    processor = CmdProcessor()
+    canvas = ProjectCommands(processor, 'prj').user_canvas('Main')
+    cmp = canvas.user_cmp(123456789)
+
+    def set_parameters():
+        cmd = cmp.command('set-parameters')
+        for key, value in (('R', '1.0 [ohm]'), ('L', '0.1 [H]'),
+                           ('C', '10 [uF]'), ('Enab', 'true')):
+            cmd.add_param(key, value)
+        return cmd.tostring()
+
+    def get_location():
+        return cmp.command('get-location').tostring()
+
+    def set_location():
+        cmd = cmp.command('set-location')
+        cmd.add_tag('location', x='180', y='360')
+        return cmd.tostring()
+
+    return {
+        'name': 'command_serialise',
+        'set_parameters_per_s': _rate(set_parameters, count),
+        'get_location_per_s': _rate(get_location, count),
+        'set_location_per_s': _rate(set_location, count),
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 20000
+    print(json.dumps(bench_command_serialise(count), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: message dispatch
+#===============================================================================
+
+"""
+Measure the cost of dispatching incoming messages while many
+:meth:`.CmdProcessor.post_command` callbacks and event handlers are
+registered.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time
+
+# Automation imports
+from automation.command import CmdProcessor
+from automation.handler import BuildEvent
+from automation.xml_sock import XmlMessage
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+class _NullSocket:
+
+    def send_bytes(self, _msg_bytes):
+        pass
+
+
+def bench_dispatch(in_flight=1000):
+
+    """Messages dispatched per second, with `in_flight` posted commands"""
+
+    processor = CmdProcessor()
+    processor._sock = _NullSocket()         # pylint: disable=protected-access
+    processor.add_handler(BuildEvent())
+
+    replies = []
+    for _ in range(in_flight):
+        cmd = processor.command('get-run-status', 'Project')
+        processor.post_command(cmd, replies.append)
+
+    messages = [XmlMessage('<commandresponse sequence-id="{}" success="true"'
+                           ' />'.format(seq + 1)) for seq in range(in_flight)]
+    events = [XmlMessage('<message elapsed="1"><event type="LoadEvent">'
+                         '<type file-type="files" status="BEGIN" /></event>'
+                         '</message>') for _ in range(in_flight)]
+
+    start = time.perf_counter()
+    for msg in events:
+        processor._dispatch(msg)            # pylint: disable=protected-access
+    for msg in reversed(messages):
+        processor._dispatch(msg)            # pylint: disable=protected-access
+    elapsed = time.perf_counter() - start
+
+    assert len(replies) == in_flight
+
+    return {
+        'name': 'dispatch',
+        'in_flight': in_flight,
+        'messages_per_s': 2 * in_flight / elapsed,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    in_flight = int(argv[0]) if argv else 1000
+    print(json.dumps(bench_dispatch(in_flight), indent=2))
+
+
+if __name__ == '__main__':
+    main()
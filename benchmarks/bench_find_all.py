@@ -0,0 +1,100 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: canvas searches
+#===============================================================================
+
+"""
+Measure :meth:`.UserCanvas.find_all` on synthetic canvases, served by a
+simulated PSCAD peer, including the time to receive and parse the
+`list-components` reply.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time
+
+# Automation imports
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Synthetic canvas
+#===============================================================================
+
+SIZES = (1000, 10000)
+
+
+def canvas_xml(count):
+
+    """A `list-components` reply body, with a mix of component types in
+    roughly the proportions of a real canvas"""
+
+    nodes = []
+    for iid in range(1, count + 1):
+        x, y = iid % 100 * 36, iid // 100 * 36
+        kind = iid % 10
+        if kind < 6:
+            nodes.append('<User classid="UserCmp" id="{}" name="master:'
+                         'resistor" x="{}" y="{}" />'.format(iid, x, y))
+        elif kind < 8:
+            nodes.append('<Wire classid="WireOrthogonal" id="{}" x="{}" '
+                         'y="{}" />'.format(iid, x, y))
+        elif kind == 8:
+            nodes.append('<Wire classid="Bus" id="{}" name="Bus{}" x="{}" '
+                         'y="{}" />'.format(iid, iid, x, y))
+        else:
+            nodes.append('<Frame classid="GraphFrame" id="{}" x="{}" y="{}"'
+                         ' />'.format(iid, x, y))
+    return '<components>' + ''.join(nodes) + '</components>'
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+def bench_find_all(sizes=SIZES, repeat=3):
+
+    """Time to find all components, and all buses, on each canvas size"""
+
+    cases = []
+    for count in sizes:
+        with SimulatedPeer({'list-components': canvas_xml(count)}) as peer:
+            pscad = peer.client()
+            canvas = pscad.project('prj').user_canvas('Main')
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                found = canvas.find_all()
+            everything = (time.perf_counter() - start) / repeat
+            assert len(found) == count
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                canvas.find_all('Bus')
+            buses = (time.perf_counter() - start) / repeat
+
+        cases.append({
+            'components': count,
+            'find_all_ms': everything * 1e3,
+            'find_all_bus_ms': buses * 1e3,
+            'us_per_component': everything * 1e6 / count,
+            })
+
+    return {
+        'name': 'find_all',
+        'cases': cases,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(json.dumps(bench_find_all(sizes), indent=2))
+
+
+if __name__ == '__main__':
+    main()
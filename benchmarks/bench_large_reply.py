@@ -0,0 +1,83 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: large replies
+#===============================================================================
+
+"""
+Measure the time taken to receive large replies from a simulated PSCAD
+peer, splitting them out of the socket stream in :class:`.XmlSocket`, and
+then to parse them into an ElementTree.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time
+
+# Automation imports
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+_ITEM = '<param name="P{0}" value="{0}.0 [kV]" />'
+
+SIZES = (10000, 100000, 1000000)
+
+
+def _body(size):
+    items = []
+    length = 0
+    while length < size:
+        items.append(_ITEM.format(len(items)))
+        length += len(items[-1])
+    return '<paramlist>' + ''.join(items) + '</paramlist>'
+
+
+def bench_large_reply(sizes=SIZES, repeat=3):
+
+    """Receive & parse time of replies of various sizes"""
+
+    cases = []
+    with SimulatedPeer() as peer:
+        pscad = peer.client()
+
+        for size in sizes:
+            peer.reply('list-parameters', _body(size))
+            received = parsed = 0.0
+            for _ in range(repeat):
+                cmd = pscad.command('list-parameters')
+                start = time.perf_counter()
+                msg = cmd.execute()
+                middle = time.perf_counter()
+                msg.element()
+                end = time.perf_counter()
+                received += middle - start
+                parsed += end - middle
+
+            cases.append({
+                'bytes': len(str(msg)),
+                'receive_ms': received * 1e3 / repeat,
+                'parse_ms': parsed * 1e3 / repeat,
+                'receive_mb_per_s': len(str(msg)) * repeat / received / 1e6,
+                })
+
+    return {
+        'name': 'large_reply',
+        'cases': cases,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(json.dumps(bench_large_reply(sizes), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: output file parsing
+#===============================================================================
+
+"""
+Measure reading PSCAD output files (`<basename>.inf`, `<basename>_##.out`)
+with :class:`~automation.utilities.file.OutFile`, for synthetic runs of
+several sizes.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, os, sys, tempfile, time
+
+# Automation imports
+from automation.utilities.file import OutFile
+
+
+#===============================================================================
+# Synthetic output files
+#===============================================================================
+
+SIZES = (1000, 10000, 100000)
+
+
+def write_outfile(basename, rows, channels=25):
+
+    """Write an output file set, with `channels` channels, 10 per file"""
+
+    with open(basename + ".inf", "w") as inf:
+        for channel in range(1, channels + 1):
+            inf.write('PGB({0}) Output Desc="Ch{0}" Group="Main" Max=1.0 '
+                      'Min=-1.0 Units=""\n'.format(channel))
+
+    for index, first in enumerate(range(1, channels + 1, 10)):
+        cols = range(first, min(first + 10, channels + 1))
+        with open("{}_{:02d}.out".format(basename, index + 1), "w") as out:
+            for row in range(rows):
+                out.write("  {:.6E}".format(row * 5e-5))
+                out.write("".join("  {:.6E}".format(row * 1e-3 + col)
+                                  for col in cols))
+                out.write("\n")
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+def bench_outfile(sizes=SIZES, channels=25):
+
+    """Rows read per second, for each number of rows"""
+
+    cases = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            basename = os.path.join(directory, "run{}".format(rows))
+            write_outfile(basename, rows, channels)
+
+            start = time.perf_counter()
+            with OutFile(basename) as out:
+                count = sum(1 for _ in out)
+            elapsed = time.perf_counter() - start
+            assert count == rows
+
+            cases.append({
+                'rows': rows,
+                'channels': channels,
+                'read_ms': elapsed * 1e3,
+                'rows_per_s': rows / elapsed,
+                })
+
+    return {
+        'name': 'outfile',
+        'cases': cases,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(arg) for arg in argv] or SIZES
+    print(json.dumps(bench_outfile(sizes), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: component proxy memory
+#===============================================================================
+
+"""
+Measure the memory held by the component controller proxies which
+:meth:`.UserCanvas.find_all` creates for every node on a canvas.
+
+No PSCAD connection is required; proxies only talk to PSCAD when a command
+is executed.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time, tracemalloc
+
+# Automation imports
+from automation.project import ProjectCommands
+from automation.wire import WireOrthogonal
+
+
+#===============================================================================
+# Proxy construction
+#===============================================================================
+
+def _make_proxies(canvas, count):
+
+    """Build a mix of proxies, in roughly the proportions of a real canvas"""
+
+    proxies = []
+    for iid in range(count):
+        kind = iid % 10
+        if kind < 6:
+            proxies.append(canvas.user_cmp(str(iid)))
+        elif kind < 8:
+            proxies.append(WireOrthogonal(canvas, str(iid)))
+        elif kind == 8:
+            proxies.append(canvas.bus(str(iid)))
+        else:
+            proxies.append(canvas.tline(str(iid), 'prj:tline'))
+    return proxies
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+def bench_proxy_memory(count=50000, pages=10):
+
+    """Bytes allocated per proxy, spread over a number of canvases"""
+
+    project = ProjectCommands(None, 'prj')
+    canvases = [project.user_canvas('Page{}'.format(page))
+                for page in range(pages)]
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    proxies = [_make_proxies(canvas, count // pages) for canvas in canvases]
+
+    elapsed = time.perf_counter() - start
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(len(page) for page in proxies)
+
+    return {
+        'name': 'proxy_memory',
+        'proxies': total,
+        'bytes_per_proxy': (after - before) / total,
+        'construct_us_per_proxy': elapsed * 1e6 / total,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 50000
+    print(json.dumps(bench_proxy_memory(count), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: Rx/Tx recording
+#===============================================================================
+
+"""
+Measure the cost the protocol recorder adds to each message on the
+connection thread, compared with an element-level logger which must
+re-serialise every message.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, os, sys, tempfile, time
+import xml.etree.ElementTree as ET
+
+# Automation imports
+from automation.recorder import RxTxRecorder, read_records
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+REPLY = ('<commandresponse elapsed="0" sequence-id="{}" success="true" '
+         'timestamp="2020-11-04-02-44-13-5619246">'
+         '<location x="180" y="360" /></commandresponse>')
+
+
+def bench_recorder(count=100000):
+
+    """Per-message cost of recording, in microseconds"""
+
+    messages = [REPLY.format(seq).encode() for seq in range(count)]
+
+    # Element logger: each message parsed, then re-serialised for the log
+    start = time.perf_counter()
+    for data in messages:
+        ET.tostring(ET.fromstring(data))
+    element_us = (time.perf_counter() - start) / count * 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = RxTxRecorder(os.path.join(tmp, 'bench'), max_bytes=1 << 20,
+                                backups=None)
+
+        start = time.perf_counter()
+        for data in messages:
+            recorder.rx_raw(data)
+        raw_us = (time.perf_counter() - start) / count * 1e6
+
+        recorder.close()
+        files = recorder.files()
+        records = sum(1 for path in files for _ in read_records(path))
+
+    return {
+        'name': 'rxtx_recorder',
+        'element_logger_us_per_msg': element_us,
+        'raw_recorder_us_per_msg': raw_us,
+        'load_at_10k_msg_per_s_pct': raw_us * 1e4 / 1e6 * 100,
+        'records_written': records,
+        'files': len(files),
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 100000
+    print(json.dumps(bench_recorder(count), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: reply decoding
+#===============================================================================
+
+"""
+Measure the cost of routing small replies (reading `sequence-id` and
+`success`), compared with parsing each one into a full ElementTree.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time
+import xml.etree.ElementTree as ET
+
+# Automation imports
+from automation.xml_sock import XmlMessage
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+REPLY = ('<commandresponse elapsed="0" sequence-id="{}" success="true" '
+         'timestamp="2020-11-04-02-44-13-5619246">'
+         '<location x="180" y="360" /></commandresponse>')
+
+
+def bench_reply_routing(count=50000):
+
+    """Small replies routed per second"""
+
+    replies = [REPLY.format(seq) for seq in range(count)]
+
+    start = time.perf_counter()
+    for text in replies:
+        msg = ET.fromstring(text)
+        msg.get('sequence-id'), msg.get('success')
+    parsed = count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in replies:
+        msg = XmlMessage(text)
+        msg.get('sequence-id'), msg.get('success')
+    lazy = count / (time.perf_counter() - start)
+
+    return {
+        'name': 'reply_routing',
+        'full_parse_per_s': parsed,
+        'lazy_decode_per_s': lazy,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 50000
+    print(json.dumps(bench_reply_routing(count), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmark: command round trips
+#===============================================================================
+
+"""
+Measure the rate at which commands make the round trip to a simulated
+PSCAD peer and back, one at a time with :meth:`.Command.execute`, and
+pipelined with :meth:`.CmdProcessor.execute_many`.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import json, sys, time
+
+# Automation imports
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Benchmark
+#===============================================================================
+
+def bench_roundtrip(count=5000):
+
+    """Commands executed per second"""
+
+    with SimulatedPeer() as peer:
+        pscad = peer.client()
+        canvas = pscad.project('prj').user_canvas('Main')
+        cmp = canvas.user_cmp(123456789)
+
+        start = time.perf_counter()
+        for _ in range(count):
+            cmp.command('get-location').execute()
+        sequential = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        pscad.execute_many(cmp.command('get-location') for _ in range(count))
+        pipelined = count / (time.perf_counter() - start)
+
+        latency = pscad.metrics()['commands']['get-location']
+
+    return {
+        'name': 'roundtrip',
+        'execute_per_s': sequential,
+        'execute_many_per_s': pipelined,
+        'p50_us': latency['p50'] * 1e6,
+        'p99_us': latency['p99'] * 1e6,
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 5000
+    print(json.dumps(bench_roundtrip(count), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Benchmarks: simulated PSCAD peer
+#===============================================================================
+
+"""
+A minimal stand-in for PSCAD, for benchmarking the client over a real
+socket on any platform.
+
+The peer listens on a local port, and answers every command with a
+`<commandresponse>` carrying the command's sequence-id.  The body of the
+reply to each command name may be set in advance; replies are encoded once,
+so the peer does as little work as possible per command.  Commands are
+framed by their opening tags alone, and never parsed.
+
+::
+
+    with SimulatedPeer({'list-components': body}) as peer:
+        pscad = peer.client()
+        ...
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import re, socket, threading
+
+# Automation imports
+from automation.launcher import AttachLauncher
+from automation.pscad import PSCAD
+
+
+#===============================================================================
+# Simulated Peer
+#===============================================================================
+
+_COMMAND = re.compile(rb'<command\b([^>]*)>')
+_ATTR = re.compile(rb'''([\w-]+)\s*=\s*["']([^"']*)["']''')
+
+
+class SimulatedPeer:
+
+    """
+    Answer commands from one client, in a background thread.
+
+    Parameters:
+        replies (dict): Reply body (str) by command name.  Other commands
+            get an empty, successful reply.
+    """
+
+    def __init__(self, replies=None):
+
+        self._replies = {}
+        self._empty = (b'<commandresponse sequence-id="', b'" success="true"'
+                       b' />')
+        for name, body in (replies or {}).items():
+            self.reply(name, body)
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(('localhost', 0))
+        self._listener.listen(1)
+        self.port = self._listener.getsockname()[1]
+
+        self.commands = 0
+        self._client = None
+        self._thread = threading.Thread(target=self._serve, daemon=True,
+                                        name="simulated-pscad")
+        self._thread.start()
+
+    def reply(self, name, body):
+        """Set the body of the reply to the named command"""
+
+        self._replies[name.encode()] = (
+            b'<commandresponse sequence-id="',
+            b'" success="true">' + body.encode() + b'</commandresponse>')
+
+    def client(self):
+        """Connect a :class:`.PSCAD` controller to this peer"""
+
+        self._client = PSCAD(None, {}, launcher=AttachLauncher(self.port))
+        return self._client
+
+    def _serve(self):
+
+        conn, _ = self._listener.accept()
+        self._listener.close()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        buffer = b''
+        try:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                buffer += data
+
+                # Keep any incomplete opening tag for the next read
+                out = []
+                end = 0
+                for match in _COMMAND.finditer(buffer):
+                    attrs = dict(_ATTR.findall(match.group(1)))
+                    head, tail = self._replies.get(attrs.get(b'name'),
+                                                   self._empty)
+                    out.append(head + attrs.get(b'sequence-id', b'0') + tail)
+                    end = match.end()
+                    self.commands += 1
+                start = buffer.rfind(b'<', end)
+                if start < 0  or  b'>' in buffer[start:]:
+                    buffer = b''
+                else:
+                    buffer = buffer[start:]
+
+                if out:
+                    conn.sendall(b''.join(out))
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def close(self):
+        """Disconnect the client, and stop the peer"""
+
+        if self._client is not None:
+            self._client.close_connection()
+            self._client = None
+        self._thread.join(5.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
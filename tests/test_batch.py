@@ -0,0 +1,74 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: command batching
+#===============================================================================
+
+"""
+Batched parameter writes, against a simulated PSCAD peer.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import unittest
+
+# Automation imports
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+class BatchDeltaWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.peer = SimulatedPeer()
+        self.pscad = self.peer.client()
+        self.pscad.enable_delta_writes()
+        canvas = self.pscad.project('prj').user_canvas('Main')
+        self.cmp = canvas.user_cmp(1)
+        self.key = self.cmp._shadow_key(None)       # pylint: disable=protected-access
+
+    def tearDown(self):
+        self.peer.close()
+
+    def known(self):
+        return self.pscad._shadow_entry(self.key)[0] # pylint: disable=protected-access
+
+    def test_write_back_to_known_value(self):
+        self.cmp.set_parameters(A=0)
+        self.assertEqual(self.known()['A'], '0')
+
+        with self.pscad.batch() as batch:
+            self.cmp.set_parameters(A=1)
+            self.cmp.set_parameters(A=0)
+
+        self.assertEqual(batch.sent, 1)
+        self.assertEqual(self.known()['A'], '0')
+
+    def test_write_back_across_other_commands(self):
+        self.cmp.set_parameters(A=0)
+
+        with self.pscad.batch() as batch:
+            self.cmp.set_parameters(A=1)
+            self.cmp.add_to_layer('Layer')
+            self.cmp.set_parameters(A=0)
+
+        self.assertEqual(batch.sent, 3)
+        self.assertEqual(self.known()['A'], '0')
+
+    def test_unchanged_value_is_dropped(self):
+        self.cmp.set_parameters(A=0)
+
+        with self.pscad.batch() as batch:
+            self.cmp.set_parameters(A=0)
+
+        self.assertEqual(batch.sent, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
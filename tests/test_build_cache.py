@@ -0,0 +1,106 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: build cache
+#===============================================================================
+
+"""
+A build cache, in front of a stand-in project which writes its build output.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import os, shutil, tempfile, unittest
+
+# Automation imports
+from automation.build_cache import BuildCache
+
+
+#===============================================================================
+# Stand-in project
+#===============================================================================
+
+class FakeProject:
+
+    """A project whose build writes its (saved or unsaved) source out"""
+
+    name = 'vdiv'
+
+    def __init__(self, project_file, build_dir):
+        self.project_file = project_file
+        self.build_dir = build_dir
+        self.unsaved = None
+        self.builds = 0
+
+    def is_dirty(self):
+        return self.unsaved is not None
+
+    def parameters(self):
+        return {'time_duration': '0.5'}
+
+    def build(self):
+        self.builds += 1
+        if self.unsaved is not None:
+            source = self.unsaved
+        else:
+            with open(self.project_file) as file:
+                source = file.read()
+        os.makedirs(self.build_dir, exist_ok=True)
+        with open(os.path.join(self.build_dir, 'vdiv.exe'), 'w') as file:
+            file.write(source)
+
+    def messages(self):
+        return []
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+class BuildCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.project_file = os.path.join(self.tmp, 'vdiv.pscx')
+        self.build_dir = os.path.join(self.tmp, 'vdiv.gf46')
+        self.cache = BuildCache(os.path.join(self.tmp, 'cache'))
+        self.project = FakeProject(self.project_file, self.build_dir)
+        with open(self.project_file, 'w') as file:
+            file.write('saved')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def build(self):
+        return self.cache.build(self.project, self.project_file,
+                                self.build_dir)
+
+    def artefact(self):
+        with open(os.path.join(self.build_dir, 'vdiv.exe')) as file:
+            return file.read()
+
+    def test_second_build_is_current(self):
+        self.assertEqual(self.build(), BuildCache.BUILT)
+        self.assertEqual(self.build(), BuildCache.CURRENT)
+        self.assertEqual(self.project.builds, 1)
+
+    def test_dirty_build_is_not_current_afterwards(self):
+        self.assertEqual(self.build(), BuildCache.BUILT)
+
+        # Unsaved edits are built, then reverted
+        self.project.unsaved = 'unsaved'
+        self.assertEqual(self.build(), BuildCache.BUILT)
+        self.assertEqual(self.artefact(), 'unsaved')
+        self.project.unsaved = None
+
+        self.assertEqual(self.build(), BuildCache.RESTORED)
+        self.assertEqual(self.artefact(), 'saved')
+        self.assertEqual(self.build(), BuildCache.CURRENT)
+        self.assertEqual(self.project.builds, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: event streams
+#===============================================================================
+
+"""
+Event streams following a build, against a simulated PSCAD peer.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import unittest
+
+# Automation imports
+from automation.events import EventStream
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Simulated build
+#===============================================================================
+
+def build_event(status, project='vdiv'):
+    """A build event message"""
+
+    return ('<event-msg elapsed="5"><event type="BuildEvent">'
+            '<type name="Build" status="{}" /><project name="{}" />'
+            '</event></event-msg>'.format(status, project))
+
+
+def build_peer(project='vdiv'):
+    """A peer which answers the build command with a BEGIN and END event"""
+
+    peer = SimulatedPeer({'list-messages': '<messages />'})
+    peer._replies[b'generic'] = (                   # pylint: disable=protected-access
+        b'<commandresponse sequence-id="',
+        ('" success="true" />' + build_event('BEGIN', project) +
+         build_event('END', project)).encode())
+    return peer
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+class BuildEventStreamTest(unittest.TestCase):
+
+    def test_stream_sees_final_end(self):
+        with build_peer() as peer:
+            pscad = peer.client()
+            with EventStream(pscad, ('build-events',), pump=False) as stream:
+                pscad.project('vdiv').build()
+
+            events = [(event.phase, event.status)
+                      for event in stream.events(timeout=0)]
+
+        self.assertEqual(events, [('Build', 'BEGIN'), ('Build', 'END')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: build farm
+#===============================================================================
+
+"""
+A build farm over a pool of simulated PSCAD peers.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import unittest
+
+# Automation imports
+from automation.farm import BuildFarm
+from automation.pool import InstancePool
+from tests.test_events import build_peer
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+class BuildFarmTest(unittest.TestCase):
+
+    def setUp(self):
+        self.peers = []
+
+    def tearDown(self):
+        for peer in self.peers:
+            peer.close()
+
+    def launch(self, _slot):
+        peer = build_peer()
+        self.peers.append(peer)
+        return peer.client()
+
+    def test_result_records_build_end(self):
+        farm = BuildFarm(InstancePool(self.launch, 2))
+        report = farm.build(['a', 'b', 'c'])
+
+        self.assertEqual(len(report), 3)
+        for result in report:
+            self.assertIsNone(result.error)
+            self.assertEqual([(event.phase, event.status)
+                              for event in result.events],
+                             [('Build', 'BEGIN'), ('Build', 'END')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: launching with a launcher
+#===============================================================================
+
+"""
+`launch_pscad()` with a launcher, which needs no installed PSCAD.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import unittest
+
+# Automation imports
+from automation import launch_pscad
+from automation.launcher import AttachLauncher
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+class LaunchTest(unittest.TestCase):
+
+    def test_attach_to_peer(self):
+        with SimulatedPeer({'is-licensed': '<licensed value="true" />'}) \
+             as peer:
+            pscad = launch_pscad(launcher=AttachLauncher(peer.port))
+            self.assertIsNotNone(pscad)
+            peer._client = pscad                    # pylint: disable=protected-access
+
+            self.assertTrue(pscad.licensed())
+            commands = peer.commands
+            pscad.project('vdiv').parameters()
+            self.assertEqual(peer.commands, commands + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
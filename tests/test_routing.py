@@ -0,0 +1,149 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: wire routing
+#===============================================================================
+
+"""
+Routing wires over fixed layouts, on a grid with a pitch of 1.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import unittest
+
+# Automation imports
+from automation.routing import Router
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Paths
+#===============================================================================
+
+def points_of(path):
+    """Every grid point a path passes through, with the axis it runs along
+    there ('h' or 'v')"""
+
+    points = set()
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        if y1 == y2:
+            points.update(((x, y1), 'h') for x in range(min(x1, x2),
+                                                         max(x1, x2) + 1))
+        else:
+            points.update(((x1, y), 'v') for y in range(min(y1, y2),
+                                                        max(y1, y2) + 1))
+    return points
+
+
+def is_orthogonal(path):
+    return all(x1 == x2 or y1 == y2 for (x1, y1), (x2, y2) in zip(path,
+                                                                  path[1:]))
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+class RouterTest(unittest.TestCase):
+
+    def assertSeparate(self, path, earlier):
+        """The path only meets the earlier wire by crossing it at a right
+        angle, away from the earlier wire's ends and bends"""
+
+        mine = points_of(path)
+        theirs = points_of(earlier)
+        self.assertFalse(mine & theirs, "runs along the earlier wire")
+
+        on_theirs = {point for point, _ in theirs}
+        on_mine = {point for point, _ in mine}
+        self.assertFalse(set(path) & on_theirs, "bends on the earlier wire")
+        self.assertFalse(set(earlier) & on_mine, "touches a joint")
+
+    def test_straight(self):
+        router = Router(pitch=1)
+        self.assertEqual(router.route((0, 0), (10, 0)), [(0, 0), (10, 0)])
+
+    def test_around_obstacle(self):
+        router = Router({'R1': (4, -2, 6, 2)}, pitch=1)
+        path = router.route((0, 0), (10, 0))
+
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (10, 0))
+        self.assertTrue(is_orthogonal(path))
+        for (x, y), _ in points_of(path):
+            self.assertFalse(4 <= x <= 6  and  -2 <= y <= 2, (x, y))
+        self.assertEqual(len(path), 4)
+
+    def test_not_along_earlier_wire(self):
+        router = Router(pitch=1)
+        wire = router.route((0, 5), (10, 5))
+
+        path = router.route((-3, 5), (13, 5))
+        self.assertIsNotNone(path)
+        self.assertTrue(is_orthogonal(path))
+        self.assertSeparate(path, wire)
+
+    def test_not_turning_on_earlier_wire(self):
+        router = Router(pitch=1)
+        wire = router.route((5, 0), (5, 10))
+
+        path = router.route((2, 3), (8, 7))
+        self.assertIsNotNone(path)
+        self.assertTrue(is_orthogonal(path))
+        self.assertSeparate(path, wire)
+
+    def test_crossing_at_right_angles(self):
+        router = Router(pitch=1)
+        wire = router.route((0, 5), (10, 5))
+
+        path = router.route((5, 0), (5, 10))
+        self.assertEqual(path, [(5, 0), (5, 10)])
+        self.assertSeparate(path, wire)
+
+    def test_join_node_at_cheapest_joint(self):
+        router = Router(pitch=1)
+        router.route((0, 0), (10, 0))
+
+        # (10, 0) is already joined to (0, 0), and is much closer
+        self.assertEqual(router.route((0, 0), (10, 3)), [(10, 0), (10, 3)])
+
+        # Both wires' joints are now one node
+        self.assertEqual(router.route((12, 3), (0, 0)), [(12, 3), (10, 3)])
+
+    def test_same_node(self):
+        router = Router(pitch=1)
+        router.route((0, 0), (10, 0))
+        router.route((10, 0), (10, 5))
+
+        self.assertIsNone(router.route((3, 3), (3, 3)))
+        self.assertIsNone(router.route((0, 0), (10, 0)))
+        self.assertIsNone(router.route((10, 5), (0, 0)))
+
+    def test_enclosed_end(self):
+        router = Router({'R1': (-1, -1, 1, 1)}, pitch=1)
+        self.assertIsNone(router.route((0, 0), (10, 0)))
+
+
+class AddWireTest(unittest.TestCase):
+
+    def test_router_needs_two_vertices(self):
+        with SimulatedPeer() as peer:
+            canvas = peer.client().project('vdiv').user_canvas('Main')
+            commands = peer.commands
+            router = Router(pitch=1)
+
+            with self.assertRaises(ValueError):
+                canvas.add_wire((0, 0), (5, 0), (5, 5), router=router)
+            with self.assertRaises(ValueError):
+                canvas.add_wire((0, 0), router=router)
+
+            self.assertEqual(peer.commands, commands)
+            self.assertEqual(router.route((0, 0), (5, 0)), [(0, 0), (5, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
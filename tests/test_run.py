@@ -0,0 +1,70 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: run handles
+#===============================================================================
+
+"""
+Progress of an asynchronous run, from the output files it writes.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import os, shutil, tempfile, unittest
+
+# Automation imports
+from benchmarks.peer import SimulatedPeer
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+PARAMETERS = ('<paramlist><param name="time_duration" value="0.5" />'
+              '<param name="output_filename" value="vdiv.out" /></paramlist>')
+
+
+class RunProgressTest(unittest.TestCase):
+
+    def setUp(self):
+        self.build_dir = tempfile.mkdtemp()
+        self.out = os.path.join(self.build_dir, 'vdiv_01.out')
+        self.peer = SimulatedPeer({'list-parameters': PARAMETERS})
+        self.project = self.peer.client().project('vdiv')
+
+    def tearDown(self):
+        self.peer.close()
+        shutil.rmtree(self.build_dir, ignore_errors=True)
+
+    def write(self, text):
+        with open(self.out, 'a') as file:
+            file.write(text)
+
+    def test_progress_follows_output(self):
+        run = self.project.run_async(self.build_dir)
+        self.assertIsNone(run.progress())
+
+        self.write(" 0.0 1.0\n 0.1 1.0\n 0.2")
+        self.assertAlmostEqual(run.progress(), 0.2)
+
+        self.write("5 1.0\n")
+        self.assertAlmostEqual(run.progress(), 0.5)
+        self.assertAlmostEqual(run.sim_time(), 0.25)
+
+    def test_earlier_output_is_ignored(self):
+        self.write(" 0.0 1.0\n 0.5 1.0\n")
+        os.utime(self.out, (0, 0))
+
+        run = self.project.run_async(self.build_dir)
+        self.assertIsNone(run.progress())
+
+    def test_no_build_dir(self):
+        run = self.project.run_async()
+        self.assertIsNone(run.progress())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#===============================================================================
+# PSCAD Automated Test Suite
+#===============================================================================
+# Tests: tailing growing output files
+#===============================================================================
+
+"""
+Following a pair of output files while a simulated EMTDC is writing them.
+"""
+
+#===============================================================================
+# Imports
+#===============================================================================
+
+# Standard Python imports
+import os, shutil, sys, tempfile, threading, time, unittest
+
+# Automation imports
+from automation.utilities.tail import TailOutFile
+
+
+#===============================================================================
+# Simulated EMTDC output
+#===============================================================================
+
+class OutWriter(threading.Thread):
+
+    """
+    Appends rows to <basename>_01.out and <basename>_02.out, in small
+    chunks which split lines (and rows across the files) at odd places.
+
+    File 1 holds the time and channels 1-10, file 2 the time and
+    channel 11.
+    """
+
+    def __init__(self, basename, rows=200, chunk=37, delay=0.001):
+        super().__init__(daemon=True)
+        self.done = threading.Event()
+        self.expected = [[i * 0.001] + [i + ch / 100 for ch in range(11)]
+                         for i in range(rows)]
+
+        first = ''.join(' '.join('{:.6f}'.format(v) for v in row[:11]) + '\n'
+                        for row in self.expected)
+        second = ''.join('{:.6f} {:.6f}\n'.format(row[0], row[11])
+                         for row in self.expected)
+        self._files = [(basename + '_01.out', first.encode()),
+                       (basename + '_02.out', second.encode())]
+        self._chunk = chunk
+        self._delay = delay
+
+    def run(self):
+        (name1, data1), (name2, data2) = self._files
+        chunk = self._chunk
+        try:
+            with open(name1, 'wb') as file1, open(name2, 'wb') as file2:
+                # File 2 trails file 1 by a few chunks, so that a row is
+                # often complete in one file but not yet in the other
+                lag = 3 * chunk
+                for pos in range(0, max(len(data1), len(data2) + lag), chunk):
+                    file1.write(data1[pos:pos + chunk])
+                    file1.flush()
+                    time.sleep(self._delay)
+                    if pos >= lag:
+                        file2.write(data2[pos - lag:pos - lag + chunk])
+                        file2.flush()
+                        time.sleep(self._delay)
+        finally:
+            self.done.set()
+
+
+#===============================================================================
+# Tests
+#===============================================================================
+
+class TailOutFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.basename = os.path.join(self.tmp, 'vdiv')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def follow(self, watcher):
+        writer = OutWriter(self.basename)
+        blocks = []
+        with TailOutFile(self.basename, num_files=2, watcher=watcher,
+                         interval=0.01) as tail:
+            writer.start()
+            for block in tail.blocks(idle_timeout=10, stop=writer.done.is_set):
+                blocks.append(block)
+        writer.join()
+
+        self.assertGreater(len(blocks), 1)
+        rows = [row for block in blocks for row in block]
+        self.assertEqual(len(rows), len(writer.expected))
+        for row, expected in zip(rows, writer.expected):
+            self.assertEqual(len(row), 12)
+            for value, want in zip(row, expected):
+                self.assertAlmostEqual(value, want, places=6)
+
+    def test_polling(self):
+        self.follow('poll')
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "needs inotify")
+    def test_inotify(self):
+        self.follow('inotify')
+
+
+if __name__ == '__main__':
+    unittest.main()